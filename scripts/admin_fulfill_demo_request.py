@@ -8,7 +8,7 @@ Usage:
 What it does:
   - Loads request from SQL Server (demo_run_requests)
   - Marks request status -> running
-  - Starts Kafka consumer (optional)
+  - Starts Kafka consumer in a background thread (optional)
   - Creates a run and streams simulator data to Kafka using the request parameters
   - Waits for ingestion to reach the produced sample target
   - Completes the run + runs QC/metrics processing
@@ -21,28 +21,15 @@ Notes:
 
 import os
 import sys
-import time
-import signal
-import subprocess
-from typing import Optional
+import threading
+from typing import Optional, Tuple
 
 
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, ROOT)
 
 from src.config import get_config  # noqa: E402
-from src.simulator.sensor_simulator import WindTunnelSimulator, RunConfiguration  # noqa: E402
-from src.streaming.producer import SensorDataProducer, create_topic_if_not_exists  # noqa: E402
-from src.db.connection import execute_query  # noqa: E402
-from src.db.operations import (  # noqa: E402
-    create_test_session,
-    create_run,
-    start_run,
-    complete_run,
-    get_demo_run_request,
-    update_demo_run_request_status,
-    attach_run_to_demo_request,
-)
+from src.logging_config import configure_logging  # noqa: E402
 
 
 def _int(s: Optional[str], default: int) -> int:
@@ -59,68 +46,112 @@ def _float(s: Optional[str], default: float) -> float:
         return default
 
 
-def _wait_for_ingestion(run_id: int, target: int, max_wait_seconds: int) -> int:
-    """Wait until samples(run_id) reaches target (or timeout). Returns final inserted count."""
-    last = -1
-    stable_ticks = 0
-    t0 = time.time()
-    while True:
-        rows = execute_query("SELECT COUNT(*) AS cnt FROM samples WHERE run_id = ?", (run_id,))
-        inserted = int(rows[0]["cnt"]) if rows else 0
-
-        if target and inserted >= target:
-            return inserted
-
-        if inserted == last:
-            stable_ticks += 1
-        else:
-            stable_ticks = 0
-            last = inserted
-
-        # If no target (shouldn't happen), allow a conservative early exit once stabilized.
-        if not target and stable_ticks >= 10 and inserted > 0:
-            return inserted
-
-        if time.time() - t0 >= max_wait_seconds:
-            return inserted
-
-        time.sleep(1)
+def _run_consumer(
+    bootstrap_servers: str,
+    topic: str,
+    group_id: str,
+    batch_size: int,
+    max_seconds: int,
+    stop_event: threading.Event,
+) -> None:
+    """Thread target: consume until stop_event is set or max_seconds elapse."""
+    from src.streaming.consumer import SensorDataConsumer
+
+    with SensorDataConsumer(
+        bootstrap_servers=bootstrap_servers,
+        topic=topic,
+        group_id=group_id,
+        batch_size=batch_size,
+    ) as consumer:
+        consumer.consume(
+            max_time_seconds=max_seconds,
+            progress_interval=20000,
+            stop_event=stop_event,
+        )
 
 
-def main() -> int:
-    import argparse
+def start_consumer_thread(
+    group_id: str,
+    batch_size: int,
+    max_seconds: int,
+) -> Tuple[threading.Thread, threading.Event]:
+    """
+    Start the in-process consumer (shares the DB pool, no interpreter start-up).
 
-    parser = argparse.ArgumentParser(description="Fulfill a demo_run_requests row (admin helper).")
-    parser.add_argument("request_id", type=int, help="demo_run_requests.request_id")
-    parser.add_argument("--start-consumer", action="store_true", help="Start consumer automatically (recommended locally)")
-    parser.add_argument("--consumer-max-seconds", type=int, default=600, help="Consumer max seconds (default 600)")
-    parser.add_argument("--consumer-batch-size", type=int, default=20000, help="Consumer batch size (default 20000)")
-    parser.add_argument(
-        "--consumer-group-id",
-        type=str,
-        default="aerostream-consumer-demo",
-        help="Kafka consumer group id (default matches scripts/streaming_consumer.py)",
+    Returns:
+        (thread, stop_event); set the event and join the thread to shut down
+    """
+    cfg = get_config()
+    stop_event = threading.Event()
+    thread = threading.Thread(
+        target=_run_consumer,
+        args=(
+            cfg.kafka.bootstrap_servers,
+            cfg.kafka.topic,
+            group_id,
+            batch_size,
+            max_seconds,
+            stop_event,
+        ),
+        name="aerostream-consumer",
+        daemon=True,
     )
-    parser.add_argument("--ingest-wait-seconds", type=int, default=180, help="Max seconds to wait for ingestion (default 180)")
-    parser.add_argument("--real-time", action="store_true", help="Throttle producer to approximate real-time")
-    parser.add_argument("--force", action="store_true", help="Run even if request is already completed/rejected")
-    args = parser.parse_args()
+    thread.start()
+    return thread, stop_event
+
+
+def stop_consumer_thread(thread: Optional[threading.Thread], stop_event: threading.Event) -> None:
+    """Stop the consumer: it exits its poll loop, then does a final flush + commit."""
+    if thread and thread.is_alive():
+        stop_event.set()
+        thread.join(timeout=30)
+
+
+def fulfill_request(
+    request_id: int,
+    ingest_wait_seconds: int = 180,
+    real_time: bool = False,
+    force: bool = False,
+) -> int:
+    """
+    Fulfill one demo_run_requests row: stream a run, wait for ingestion, process it.
+
+    Expects a consumer to be running (see start_consumer_thread). Safe to call
+    from several threads at once (scripts/admin_fulfill_pending_loop.py).
+
+    Returns:
+        Exit code (0 = fulfilled, 2 = request not runnable)
+    """
+    from src.simulator.sensor_simulator import WindTunnelSimulator, RunConfiguration
+    from src.streaming.producer import SensorDataProducer, create_topic_if_not_exists
+    from src.streaming.ingest_monitor import wait_for_ingestion
+    from src.db.connection import execute_scalar
+    from src.db.operations import (
+        create_test_session,
+        create_run,
+        start_run,
+        complete_run,
+        get_demo_run_request,
+        update_demo_run_request_status,
+        attach_run_to_demo_request,
+    )
+    from scripts.process_run import process_run
 
     cfg = get_config()
 
-    req = get_demo_run_request(args.request_id)
+    req = get_demo_run_request(request_id)
     if not req:
-        print(f"ERROR: request_id={args.request_id} not found")
+        print(f"ERROR: request_id={request_id} not found")
         return 2
 
     status = (req.get("status") or "").lower()
-    if status in {"completed", "rejected"} and not args.force:
-        print(f"ERROR: request_id={args.request_id} status={status} (use --force to override)")
+    if status in {"completed", "rejected"} and not force:
+        print(f"ERROR: request_id={request_id} status={status} (use --force to override)")
         return 2
 
     requested_variant = (req.get("requested_variant") or "baseline").strip()
     if requested_variant not in {"baseline", "variant_a", "variant_b"}:
-        print(f"ERROR: request_id={args.request_id} invalid requested_variant={requested_variant!r}")
+        print(f"ERROR: request_id={request_id} invalid requested_variant={requested_variant!r}")
         return 2
 
     duration_sec = _float(req.get("requested_duration_sec"), 5.0)
@@ -129,48 +160,27 @@ def main() -> int:
     yaw_deg = _float(req.get("requested_yaw_deg"), 0.0)
 
     # Mark request running
-    update_demo_run_request_status(args.request_id, "running", reviewer_notes="Running (admin helper)")
+    update_demo_run_request_status(request_id, "running", reviewer_notes="Running (admin helper)")
 
-    consumer_proc: Optional[subprocess.Popen] = None
     try:
-        # Ensure topic exists
+        # Ensure topic exists (cached per process after the first success)
         create_topic_if_not_exists(cfg.kafka.bootstrap_servers, cfg.kafka.topic, num_partitions=6)
 
-        if args.start_consumer:
-            consumer_cmd = [
-                sys.executable,
-                os.path.join(ROOT, "scripts", "streaming_consumer.py"),
-                "--max-seconds",
-                str(args.consumer_max_seconds),
-                "--batch-size",
-                str(args.consumer_batch_size),
-                "--group-id",
-                args.consumer_group_id,
-            ]
-            consumer_proc = subprocess.Popen(
-                consumer_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-            )
-            # Give the consumer a head start
-            time.sleep(2)
-
         # Create session + run
         session_id = create_test_session(
             session_name="Website Demo Requests",
             objective="Auto-fulfilled from demo_run_requests (admin helper)",
         )
-        run_name = f"Website Request #{args.request_id} - {requested_variant} - {duration_sec:.0f}s"
+        run_name = f"Website Request #{request_id} - {requested_variant} - {duration_sec:.0f}s"
         run_id = create_run(
             run_name=run_name,
             session_id=session_id,
             tunnel_speed_setpoint=speed_ms,
             tunnel_aoa_setpoint=aoa_deg,
             tunnel_yaw_setpoint=yaw_deg,
-            notes=f"Created by scripts/admin_fulfill_demo_request.py for request_id={args.request_id}",
+            notes=f"Created by scripts/admin_fulfill_demo_request.py for request_id={request_id}",
         )
-        attach_run_to_demo_request(args.request_id, run_id)
+        attach_run_to_demo_request(request_id, run_id)
         start_run(run_id)
 
         # Stream simulator data
@@ -186,7 +196,7 @@ def main() -> int:
 
         print("📝 Fulfilling demo request")
         print("=" * 60)
-        print(f"request_id: {args.request_id}  status: running")
+        print(f"request_id: {request_id}  status: running")
         print(f"run_id:     {run_id}")
         print(f"variant:    {requested_variant}")
         print(f"duration:   {duration_sec}s")
@@ -200,60 +210,80 @@ def main() -> int:
                 simulator=simulator,
                 run_id=run_id,
                 session_id=session_id,
-                real_time=args.real_time,
+                real_time=real_time,
                 progress_interval=20000,
             )
 
         target = int(stats.get("samples_sent", 0))
-        inserted = _wait_for_ingestion(run_id, target=target, max_wait_seconds=args.ingest_wait_seconds)
+        inserted = wait_for_ingestion(run_id, target=target, max_wait_seconds=ingest_wait_seconds)
         complete_run(run_id=run_id, tunnel_speed_actual=speed_ms, sample_count=inserted)
 
-        # Process run for QC + metrics
-        subprocess.run(
-            [sys.executable, os.path.join(ROOT, "scripts", "process_run.py"), "--run-id", str(run_id)],
-            check=True,
-        )
+        # Process run for QC + metrics (in-process: no interpreter start-up or new DB pool)
+        process_run(run_id)
 
         # Grab QC status for a nice completion note (best-effort)
-        qc_rows = execute_query(
+        qc_status = execute_scalar(
             "SELECT TOP 1 overall_status FROM qc_summaries WHERE run_id = ? ORDER BY computed_at DESC",
             (run_id,),
-        )
-        qc_status = (qc_rows[0]["overall_status"] if qc_rows else None) or "unknown"
+        ) or "unknown"
 
         update_demo_run_request_status(
-            args.request_id,
+            request_id,
             "completed",
             reviewer_notes=f"Executed (run_id={run_id}) QC={qc_status}",
         )
 
         print("")
         print("✅ Request fulfilled")
-        print(f"  request_id: {args.request_id}")
+        print(f"  request_id: {request_id}")
         print(f"  run_id:     {run_id}")
         print(f"  inserted:   {inserted:,} / target {target:,}")
         print(f"  QC:         {qc_status}")
         return 0
 
     except Exception as e:
-        update_demo_run_request_status(args.request_id, "failed", reviewer_notes=f"Failed: {type(e).__name__}: {e}")
+        update_demo_run_request_status(request_id, "failed", reviewer_notes=f"Failed: {type(e).__name__}: {e}")
         raise
 
+
+def main() -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fulfill a demo_run_requests row (admin helper).")
+    parser.add_argument("request_id", type=int, help="demo_run_requests.request_id")
+    parser.add_argument("--start-consumer", action="store_true", help="Start consumer automatically (recommended locally)")
+    parser.add_argument("--consumer-max-seconds", type=int, default=600, help="Consumer max seconds (default 600)")
+    parser.add_argument("--consumer-batch-size", type=int, default=20000, help="Consumer batch size (default 20000)")
+    parser.add_argument(
+        "--consumer-group-id",
+        type=str,
+        default="aerostream-consumer-demo",
+        help="Kafka consumer group id (default matches scripts/streaming_consumer.py)",
+    )
+    parser.add_argument("--ingest-wait-seconds", type=int, default=180, help="Max seconds to wait for ingestion (default 180)")
+    parser.add_argument("--real-time", action="store_true", help="Throttle producer to approximate real-time")
+    parser.add_argument("--force", action="store_true", help="Run even if request is already completed/rejected")
+    args = parser.parse_args()
+    configure_logging()
+
+    consumer_thread: Optional[threading.Thread] = None
+    consumer_stop = threading.Event()
+    if args.start_consumer:
+        consumer_thread, consumer_stop = start_consumer_thread(
+            args.consumer_group_id,
+            args.consumer_batch_size,
+            args.consumer_max_seconds,
+        )
+
+    try:
+        return fulfill_request(
+            args.request_id,
+            ingest_wait_seconds=args.ingest_wait_seconds,
+            real_time=args.real_time,
+            force=args.force,
+        )
     finally:
-        if consumer_proc and consumer_proc.poll() is None:
-            # Try graceful stop first (flush + commit)
-            try:
-                consumer_proc.send_signal(signal.SIGINT)
-                consumer_proc.wait(timeout=10)
-            except Exception:
-                try:
-                    consumer_proc.terminate()
-                    consumer_proc.wait(timeout=5)
-                except Exception:
-                    try:
-                        consumer_proc.kill()
-                    except Exception:
-                        pass
+        stop_consumer_thread(consumer_thread, consumer_stop)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Admin helper: fulfill all pending demo requests with a worker pool.
+
+Usage:
+  python scripts/admin_fulfill_pending_loop.py --start-consumer
+  python scripts/admin_fulfill_pending_loop.py --start-consumer --workers 4 --limit 20
+  python scripts/admin_fulfill_pending_loop.py --start-consumer --poll-seconds 30  # keep watching
+
+What it does:
+  - Lists pending requests (oldest first) from demo_run_requests
+  - Fulfills up to --workers of them concurrently via fulfill_request()
+  - All workers share one in-process consumer, one DB pool and one topic cache
+  - Repeats until the queue is empty (or forever with --poll-seconds)
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.logging_config import configure_logging  # noqa: E402
+
+
+def main() -> int:
+    import argparse
+    import threading
+
+    parser = argparse.ArgumentParser(description="Fulfill pending demo_run_requests concurrently (admin helper).")
+    parser.add_argument("--workers", type=int, default=4, help="Requests fulfilled concurrently (default 4)")
+    parser.add_argument("--limit", type=int, default=20, help="Max requests picked up per pass (default 20)")
+    parser.add_argument("--poll-seconds", type=float, default=0, help="Keep polling the queue every N seconds (default: exit when empty)")
+    parser.add_argument("--start-consumer", action="store_true", help="Start consumer automatically (recommended locally)")
+    parser.add_argument("--consumer-max-seconds", type=int, default=3600, help="Consumer max seconds (default 3600)")
+    parser.add_argument("--consumer-batch-size", type=int, default=20000, help="Consumer batch size (default 20000)")
+    parser.add_argument(
+        "--consumer-group-id",
+        type=str,
+        default="aerostream-consumer-demo",
+        help="Kafka consumer group id (default matches scripts/streaming_consumer.py)",
+    )
+    parser.add_argument("--ingest-wait-seconds", type=int, default=180, help="Max seconds to wait for ingestion (default 180)")
+    parser.add_argument("--real-time", action="store_true", help="Throttle producer to approximate real-time")
+    args = parser.parse_args()
+    configure_logging()
+
+    # Heavy imports (numpy/scipy/kafka/pyodbc) after argparse so --help stays fast
+    from src.db.operations import list_demo_run_requests
+    from scripts.admin_fulfill_demo_request import (
+        fulfill_request,
+        start_consumer_thread,
+        stop_consumer_thread,
+    )
+
+    consumer_thread: Optional[threading.Thread] = None
+    consumer_stop = threading.Event()
+    if args.start_consumer:
+        consumer_thread, consumer_stop = start_consumer_thread(
+            args.consumer_group_id,
+            args.consumer_batch_size,
+            args.consumer_max_seconds,
+        )
+
+    fulfilled = 0
+    failed = 0
+    attempted = set()  # Requests rejected as not runnable stay 'pending'; try each once
+    try:
+        with ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="aerostream-fulfill") as pool:
+            while True:
+                pending = [
+                    req for req in list_demo_run_requests(status="pending", limit=args.limit)
+                    if int(req["request_id"]) not in attempted
+                ]
+                # Listed newest first; fulfill in arrival order
+                pending.sort(key=lambda r: (r.get("created_at") is None, r.get("created_at"), r["request_id"]))
+
+                if not pending:
+                    if args.poll_seconds <= 0:
+                        break
+                    time.sleep(args.poll_seconds)
+                    continue
+
+                print(f"Fulfilling {len(pending)} pending request(s) with {args.workers} worker(s)...")
+                attempted.update(int(req["request_id"]) for req in pending)
+                futures = {
+                    pool.submit(
+                        fulfill_request,
+                        int(req["request_id"]),
+                        ingest_wait_seconds=args.ingest_wait_seconds,
+                        real_time=args.real_time,
+                    ): int(req["request_id"])
+                    for req in pending
+                }
+                # Wait for the whole pass before re-listing so no request is picked up twice
+                for future in as_completed(futures):
+                    request_id = futures[future]
+                    try:
+                        code = future.result()
+                    except Exception as e:
+                        # fulfill_request already marked the request failed
+                        print(f"ERROR: request_id={request_id} failed: {type(e).__name__}: {e}")
+                        failed += 1
+                        continue
+                    if code == 0:
+                        fulfilled += 1
+                    else:
+                        failed += 1
+    except KeyboardInterrupt:
+        print("\nShutdown requested...")
+    finally:
+        stop_consumer_thread(consumer_thread, consumer_stop)
+
+    print("")
+    print(f"✅ Done: {fulfilled} fulfilled, {failed} failed")
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
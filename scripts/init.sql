@@ -212,6 +212,10 @@ CREATE TABLE channels (
 
 CREATE INDEX IX_channels_category ON channels(category);
 CREATE INDEX IX_channels_sample_rate ON channels(sample_rate_hz);
+-- Covers /channels (seek on is_active[, category], rows in channel_id order)
+-- and /channels/categories (GROUP BY category in index order)
+CREATE INDEX IX_channels_active_category ON channels(is_active, category, channel_id)
+    INCLUDE (name, display_name, unit, sample_rate_hz);
 
 PRINT 'Created table: channels';
 GO
@@ -243,6 +247,49 @@ CREATE INDEX IX_calibrations_date ON calibrations(calibration_date DESC);
 PRINT 'Created table: calibrations';
 GO
 
+-- -----------------------------------------------------------------------------
+-- 2.3 CHANNEL_CATEGORY_COUNTS: Active channels per category (trigger-maintained)
+-- -----------------------------------------------------------------------------
+CREATE TABLE channel_category_counts (
+    category NVARCHAR(50) NOT NULL PRIMARY KEY,
+    channel_count INT NOT NULL
+);
+
+PRINT 'Created table: channel_category_counts';
+GO
+
+CREATE TRIGGER trg_channels_category_counts
+ON channels
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -- Recount only the categories touched by this statement
+    MERGE channel_category_counts AS t
+    USING (
+        SELECT a.category, COUNT(c.channel_id) AS channel_count
+        FROM (
+            SELECT category FROM inserted
+            UNION
+            SELECT category FROM deleted
+        ) a
+        LEFT JOIN channels c ON c.category = a.category AND c.is_active = 1
+        GROUP BY a.category
+    ) AS s
+    ON t.category = s.category
+    WHEN MATCHED AND s.channel_count = 0 THEN
+        DELETE
+    WHEN MATCHED THEN
+        UPDATE SET channel_count = s.channel_count
+    WHEN NOT MATCHED BY TARGET AND s.channel_count > 0 THEN
+        INSERT (category, channel_count) VALUES (s.category, s.channel_count);
+END;
+GO
+
+PRINT 'Created trigger: trg_channels_category_counts';
+GO
+
 -- =============================================================================
 -- SECTION 3: TEST RUNS
 -- =============================================================================
@@ -325,6 +372,7 @@ CREATE TABLE runs (
     -- Data quality
     data_quality_score FLOAT NULL,           -- 0-100
     sample_count INT NULL,
+    qc_status NVARCHAR(20) NULL,             -- Copy of qc_summaries.overall_status (list views)
     missing_samples_pct FLOAT NULL,
     
     -- Comparison reference
@@ -353,6 +401,62 @@ CREATE INDEX IX_runs_baseline ON runs(baseline_run_id);
 PRINT 'Created table: runs';
 GO
 
+-- -----------------------------------------------------------------------------
+-- 3.3 RUN_QC_STATS: Global QC counters for list views (trigger-maintained)
+-- -----------------------------------------------------------------------------
+CREATE TABLE run_qc_stats (
+    stats_id TINYINT NOT NULL PRIMARY KEY DEFAULT 1 CHECK (stats_id = 1),  -- Single row
+    total_runs INT NOT NULL DEFAULT 0,
+    passed INT NOT NULL DEFAULT 0,
+    warned INT NOT NULL DEFAULT 0,
+    failed INT NOT NULL DEFAULT 0,
+    not_run INT NOT NULL DEFAULT 0
+);
+
+INSERT INTO run_qc_stats (stats_id) VALUES (1);
+
+PRINT 'Created table: run_qc_stats';
+GO
+
+CREATE TRIGGER trg_runs_qc_stats
+ON runs
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -- Updates that leave qc_status alone cannot change the counters
+    IF EXISTS (SELECT 1 FROM inserted) AND EXISTS (SELECT 1 FROM deleted) AND NOT UPDATE(qc_status)
+        RETURN;
+
+    -- Apply the statement's net delta: +1 per inserted row, -1 per deleted row
+    UPDATE s SET
+        total_runs = s.total_runs + d.total_runs,
+        passed = s.passed + d.passed,
+        warned = s.warned + d.warned,
+        failed = s.failed + d.failed,
+        not_run = s.not_run + d.not_run
+    FROM run_qc_stats s
+    CROSS JOIN (
+        SELECT
+            ISNULL(SUM(x.sign), 0) AS total_runs,
+            ISNULL(SUM(CASE WHEN x.qc_status = 'pass' THEN x.sign ELSE 0 END), 0) AS passed,
+            ISNULL(SUM(CASE WHEN x.qc_status = 'warn' THEN x.sign ELSE 0 END), 0) AS warned,
+            ISNULL(SUM(CASE WHEN x.qc_status = 'fail' THEN x.sign ELSE 0 END), 0) AS failed,
+            ISNULL(SUM(CASE WHEN x.qc_status IS NULL THEN x.sign ELSE 0 END), 0) AS not_run
+        FROM (
+            SELECT qc_status, 1 AS sign FROM inserted
+            UNION ALL
+            SELECT qc_status, -1 AS sign FROM deleted
+        ) x
+    ) d
+    WHERE s.stats_id = 1;
+END;
+GO
+
+PRINT 'Created trigger: trg_runs_qc_stats';
+GO
+
 -- =============================================================================
 -- SECTION 4: TIME-SERIES DATA
 -- =============================================================================
@@ -377,6 +481,10 @@ CREATE NONCLUSTERED INDEX IX_samples_run_channel_ts
     ON samples(run_id, channel_id, ts)
     INCLUDE (value, quality_flag);
 
+-- Narrow per-run index: COUNT(*) WHERE run_id = ? is an index-only range count
+CREATE NONCLUSTERED INDEX IX_samples_run_id
+    ON samples(run_id);
+
 -- Columnstore index for analytics (fast aggregations)
 CREATE NONCLUSTERED COLUMNSTORE INDEX IX_samples_columnstore
     ON samples (run_id, channel_id, ts, value, quality_flag);
@@ -431,6 +539,40 @@ ALTER TABLE samples_1sec REBUILD WITH (DATA_COMPRESSION = PAGE);
 PRINT 'Created table: samples_1sec';
 GO
 
+-- -----------------------------------------------------------------------------
+-- 4.3b CHANNEL_STATS: Per-channel summary statistics (written by sp_refresh_samples_1sec,
+--      deleted by bulk inserts into the run so readers fall back to raw samples)
+-- -----------------------------------------------------------------------------
+CREATE TABLE channel_stats (
+    run_id INT NOT NULL,
+    channel_id INT NOT NULL,
+    sample_count BIGINT NOT NULL,
+    mean_value FLOAT NOT NULL,
+    std_value FLOAT NULL,               -- NULL for a single sample
+    min_value FLOAT NOT NULL,
+    max_value FLOAT NOT NULL,
+    refreshed_at DATETIME2 NOT NULL DEFAULT GETDATE(),
+    CONSTRAINT PK_channel_stats PRIMARY KEY (run_id, channel_id)
+);
+
+PRINT 'Created table: channel_stats';
+GO
+
+-- -----------------------------------------------------------------------------
+-- 4.3c RUN_META: Per-run sample time range and count (written by sp_refresh_samples_1sec,
+--      deleted by bulk inserts into the run so readers fall back to raw samples)
+-- -----------------------------------------------------------------------------
+CREATE TABLE run_meta (
+    run_id INT NOT NULL PRIMARY KEY,
+    start_ts DATETIME2(3) NULL,
+    end_ts DATETIME2(3) NULL,
+    sample_count BIGINT NOT NULL,
+    refreshed_at DATETIME2 NOT NULL DEFAULT GETDATE()
+);
+
+PRINT 'Created table: run_meta';
+GO
+
 -- -----------------------------------------------------------------------------
 -- 4.4 Stored Procedure: Refresh samples_1sec aggregates for a run
 -- -----------------------------------------------------------------------------
@@ -439,6 +581,7 @@ CREATE PROCEDURE sp_refresh_samples_1sec
 AS
 BEGIN
     SET NOCOUNT ON;
+    DECLARE @rows INT;
     
     -- Delete existing aggregates for this run
     DELETE FROM samples_1sec WHERE run_id = @run_id;
@@ -458,7 +601,55 @@ BEGIN
     WHERE run_id = @run_id
     GROUP BY run_id, channel_id, DATEADD(SECOND, DATEDIFF(SECOND, '2000-01-01', ts), '2000-01-01');
     
-    RETURN @@ROWCOUNT;
+    SET @rows = @@ROWCOUNT;
+    
+    -- Per-channel stats from the buckets (no second pass over raw samples).
+    -- Exact: mean weighted by sample_count, pooled within + between variance.
+    DELETE FROM channel_stats WHERE run_id = @run_id;
+    
+    WITH b AS (
+        SELECT channel_id, CAST(sample_count AS BIGINT) AS n, avg_value AS m,
+               ISNULL(std_value, 0) AS s, min_value, max_value
+        FROM samples_1sec
+        WHERE run_id = @run_id
+    ),
+    t AS (
+        SELECT channel_id, SUM(n) AS total_n, SUM(n * m) / SUM(n) AS mean
+        FROM b
+        GROUP BY channel_id
+    )
+    INSERT INTO channel_stats (run_id, channel_id, sample_count, mean_value, std_value, min_value, max_value)
+    SELECT
+        @run_id,
+        t.channel_id,
+        t.total_n,
+        t.mean,
+        SQRT(
+            (SUM((b.n - 1) * SQUARE(b.s)) + SUM(b.n * SQUARE(b.m - t.mean)))
+            / NULLIF(t.total_n - 1, 0)
+        ),
+        MIN(b.min_value),
+        MAX(b.max_value)
+    FROM b
+    JOIN t ON t.channel_id = b.channel_id
+    GROUP BY t.channel_id, t.mean, t.total_n;
+    
+    -- Run-level range and count, so get_time_range / get_sample_count are one seek
+    MERGE run_meta AS t
+    USING (
+        SELECT @run_id AS run_id, MIN(ts) AS start_ts, MAX(ts) AS end_ts, COUNT_BIG(*) AS sample_count
+        FROM samples
+        WHERE run_id = @run_id
+    ) AS s
+    ON t.run_id = s.run_id
+    WHEN MATCHED THEN
+        UPDATE SET start_ts = s.start_ts, end_ts = s.end_ts,
+                   sample_count = s.sample_count, refreshed_at = GETDATE()
+    WHEN NOT MATCHED THEN
+        INSERT (run_id, start_ts, end_ts, sample_count)
+        VALUES (s.run_id, s.start_ts, s.end_ts, s.sample_count);
+    
+    RETURN @rows;
 END
 GO
 
@@ -528,6 +719,47 @@ GO
 PRINT 'Created stored procedure: sp_get_downsampled_data';
 GO
 
+-- -----------------------------------------------------------------------------
+-- 4.6 RUN_INGEST_PROGRESS: Consumer-maintained ingestion counter per run
+-- -----------------------------------------------------------------------------
+-- Upserted by the Kafka consumer after every committed batch so ingestion
+-- waits can read one row instead of running COUNT(*) over samples.
+CREATE TABLE run_ingest_progress (
+    run_id INT NOT NULL PRIMARY KEY,
+    inserted_count BIGINT NOT NULL DEFAULT 0,
+    updated_at DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME()
+);
+
+PRINT 'Created table: run_ingest_progress';
+GO
+
+-- -----------------------------------------------------------------------------
+-- 4.7 Bulk insert via table-valued parameter (one RPC per consumer batch)
+-- -----------------------------------------------------------------------------
+CREATE TYPE dbo.samples_tvp AS TABLE (
+    channel_id INT NOT NULL,
+    ts DATETIME2(3) NOT NULL,
+    value FLOAT NOT NULL,
+    quality_flag TINYINT NOT NULL DEFAULT 0
+);
+GO
+
+CREATE PROCEDURE sp_insert_samples
+    @run_id INT,
+    @rows dbo.samples_tvp READONLY
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    INSERT INTO samples (run_id, channel_id, ts, value, quality_flag)
+    SELECT @run_id, channel_id, ts, value, quality_flag
+    FROM @rows;
+END
+GO
+
+PRINT 'Created stored procedure: sp_insert_samples';
+GO
+
 -- =============================================================================
 -- SECTION 5: COMPUTED RESULTS
 -- =============================================================================
@@ -706,7 +938,7 @@ CREATE TABLE qc_summaries (
     skipped_checks INT NOT NULL,
     
     critical_issues NVARCHAR(MAX) NULL,    -- JSON array of critical failures
-    recommendations NVARCHAR(MAX) NULL,
+    recommendations NVARCHAR(MAX) NULL,    -- JSON array of recommendations
     
     approved_by INT NULL,
     approved_at DATETIME2 NULL,
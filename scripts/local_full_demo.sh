@@ -55,10 +55,22 @@ if [[ "${HAS_SCHEMA}" -ne 0 ]]; then
     -S localhost -U sa -P 'AeroStream_Secure_123!' -C \
     -i /scripts/init.sql
 else
-  echo "   Schema already present. Applying migration (demo_run_requests) if needed..."
-  docker exec aerostream-sqlserver /opt/mssql-tools18/bin/sqlcmd \
-    -S localhost -U sa -P 'AeroStream_Secure_123!' -C -d aerostream \
-    -i /scripts/migrations/20251229_add_demo_run_requests.sql
+  echo "   Schema already present. Applying migrations if needed..."
+  for migration in \
+      20251229_add_demo_run_requests.sql \
+      20261014_add_run_ingest_progress.sql \
+      20261014_add_samples_run_id_index.sql \
+      20261014_add_sp_insert_samples.sql \
+      20261014_add_channels_active_category_index.sql \
+      20261014_add_channel_category_counts.sql \
+      20261014_add_runs_qc_status.sql \
+      20261014_add_run_qc_stats.sql \
+      20261014_add_channel_stats.sql \
+      20261014_add_run_meta.sql; do
+    docker exec aerostream-sqlserver /opt/mssql-tools18/bin/sqlcmd \
+      -S localhost -U sa -P 'AeroStream_Secure_123!' -C -d aerostream \
+      -i "/scripts/migrations/${migration}"
+  done
 fi
 
 echo ""
@@ -0,0 +1,58 @@
+-- Migration: Add channel_category_counts pre-aggregation (served by /channels/categories)
+-- Maintained by a trigger on channels; backfilled from the current table.
+-- Safe to run multiple times.
+
+IF OBJECT_ID('dbo.channel_category_counts', 'U') IS NULL
+BEGIN
+    CREATE TABLE channel_category_counts (
+        category NVARCHAR(50) NOT NULL PRIMARY KEY,
+        channel_count INT NOT NULL
+    );
+END
+GO
+
+CREATE OR ALTER TRIGGER trg_channels_category_counts
+ON channels
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -- Recount only the categories touched by this statement
+    MERGE channel_category_counts AS t
+    USING (
+        SELECT a.category, COUNT(c.channel_id) AS channel_count
+        FROM (
+            SELECT category FROM inserted
+            UNION
+            SELECT category FROM deleted
+        ) a
+        LEFT JOIN channels c ON c.category = a.category AND c.is_active = 1
+        GROUP BY a.category
+    ) AS s
+    ON t.category = s.category
+    WHEN MATCHED AND s.channel_count = 0 THEN
+        DELETE
+    WHEN MATCHED THEN
+        UPDATE SET channel_count = s.channel_count
+    WHEN NOT MATCHED BY TARGET AND s.channel_count > 0 THEN
+        INSERT (category, channel_count) VALUES (s.category, s.channel_count);
+END;
+GO
+
+-- Backfill (the trigger only sees future writes)
+MERGE channel_category_counts AS t
+USING (
+    SELECT category, COUNT(*) AS channel_count
+    FROM channels
+    WHERE is_active = 1
+    GROUP BY category
+) AS s
+ON t.category = s.category
+WHEN MATCHED THEN
+    UPDATE SET channel_count = s.channel_count
+WHEN NOT MATCHED BY TARGET THEN
+    INSERT (category, channel_count) VALUES (s.category, s.channel_count)
+WHEN NOT MATCHED BY SOURCE THEN
+    DELETE;
+GO
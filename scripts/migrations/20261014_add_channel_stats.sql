@@ -0,0 +1,111 @@
+-- Migration: Add channel_stats per-channel summary (served by get_channel_statistics)
+-- Written by sp_refresh_samples_1sec from the run's 1-second buckets;
+-- backfilled here for runs that were already refreshed.
+-- Safe to run multiple times.
+
+IF OBJECT_ID('dbo.channel_stats', 'U') IS NULL
+BEGIN
+    CREATE TABLE channel_stats (
+        run_id INT NOT NULL,
+        channel_id INT NOT NULL,
+        sample_count BIGINT NOT NULL,
+        mean_value FLOAT NOT NULL,
+        std_value FLOAT NULL,               -- NULL for a single sample
+        min_value FLOAT NOT NULL,
+        max_value FLOAT NOT NULL,
+        refreshed_at DATETIME2 NOT NULL DEFAULT GETDATE(),
+        CONSTRAINT PK_channel_stats PRIMARY KEY (run_id, channel_id)
+    );
+END
+GO
+
+CREATE OR ALTER PROCEDURE sp_refresh_samples_1sec 
+    @run_id INT
+AS
+BEGIN
+    SET NOCOUNT ON;
+    DECLARE @rows INT;
+    
+    -- Delete existing aggregates for this run
+    DELETE FROM samples_1sec WHERE run_id = @run_id;
+    
+    -- Insert new aggregates (1-second buckets)
+    INSERT INTO samples_1sec (run_id, channel_id, bucket, avg_value, min_value, max_value, std_value, sample_count)
+    SELECT 
+        run_id,
+        channel_id,
+        DATEADD(SECOND, DATEDIFF(SECOND, '2000-01-01', ts), '2000-01-01') AS bucket,
+        AVG(value) AS avg_value,
+        MIN(value) AS min_value,
+        MAX(value) AS max_value,
+        STDEV(value) AS std_value,
+        COUNT(*) AS sample_count
+    FROM samples
+    WHERE run_id = @run_id
+    GROUP BY run_id, channel_id, DATEADD(SECOND, DATEDIFF(SECOND, '2000-01-01', ts), '2000-01-01');
+    
+    SET @rows = @@ROWCOUNT;
+    
+    -- Per-channel stats from the buckets (no second pass over raw samples).
+    -- Exact: mean weighted by sample_count, pooled within + between variance.
+    DELETE FROM channel_stats WHERE run_id = @run_id;
+    
+    WITH b AS (
+        SELECT channel_id, CAST(sample_count AS BIGINT) AS n, avg_value AS m,
+               ISNULL(std_value, 0) AS s, min_value, max_value
+        FROM samples_1sec
+        WHERE run_id = @run_id
+    ),
+    t AS (
+        SELECT channel_id, SUM(n) AS total_n, SUM(n * m) / SUM(n) AS mean
+        FROM b
+        GROUP BY channel_id
+    )
+    INSERT INTO channel_stats (run_id, channel_id, sample_count, mean_value, std_value, min_value, max_value)
+    SELECT
+        @run_id,
+        t.channel_id,
+        t.total_n,
+        t.mean,
+        SQRT(
+            (SUM((b.n - 1) * SQUARE(b.s)) + SUM(b.n * SQUARE(b.m - t.mean)))
+            / NULLIF(t.total_n - 1, 0)
+        ),
+        MIN(b.min_value),
+        MAX(b.max_value)
+    FROM b
+    JOIN t ON t.channel_id = b.channel_id
+    GROUP BY t.channel_id, t.mean, t.total_n;
+    
+    RETURN @rows;
+END
+GO
+
+-- Backfill runs refreshed before this migration
+WITH b AS (
+    SELECT a.run_id, a.channel_id, CAST(a.sample_count AS BIGINT) AS n, a.avg_value AS m,
+           ISNULL(a.std_value, 0) AS s, a.min_value, a.max_value
+    FROM samples_1sec a
+    WHERE NOT EXISTS (SELECT 1 FROM channel_stats c WHERE c.run_id = a.run_id)
+),
+t AS (
+    SELECT run_id, channel_id, SUM(n) AS total_n, SUM(n * m) / SUM(n) AS mean
+    FROM b
+    GROUP BY run_id, channel_id
+)
+INSERT INTO channel_stats (run_id, channel_id, sample_count, mean_value, std_value, min_value, max_value)
+SELECT
+    t.run_id,
+    t.channel_id,
+    t.total_n,
+    t.mean,
+    SQRT(
+        (SUM((b.n - 1) * SQUARE(b.s)) + SUM(b.n * SQUARE(b.m - t.mean)))
+        / NULLIF(t.total_n - 1, 0)
+    ),
+    MIN(b.min_value),
+    MAX(b.max_value)
+FROM b
+JOIN t ON t.run_id = b.run_id AND t.channel_id = b.channel_id
+GROUP BY t.run_id, t.channel_id, t.mean, t.total_n;
+GO
@@ -0,0 +1,16 @@
+-- Migration: Add covering index for the /channels and /channels/categories queries
+-- (WHERE is_active = 1 [AND category = ?] ORDER BY channel_id / GROUP BY category).
+-- Not a filtered index: those require QUOTED_IDENTIFIER ON for every writer,
+-- and sqlcmd seeds channels with it OFF.
+-- Safe to run multiple times.
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_channels_active_category' AND object_id = OBJECT_ID('dbo.channels')
+)
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_channels_active_category
+        ON channels(is_active, category, channel_id)
+        INCLUDE (name, display_name, unit, sample_rate_hz);
+END
+GO
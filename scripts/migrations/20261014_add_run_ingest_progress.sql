@@ -0,0 +1,12 @@
+-- Migration: Add run_ingest_progress table (consumer-maintained ingestion counter)
+-- Safe to run multiple times.
+
+IF OBJECT_ID('dbo.run_ingest_progress', 'U') IS NULL
+BEGIN
+    CREATE TABLE run_ingest_progress (
+        run_id INT NOT NULL PRIMARY KEY,
+        inserted_count BIGINT NOT NULL DEFAULT 0,
+        updated_at DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME()
+    );
+END
+GO
@@ -0,0 +1,101 @@
+-- Migration: Add run_meta per-run sample range/count (served by get_time_range / get_sample_count)
+-- Written by sp_refresh_samples_1sec; backfilled here for runs that were already refreshed.
+-- Requires 20261014_add_channel_stats.sql. Safe to run multiple times.
+
+IF OBJECT_ID('dbo.run_meta', 'U') IS NULL
+BEGIN
+    CREATE TABLE run_meta (
+        run_id INT NOT NULL PRIMARY KEY,
+        start_ts DATETIME2(3) NULL,
+        end_ts DATETIME2(3) NULL,
+        sample_count BIGINT NOT NULL,
+        refreshed_at DATETIME2 NOT NULL DEFAULT GETDATE()
+    );
+END
+GO
+
+CREATE OR ALTER PROCEDURE sp_refresh_samples_1sec 
+    @run_id INT
+AS
+BEGIN
+    SET NOCOUNT ON;
+    DECLARE @rows INT;
+    
+    -- Delete existing aggregates for this run
+    DELETE FROM samples_1sec WHERE run_id = @run_id;
+    
+    -- Insert new aggregates (1-second buckets)
+    INSERT INTO samples_1sec (run_id, channel_id, bucket, avg_value, min_value, max_value, std_value, sample_count)
+    SELECT 
+        run_id,
+        channel_id,
+        DATEADD(SECOND, DATEDIFF(SECOND, '2000-01-01', ts), '2000-01-01') AS bucket,
+        AVG(value) AS avg_value,
+        MIN(value) AS min_value,
+        MAX(value) AS max_value,
+        STDEV(value) AS std_value,
+        COUNT(*) AS sample_count
+    FROM samples
+    WHERE run_id = @run_id
+    GROUP BY run_id, channel_id, DATEADD(SECOND, DATEDIFF(SECOND, '2000-01-01', ts), '2000-01-01');
+    
+    SET @rows = @@ROWCOUNT;
+    
+    -- Per-channel stats from the buckets (no second pass over raw samples).
+    -- Exact: mean weighted by sample_count, pooled within + between variance.
+    DELETE FROM channel_stats WHERE run_id = @run_id;
+    
+    WITH b AS (
+        SELECT channel_id, CAST(sample_count AS BIGINT) AS n, avg_value AS m,
+               ISNULL(std_value, 0) AS s, min_value, max_value
+        FROM samples_1sec
+        WHERE run_id = @run_id
+    ),
+    t AS (
+        SELECT channel_id, SUM(n) AS total_n, SUM(n * m) / SUM(n) AS mean
+        FROM b
+        GROUP BY channel_id
+    )
+    INSERT INTO channel_stats (run_id, channel_id, sample_count, mean_value, std_value, min_value, max_value)
+    SELECT
+        @run_id,
+        t.channel_id,
+        t.total_n,
+        t.mean,
+        SQRT(
+            (SUM((b.n - 1) * SQUARE(b.s)) + SUM(b.n * SQUARE(b.m - t.mean)))
+            / NULLIF(t.total_n - 1, 0)
+        ),
+        MIN(b.min_value),
+        MAX(b.max_value)
+    FROM b
+    JOIN t ON t.channel_id = b.channel_id
+    GROUP BY t.channel_id, t.mean, t.total_n;
+    
+    -- Run-level range and count, so get_time_range / get_sample_count are one seek
+    MERGE run_meta AS t
+    USING (
+        SELECT @run_id AS run_id, MIN(ts) AS start_ts, MAX(ts) AS end_ts, COUNT_BIG(*) AS sample_count
+        FROM samples
+        WHERE run_id = @run_id
+    ) AS s
+    ON t.run_id = s.run_id
+    WHEN MATCHED THEN
+        UPDATE SET start_ts = s.start_ts, end_ts = s.end_ts,
+                   sample_count = s.sample_count, refreshed_at = GETDATE()
+    WHEN NOT MATCHED THEN
+        INSERT (run_id, start_ts, end_ts, sample_count)
+        VALUES (s.run_id, s.start_ts, s.end_ts, s.sample_count);
+    
+    RETURN @rows;
+END
+GO
+
+-- Backfill runs refreshed before this migration
+INSERT INTO run_meta (run_id, start_ts, end_ts, sample_count)
+SELECT s.run_id, MIN(s.ts), MAX(s.ts), COUNT_BIG(*)
+FROM samples s
+WHERE s.run_id IN (SELECT DISTINCT run_id FROM samples_1sec)
+  AND NOT EXISTS (SELECT 1 FROM run_meta m WHERE m.run_id = s.run_id)
+GROUP BY s.run_id;
+GO
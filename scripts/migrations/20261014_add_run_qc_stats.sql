@@ -0,0 +1,74 @@
+-- Migration: Add run_qc_stats single-row QC counters (served by GET /runs)
+-- Maintained by a trigger on runs.qc_status; backfilled from the current table.
+-- Requires 20261014_add_runs_qc_status.sql. Safe to run multiple times.
+
+IF OBJECT_ID('dbo.run_qc_stats', 'U') IS NULL
+BEGIN
+    CREATE TABLE run_qc_stats (
+        stats_id TINYINT NOT NULL PRIMARY KEY DEFAULT 1 CHECK (stats_id = 1),  -- Single row
+        total_runs INT NOT NULL DEFAULT 0,
+        passed INT NOT NULL DEFAULT 0,
+        warned INT NOT NULL DEFAULT 0,
+        failed INT NOT NULL DEFAULT 0,
+        not_run INT NOT NULL DEFAULT 0
+    );
+END
+GO
+
+CREATE OR ALTER TRIGGER trg_runs_qc_stats
+ON runs
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -- Updates that leave qc_status alone cannot change the counters
+    IF EXISTS (SELECT 1 FROM inserted) AND EXISTS (SELECT 1 FROM deleted) AND NOT UPDATE(qc_status)
+        RETURN;
+
+    -- Apply the statement's net delta: +1 per inserted row, -1 per deleted row
+    UPDATE s SET
+        total_runs = s.total_runs + d.total_runs,
+        passed = s.passed + d.passed,
+        warned = s.warned + d.warned,
+        failed = s.failed + d.failed,
+        not_run = s.not_run + d.not_run
+    FROM run_qc_stats s
+    CROSS JOIN (
+        SELECT
+            ISNULL(SUM(x.sign), 0) AS total_runs,
+            ISNULL(SUM(CASE WHEN x.qc_status = 'pass' THEN x.sign ELSE 0 END), 0) AS passed,
+            ISNULL(SUM(CASE WHEN x.qc_status = 'warn' THEN x.sign ELSE 0 END), 0) AS warned,
+            ISNULL(SUM(CASE WHEN x.qc_status = 'fail' THEN x.sign ELSE 0 END), 0) AS failed,
+            ISNULL(SUM(CASE WHEN x.qc_status IS NULL THEN x.sign ELSE 0 END), 0) AS not_run
+        FROM (
+            SELECT qc_status, 1 AS sign FROM inserted
+            UNION ALL
+            SELECT qc_status, -1 AS sign FROM deleted
+        ) x
+    ) d
+    WHERE s.stats_id = 1;
+END;
+GO
+
+-- Backfill (the trigger only sees future writes)
+MERGE run_qc_stats AS t
+USING (
+    SELECT
+        CAST(1 AS TINYINT) AS stats_id,
+        COUNT(*) AS total_runs,
+        SUM(CASE WHEN qc_status = 'pass' THEN 1 ELSE 0 END) AS passed,
+        SUM(CASE WHEN qc_status = 'warn' THEN 1 ELSE 0 END) AS warned,
+        SUM(CASE WHEN qc_status = 'fail' THEN 1 ELSE 0 END) AS failed,
+        SUM(CASE WHEN qc_status IS NULL THEN 1 ELSE 0 END) AS not_run
+    FROM runs
+) AS s
+ON t.stats_id = s.stats_id
+WHEN MATCHED THEN
+    UPDATE SET total_runs = s.total_runs, passed = ISNULL(s.passed, 0), warned = ISNULL(s.warned, 0),
+               failed = ISNULL(s.failed, 0), not_run = ISNULL(s.not_run, 0)
+WHEN NOT MATCHED BY TARGET THEN
+    INSERT (stats_id, total_runs, passed, warned, failed, not_run)
+    VALUES (s.stats_id, s.total_runs, ISNULL(s.passed, 0), ISNULL(s.warned, 0),
+            ISNULL(s.failed, 0), ISNULL(s.not_run, 0));
+GO
@@ -0,0 +1,17 @@
+-- Migration: Denormalize qc_summaries.overall_status into runs.qc_status
+-- Lets list views show QC status without joining qc_summaries.
+-- Safe to run multiple times.
+
+IF COL_LENGTH('dbo.runs', 'qc_status') IS NULL
+BEGIN
+    ALTER TABLE runs ADD qc_status NVARCHAR(20) NULL;
+END
+GO
+
+-- Backfill from existing QC summaries
+UPDATE r
+SET r.qc_status = qs.overall_status
+FROM runs r
+JOIN qc_summaries qs ON qs.run_id = r.run_id
+WHERE r.qc_status IS NULL OR r.qc_status <> qs.overall_status;
+GO
@@ -0,0 +1,12 @@
+-- Migration: Add narrow samples(run_id) index for per-run COUNT(*)
+-- Safe to run multiple times.
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_samples_run_id' AND object_id = OBJECT_ID('dbo.samples')
+)
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_samples_run_id
+        ON samples(run_id);
+END
+GO
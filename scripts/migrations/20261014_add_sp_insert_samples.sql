@@ -0,0 +1,26 @@
+-- Migration: Add samples_tvp type + sp_insert_samples (TVP bulk insert path)
+-- Safe to run multiple times.
+
+IF TYPE_ID('dbo.samples_tvp') IS NULL
+BEGIN
+    CREATE TYPE dbo.samples_tvp AS TABLE (
+        channel_id INT NOT NULL,
+        ts DATETIME2(3) NOT NULL,
+        value FLOAT NOT NULL,
+        quality_flag TINYINT NOT NULL DEFAULT 0
+    );
+END
+GO
+
+CREATE OR ALTER PROCEDURE sp_insert_samples
+    @run_id INT,
+    @rows dbo.samples_tvp READONLY
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    INSERT INTO samples (run_id, channel_id, ts, value, quality_flag)
+    SELECT @run_id, channel_id, ts, value, quality_flag
+    FROM @rows;
+END
+GO
@@ -14,39 +14,77 @@ This script is intentionally small and demo-friendly:
 
 import sys
 import os
+from typing import TYPE_CHECKING, Tuple
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.processing.processor import RunProcessor
-from src.db.timeseries import refresh_aggregates
-from src.db.connection import execute_query, execute_non_query
+if TYPE_CHECKING:
+    from src.processing.processor import ProcessingResult
 
 
-def main() -> int:
-    import argparse
+def process_run(
+    run_id: int,
+    target_hz: float = 100.0,
+    despike_threshold: float = 3.5,
+) -> Tuple["ProcessingResult", int]:
+    """
+    Process a run in-process and persist statistics, QC and aggregates.
 
-    parser = argparse.ArgumentParser(description="Process an existing run and persist results to DB")
-    parser.add_argument("--run-id", type=int, required=True, help="Run ID to process")
-    parser.add_argument("--target-hz", type=float, default=100.0, help="Resample target rate (Hz)")
-    parser.add_argument("--despike-threshold", type=float, default=3.5, help="MAD threshold for spike detection")
-    args = parser.parse_args()
+    Shared by the CLI below and scripts/admin_fulfill_demo_request.py.
+
+    Returns:
+        (processing result, raw sample count)
+    """
+    # Imported here so --help (and importers of this module) skip numpy/scipy/pyodbc
+    from src.processing.processor import RunProcessor
+    from src.db.timeseries import refresh_aggregates
+    from src.db.connection import execute_scalar
 
     # Sync runs.sample_count to the true raw sample count before processing.
     # This prevents stale/partial metadata (common during streaming catch-up).
-    rows = execute_query("SELECT COUNT(*) AS cnt FROM samples WHERE run_id = ?", (args.run_id,))
-    sample_cnt = int(rows[0]["cnt"]) if rows else 0
-    execute_non_query("UPDATE runs SET sample_count = ? WHERE run_id = ?", (sample_cnt, args.run_id))
-
-    processor = RunProcessor(target_hz=args.target_hz, despike_threshold=args.despike_threshold)
-    result = processor.process_from_database(run_id=args.run_id)
+    # Count + update in one round trip (index-only count via IX_samples_run_id).
+    # OUTPUT goes INTO a table variable: runs has triggers (trg_runs_qc_stats).
+    sample_cnt = int(execute_scalar(
+        """
+        SET NOCOUNT ON;
+        DECLARE @out TABLE (sample_count INT);
+        UPDATE runs
+        SET sample_count = (SELECT COUNT_BIG(*) FROM samples WHERE run_id = ?)
+        OUTPUT INSERTED.sample_count INTO @out
+        WHERE run_id = ?;
+        SELECT sample_count FROM @out;
+        """,
+        (run_id, run_id),
+    ) or 0)
+
+    processor = RunProcessor(target_hz=target_hz, despike_threshold=despike_threshold)
+    result = processor.process_from_database(run_id=run_id)
     processor.save_results(result)
 
     try:
-        refresh_aggregates(args.run_id)
+        refresh_aggregates(run_id)
     except Exception as e:
         # Aggregates are an optimization; don't fail the whole script for this.
         print(f"Warning: could not refresh aggregates: {e}")
 
+    return result, sample_cnt
+
+
+def main() -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Process an existing run and persist results to DB")
+    parser.add_argument("--run-id", type=int, required=True, help="Run ID to process")
+    parser.add_argument("--target-hz", type=float, default=100.0, help="Resample target rate (Hz)")
+    parser.add_argument("--despike-threshold", type=float, default=3.5, help="MAD threshold for spike detection")
+    args = parser.parse_args()
+
+    result, sample_cnt = process_run(
+        args.run_id,
+        target_hz=args.target_hz,
+        despike_threshold=args.despike_threshold,
+    )
+
     print("")
     print("✅ Processing complete")
     print(f"  Run ID: {args.run_id}")
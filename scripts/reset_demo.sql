@@ -25,7 +25,10 @@ TRUNCATE TABLE qc_summaries;
 TRUNCATE TABLE run_statistics;
 TRUNCATE TABLE run_deltas;
 TRUNCATE TABLE samples_1sec;
+TRUNCATE TABLE channel_stats;
+TRUNCATE TABLE run_meta;
 TRUNCATE TABLE samples_processed;
+TRUNCATE TABLE run_ingest_progress;
 GO
 
 -- -----------------------------------------------------------------------------
@@ -36,6 +39,10 @@ TRUNCATE TABLE runs;
 TRUNCATE TABLE test_sessions;
 GO
 
+-- TRUNCATE does not fire triggers: zero the trigger-maintained QC counters
+UPDATE run_qc_stats SET total_runs = 0, passed = 0, warned = 0, failed = 0, not_run = 0;
+GO
+
 -- -----------------------------------------------------------------------------
 -- Optional demo cleanup (safe to wipe for demos)
 -- -----------------------------------------------------------------------------
@@ -14,20 +14,30 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.config import get_config  # noqa: E402
+from src.logging_config import configure_logging  # noqa: E402
 from src.streaming.consumer import SensorDataConsumer  # noqa: E402
 
 
 def main() -> int:
     import argparse
+    import signal
     import time
 
     parser = argparse.ArgumentParser(description="AeroStream Kafka consumer (Kafka -> SQL Server)")
     parser.add_argument("--max-seconds", type=int, default=600, help="Stop after N seconds (default 600)")
     parser.add_argument("--batch-size", type=int, default=20000, help="DB insert batch size (default 20000)")
     parser.add_argument("--group-id", type=str, default="aerostream-consumer-demo", help="Kafka consumer group id")
-    parser.add_argument("--progress-interval", type=int, default=20000, help="Progress print interval (messages)")
+    parser.add_argument(
+        "--insert-method",
+        type=str,
+        default="tvp",
+        choices=["tvp", "executemany", "bcp"],
+        help="DB insert path: table-valued parameter (default), fast_executemany, or bcp bulk copy (needs BCP_TRUSTED_AUTH=1, else falls back to executemany)",
+    )
+    parser.add_argument("--progress-interval", type=int, default=20000, help="Progress print interval (samples)")
     parser.add_argument("--benchmark", action="store_true", help="Benchmark mode: 30s test with summary table")
     args = parser.parse_args()
+    configure_logging()
 
     cfg = get_config()
 
@@ -43,7 +53,7 @@ def main() -> int:
     
     print(f"Kafka:  {cfg.kafka.bootstrap_servers}  topic={cfg.kafka.topic}")
     print(f"DB:     {cfg.db.host}:{cfg.db.port}/{cfg.db.database}")
-    print(f"Batch:  {args.batch_size:,}")
+    print(f"Batch:  {args.batch_size:,}  insert={args.insert_method}")
     print("")
 
     with SensorDataConsumer(
@@ -51,7 +61,16 @@ def main() -> int:
         topic=cfg.kafka.topic,
         group_id=args.group_id,
         batch_size=args.batch_size,
+        insert_method=args.insert_method,
     ) as consumer:
+        # `kill` (kafka_demo.sh cleanup) sends SIGTERM: stop the loop so the
+        # final flush + offset commit run, same as Ctrl+C.
+        def _graceful_shutdown(signum, frame):
+            print("\nSIGTERM received, shutting down...")
+            consumer.stop()
+
+        signal.signal(signal.SIGTERM, _graceful_shutdown)
+
         stats = consumer.consume(
             max_messages=None,
             max_time_seconds=args.max_seconds,
@@ -66,6 +85,7 @@ def main() -> int:
         print(f"{'Metric':<25} {'Value':>15}")
         print("-" * 42)
         print(f"{'Messages Processed':<25} {stats.get('messages_processed', 0):>15,}")
+        print(f"{'Samples Received':<25} {stats.get('samples_received', 0):>15,}")
         print(f"{'Samples Inserted':<25} {stats.get('samples_inserted', 0):>15,}")
         print(f"{'Batches':<25} {stats.get('batches_inserted', 0):>15,}")
         print(f"{'Batch Size':<25} {args.batch_size:>15,}")
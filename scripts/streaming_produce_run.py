@@ -11,15 +11,11 @@ Usage:
 
 import sys
 import os
-import time
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.config import get_config  # noqa: E402
-from src.simulator.sensor_simulator import WindTunnelSimulator, RunConfiguration  # noqa: E402
-from src.streaming.producer import SensorDataProducer, create_topic_if_not_exists  # noqa: E402
-from src.db.operations import create_test_session, create_run, start_run, complete_run  # noqa: E402
-from src.db.connection import execute_query  # noqa: E402
+from src.logging_config import configure_logging  # noqa: E402
 
 
 def main() -> int:
@@ -36,6 +32,13 @@ def main() -> int:
     parser.add_argument("--ingest-wait-seconds", type=int, default=60,
                         help="Max seconds to wait for consumer to ingest all samples before completing run")
     args = parser.parse_args()
+    configure_logging()
+
+    # Heavy imports (numpy/kafka/pyodbc) after argparse so --help stays fast
+    from src.simulator.sensor_simulator import WindTunnelSimulator, RunConfiguration
+    from src.streaming.producer import SensorDataProducer, create_topic_if_not_exists
+    from src.streaming.ingest_monitor import wait_for_ingestion
+    from src.db.operations import create_test_session, create_run, start_run, complete_run
 
     cfg = get_config()
 
@@ -93,36 +96,7 @@ def main() -> int:
     # Wait for the consumer to ingest the run before completing it.
     # This prevents runs.sample_count from being a partial "so far" value.
     target = int(stats.get("samples_sent", 0))
-    inserted = 0
-    last = -1
-    stable_ticks = 0
-    t0 = time.time()
-
-    # Give consumer a brief head start
-    time.sleep(2)
-
-    while True:
-        rows = execute_query("SELECT COUNT(*) AS cnt FROM samples WHERE run_id = ?", (run_id,))
-        inserted = int(rows[0]["cnt"]) if rows else 0
-
-        if target and inserted >= target:
-            break
-
-        if inserted == last:
-            stable_ticks += 1
-        else:
-            stable_ticks = 0
-            last = inserted
-
-        # Defensive: if target is unknown (0), allow early exit once ingestion stabilizes.
-        # When target is known (normal path), rely on the target or the explicit timeout.
-        if not target and stable_ticks >= 10 and inserted > 0:
-            break
-
-        if time.time() - t0 >= args.ingest_wait_seconds:
-            break
-
-        time.sleep(1)
+    inserted = wait_for_ingestion(run_id, target=target, max_wait_seconds=args.ingest_wait_seconds)
 
     complete_run(run_id=run_id, tunnel_speed_actual=args.speed, sample_count=inserted)
 
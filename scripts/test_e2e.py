@@ -9,7 +9,7 @@ import sys
 import os
 import time
 import json
-from datetime import datetime, timedelta
+from datetime import datetime
 
 # Add project root
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -97,35 +97,34 @@ def test_insert_samples(run_id: int):
     print("=" * 60)
     
     try:
-        from src.db.operations import bulk_insert_samples
+        from src.db.operations import bulk_insert_sample_rows
+        from src.processing.synth import synthesize_channels
         import numpy as np
         
         # Generate test samples for 3 channels, 1 second of data at 100Hz
-        samples = []
         base_time = datetime.now()
         n_samples = 100  # 1 second at 100Hz
+        timestamps = (np.datetime64(base_time, 'us') + np.arange(n_samples) * np.timedelta64(10, 'ms')).tolist()
         
-        for channel_id in [1, 2, 59]:  # lift, drag, velocity
-            for i in range(n_samples):
-                ts = base_time + timedelta(milliseconds=i * 10)
-                
-                if channel_id == 1:  # Lift (downforce)
-                    value = -3000 + np.sin(2 * np.pi * 5 * (i / n_samples)) * 100 + np.random.normal(0, 20)
-                elif channel_id == 2:  # Drag
-                    value = 600 + np.random.normal(0, 10)
-                else:  # Velocity
-                    value = 50.0 + np.random.normal(0, 0.5)
-                
-                samples.append({
-                    'run_id': run_id,
-                    'channel_id': channel_id,
-                    'ts': ts,
-                    'value': float(value),
-                    'quality_flag': 0
-                })
+        channel_ids = [1, 2, 59]  # lift (downforce), drag, velocity
+        values = synthesize_channels(
+            n_samples,
+            offsets=[-3000.0, 600.0, 50.0],
+            amplitudes=[100.0, 0.0, 0.0],
+            freqs=[5.0, 0.0, 0.0],
+            noise_std=[20.0, 10.0, 0.5],
+            seed=42,
+        )
+        
+        # (channel_id, ts, value, quality_flag) tuples: no per-row dicts
+        samples = [
+            (channel_id, ts, value, 0)
+            for channel_id, channel_values in zip(channel_ids, values.tolist())
+            for ts, value in zip(timestamps, channel_values)
+        ]
         
         # Bulk insert
-        inserted = bulk_insert_samples(samples, run_id)
+        inserted = bulk_insert_sample_rows(samples, run_id)
         log_test(f"Inserted {inserted} samples", inserted > 0)
         
         return inserted
@@ -141,7 +140,7 @@ def test_processing_pipeline(run_id: int):
     print("=" * 60)
     
     try:
-        from src.db.connection import execute_query
+        from src.db.connection import execute_query_rows
         from src.processing import RunProcessor
         
         # Get samples from database
@@ -151,8 +150,8 @@ def test_processing_pipeline(run_id: int):
             WHERE run_id = ? 
             ORDER BY channel_id, ts
         """
-        rows = execute_query(query, (run_id,))
-        samples = [{'channel_id': r['channel_id'], 'ts': r['ts'], 'value': r['value']} for r in rows]
+        rows = execute_query_rows(query, (run_id,))
+        samples = [{'channel_id': r[0], 'ts': r[1], 'value': r[2]} for r in rows]
         
         log_test(f"Loaded {len(samples)} samples from DB", len(samples) > 0)
         
@@ -240,15 +239,38 @@ def test_api_endpoints():
     print("=" * 60)
     
     try:
-        import urllib.request
-        import json
+        import asyncio
+        import httpx
         
         base_url = "http://localhost:8000"
+        paths = ["/health", "/channels", "/runs", "/sessions"]
+        
+        async def fetch(client: httpx.AsyncClient, path: str):
+            response = await client.get(path)
+            response.raise_for_status()
+            return response.json()
+        
+        async def probe():
+            # One keep-alive client; endpoints are independent, so issue all GETs
+            # at once (wall time = slowest one)
+            async with httpx.AsyncClient(base_url=base_url, timeout=5) as client:
+                data = await asyncio.gather(
+                    *(fetch(client, path) for path in paths),
+                    return_exceptions=True,
+                )
+            return dict(zip(paths, data))
+        
+        responses = asyncio.run(probe())
+        
+        def result(path: str):
+            data = responses[path]
+            if isinstance(data, Exception):
+                raise data
+            return data
         
         # Test health
         try:
-            response = urllib.request.urlopen(f"{base_url}/health", timeout=5)
-            data = json.loads(response.read())
+            data = result("/health")
             log_test("GET /health", data.get('status') == 'ok', f"status={data.get('status')}")
         except Exception as e:
             log_test("GET /health", False, str(e))
@@ -256,24 +278,21 @@ def test_api_endpoints():
         
         # Test channels
         try:
-            response = urllib.request.urlopen(f"{base_url}/channels", timeout=5)
-            data = json.loads(response.read())
+            data = result("/channels")
             log_test("GET /channels", data.get('total', 0) > 0, f"total={data.get('total')}")
         except Exception as e:
             log_test("GET /channels", False, str(e))
         
         # Test runs list
         try:
-            response = urllib.request.urlopen(f"{base_url}/runs", timeout=5)
-            data = json.loads(response.read())
+            data = result("/runs")
             log_test("GET /runs", 'runs' in data, f"total={data.get('total', 0)}")
         except Exception as e:
             log_test("GET /runs", False, str(e))
         
         # Test sessions list
         try:
-            response = urllib.request.urlopen(f"{base_url}/sessions", timeout=5)
-            data = json.loads(response.read())
+            data = result("/sessions")
             log_test("GET /sessions", 'sessions' in data, f"total={data.get('total', 0)}")
         except Exception as e:
             log_test("GET /sessions", False, str(e))
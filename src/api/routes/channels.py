@@ -4,70 +4,165 @@ Channels Router
 Endpoints for sensor channel information.
 """
 
-from typing import Optional
-from fastapi import APIRouter, Query
+import gzip
+import time
+import threading
+from typing import Any, Dict, Optional, Tuple
+import orjson
+import pyodbc
+from cachetools import TTLCache
+from fastapi import APIRouter, Header, Query, Request
+from fastapi.responses import Response, StreamingResponse
 
-from src.api.schemas import Channel, ChannelListResponse
-from src.db.connection import execute_query
+from src.api.schemas import ChannelListResponse
+from src.api.security import require_admin
+from src.db.connection import execute_query, get_db_connection
+from src.db.dim_cache import invalidate_channel_codes
 
 
 router = APIRouter()
 
+# The channels table is effectively static: serve repeat dashboard calls from
+# memory and re-query at most once per TTL. /channels keeps the fully encoded
+# body (plain + gzip), so a hit skips SQL, models and JSON encoding entirely.
+# Keyed by the raw ?category= value, so bounded: cycling unknown categories
+# evicts old entries instead of growing memory.
+_CACHE_TTL_SECONDS = 60.0
+_cache_lock = threading.Lock()
+_channels_cache: TTLCache = TTLCache(maxsize=64, ttl=_CACHE_TTL_SECONDS)
+_categories_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+
+
+def invalidate_channel_cache() -> None:
+    """Drop cached /channels responses and channel codes (call after writing to the channels table)."""
+    global _categories_cache
+    with _cache_lock:
+        _channels_cache.clear()
+        _categories_cache = None
+    invalidate_channel_codes()
+
+
+# Fixed statement texts (one per filter shape) so SQL Server reuses one cached
+# plan each instead of building the string per request.
+# Use actual column names from schema: name, display_name, unit
+_CHANNELS_SELECT = """
+    SELECT 
+        channel_id, 
+        name as channel_code, 
+        display_name as channel_name,
+        category, 
+        unit as units, 
+        sample_rate_hz
+    FROM channels
+    WHERE is_active = 1
+"""
+_Q_CHANNELS_ALL = _CHANNELS_SELECT + " ORDER BY channel_id"
+_Q_CHANNELS_BY_CATEGORY = _CHANNELS_SELECT + " AND category = ? ORDER BY channel_id"
+_Q_CATEGORY_COUNTS = "SELECT category, channel_count FROM channel_category_counts ORDER BY category"
+_Q_CATEGORIES_AGGREGATE = """
+    SELECT category, COUNT(*) as channel_count
+    FROM channels
+    WHERE is_active = 1
+    GROUP BY category
+    ORDER BY category
+"""
+
+
+def _channels_query(category: Optional[str]) -> Tuple[str, tuple]:
+    """SQL + params for active channels, optionally filtered by category."""
+    if category:
+        return _Q_CHANNELS_BY_CATEGORY, (category,)
+    return _Q_CHANNELS_ALL, ()
+
+
+def _encode_channels(category: Optional[str]) -> Tuple[bytes, bytes]:
+    """Query, validate and encode the /channels body: (json, gzip(json))."""
+    rows = execute_query(*_channels_query(category))
+    # Validated once per refresh (coerces the FLOAT sample_rate_hz column to int)
+    response = ChannelListResponse.model_validate({"channels": rows, "total": len(rows)})
+    body = orjson.dumps(response.model_dump(mode="json"))
+    return body, gzip.compress(body, compresslevel=6, mtime=0)
+
 
 @router.get("", response_model=ChannelListResponse)
-async def list_channels(
+def list_channels(
+    request: Request,
     category: Optional[str] = None
 ):
     """List all sensor channels."""
-    # Use actual column names from schema: name, display_name, unit
-    query = """
-        SELECT 
-            channel_id, 
-            name as channel_code, 
-            display_name as channel_name,
-            category, 
-            unit as units, 
-            sample_rate_hz
-        FROM channels
-        WHERE is_active = 1
-    """
-    params = []
+    with _cache_lock:
+        cached = _channels_cache.get(category)
+    if cached:
+        body, gzipped = cached
+    else:
+        body, gzipped = _encode_channels(category)
+        with _cache_lock:
+            _channels_cache[category] = (body, gzipped)
     
-    if category:
-        query += " AND category = ?"
-        params.append(category)
-    
-    query += " ORDER BY channel_id"
+    headers = {"Cache-Control": f"public, max-age={int(_CACHE_TTL_SECONDS)}", "Vary": "Accept-Encoding"}
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=gzipped, media_type="application/json", headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.post("/cache/invalidate")
+def invalidate_cache(x_admin_token: Optional[str] = Header(default=None)):
+    """Admin: drop cached /channels responses after editing the channels table."""
+    require_admin(x_admin_token)
+    invalidate_channel_cache()
+    return {"ok": True}
+
+
+@router.get("/stream")
+def stream_channels(
+    category: Optional[str] = None
+):
+    """
+    Stream active channels as NDJSON (one Channel object per line).
     
-    rows = execute_query(query, tuple(params))
+    Rows are encoded straight off the cursor, so memory stays flat and the
+    client can start rendering before the last row arrives.
+    """
+    query, params = _channels_query(category)
     
-    channels = [Channel(
-        channel_id=row['channel_id'],
-        channel_code=row['channel_code'],
-        channel_name=row['channel_name'],
-        category=row['category'],
-        units=row['units'],
-        sample_rate_hz=row['sample_rate_hz']
-    ) for row in rows]
+    def lines():
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            columns = [column[0] for column in cursor.description]
+            for row in cursor:
+                channel = dict(zip(columns, row))
+                channel['sample_rate_hz'] = int(channel['sample_rate_hz'])  # FLOAT column, int in the Channel schema
+                yield orjson.dumps(channel) + b"\n"
     
-    return ChannelListResponse(channels=channels, total=len(channels))
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 @router.get("/categories")
-async def list_categories():
+def list_categories():
     """List all channel categories."""
-    query = """
-        SELECT DISTINCT category, COUNT(*) as channel_count
-        FROM channels
-        WHERE is_active = 1
-        GROUP BY category
-        ORDER BY category
-    """
-    rows = execute_query(query, ())
+    global _categories_cache
+    cached = _categories_cache
+    if cached and time.monotonic() - cached[0] < _CACHE_TTL_SECONDS:
+        return cached[1]
+    
+    # Trigger-maintained pre-aggregation (a PK range read, no GROUP BY scan)
+    try:
+        rows = execute_query(_Q_CATEGORY_COUNTS, ())
+    except pyodbc.Error:
+        rows = []
+    
+    if not rows:
+        # Table not migrated yet (or empty): aggregate channels directly
+        rows = execute_query(_Q_CATEGORIES_AGGREGATE, ())
     
-    return {
+    response = {
         "categories": [
             {"name": row['category'], "channel_count": row['channel_count']}
             for row in rows
         ]
     }
+    with _cache_lock:
+        _categories_cache = (time.monotonic(), response)
+    return response
@@ -4,11 +4,11 @@ Demo Requests Router
 Public endpoint for requesting demo runs (no-login flow) + admin endpoints for approval/fulfillment.
 """
 
-import os
 from typing import Optional
 
 from fastapi import APIRouter, HTTPException, Request, Header, Query
 
+from src.api.security import require_admin
 from src.api.schemas import (
     DemoRunRequestCreate,
     DemoRunRequest,
@@ -19,24 +19,15 @@ from src.db.operations import (
     create_demo_run_request,
     get_demo_run_request,
     list_demo_run_requests,
-    update_demo_run_request_status,
-    attach_run_to_demo_request,
+    admin_apply_demo_request,
 )
 
 
 router = APIRouter()
 
 
-def _require_admin(x_admin_token: Optional[str]) -> None:
-    expected = os.getenv("ADMIN_TOKEN", "")
-    if not expected:
-        raise HTTPException(status_code=500, detail="ADMIN_TOKEN not configured")
-    if not x_admin_token or x_admin_token != expected:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-
-
 @router.post("/requests", response_model=dict)
-async def create_request(payload: DemoRunRequestCreate, request: Request):
+def create_request(payload: DemoRunRequestCreate, request: Request):
     """Public: create a demo run request."""
     # Basic allowlist for variants
     if payload.requested_variant not in {"baseline", "variant_a", "variant_b"}:
@@ -58,28 +49,32 @@ async def create_request(payload: DemoRunRequestCreate, request: Request):
 
 
 @router.get("/requests/{request_id}", response_model=DemoRunRequest)
-async def get_request(request_id: int):
+def get_request(request_id: int):
     """Public: get request status."""
     row = get_demo_run_request(request_id)
     if not row:
         raise HTTPException(status_code=404, detail="Request not found")
-    return DemoRunRequest(**row)
+    return DemoRunRequest.model_construct(**row)
 
 
 @router.get("/requests", response_model=DemoRunRequestListResponse)
-async def admin_list_requests(
+def admin_list_requests(
     status: Optional[str] = Query(default=None),
     limit: int = Query(default=100, ge=1, le=500),
     x_admin_token: Optional[str] = Header(default=None),
 ):
     """Admin: list requests."""
-    _require_admin(x_admin_token)
+    require_admin(x_admin_token)
     rows = list_demo_run_requests(status=status, limit=limit)
-    return DemoRunRequestListResponse(requests=[DemoRunRequest(**r) for r in rows], total=len(rows))
+    # Trusted DB rows: skip per-row validation (FastAPI still checks response_model)
+    return DemoRunRequestListResponse.model_construct(
+        requests=[DemoRunRequest.model_construct(**r) for r in rows],
+        total=len(rows),
+    )
 
 
 @router.post("/requests/{request_id}/admin", response_model=dict)
-async def admin_update_request(
+def admin_update_request(
     request_id: int,
     payload: DemoRunRequestAdminUpdate,
     x_admin_token: Optional[str] = Header(default=None),
@@ -91,19 +86,18 @@ async def admin_update_request(
     - Public users can only create and poll requests
     - Admin (you) decides what to run and when
     """
-    _require_admin(x_admin_token)
-
-    existing = get_demo_run_request(request_id)
-    if not existing:
+    require_admin(x_admin_token)
+
+    # Update status and optionally attach run_id in one statement
+    updated = admin_apply_demo_request(
+        request_id,
+        payload.status,
+        reviewer_notes=payload.reviewer_notes,
+        run_id=payload.run_id,
+    )
+    if updated is None:
         raise HTTPException(status_code=404, detail="Request not found")
 
-    # Update status
-    update_demo_run_request_status(request_id, payload.status, payload.reviewer_notes)
-
-    # Optionally attach run_id
-    if payload.run_id is not None:
-        attach_run_to_demo_request(request_id, payload.run_id)
-
     return {"ok": True}
 
 
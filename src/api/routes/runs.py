@@ -4,93 +4,98 @@ Runs Router
 Endpoints for wind tunnel run data.
 """
 
-from typing import List, Optional
+import time
+import hashlib
+import inspect
+import functools
+import threading
+from itertools import product
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, Query
+
+import numpy as np
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel
 
 from src.api.schemas import (
     RunSummary, RunDetail, RunListResponse,
-    RunDataResponse, ChannelData, DataPoint,
-    QCReport, QCCheck, RunStatistics,
+    RunDataResponse,
+    QCReport, QCStats, RunStatistics,
     CompareRequest, CompareResponse, DeltaMetric
 )
-from src.db.connection import execute_query
-from src.db.timeseries import get_downsampled_data, get_channel_statistics
+from src.api.security import require_admin
+from src.db.connection import execute_query, execute_query_page, execute_multi, execute_scalar
+from src.db.dim_cache import get_channel_codes
+from src.db.timeseries import get_downsampled_data_multi, get_raw_series_multi, get_channel_statistics
+from src.processing.downsample import minmax_lttb
 
 
 router = APIRouter()
 
 
-@router.get("", response_model=RunListResponse)
-async def list_runs(
-    session_id: Optional[int] = None,
-    state: Optional[str] = None,
-    page: int = Query(default=1, ge=1),
-    page_size: int = Query(default=50, ge=1, le=100)
-):
-    """List all runs with optional filters."""
-    # Use actual column names from schema + LEFT JOIN qc_summaries for qc_status
-    query = """
+# Global QC stats ignore filters/pagination: they are read from the
+# trigger-maintained run_qc_stats row (one clustered seek) and list_runs
+# reuses one result for a few seconds.
+_QC_STATS_TTL_SECONDS = 10.0
+_qc_stats_lock = threading.Lock()
+_qc_stats_cache: Optional[Tuple[float, QCStats]] = None
+
+_Q_QC_STATS = """
+    SELECT total_runs, passed, warned, failed, not_run
+    FROM run_qc_stats WHERE stats_id = 1;
+"""
+
+
+# One fixed SQL text per filter combination (session_id?, state?) so each
+# keeps a single cached plan; values, OFFSET and FETCH are always bound.
+def _runs_where(has_session_id: bool, has_state: bool) -> str:
+    where = "WHERE 1=1"
+    if has_session_id:
+        where += " AND r.session_id = ?"
+    if has_state:
+        where += " AND rs.state_name = ?"
+    return where
+
+
+_Q_RUNS_PAGE = {
+    filters: f"""
         SELECT 
             r.run_id, r.run_number, r.run_name, r.session_id,
             rs.state_name as state,
             rt.type_name as run_type,
             r.ts_start, r.ts_end, r.sample_count,
-            qs.overall_status as qc_status
+            r.qc_status,
+            COUNT(*) OVER () as total_count
         FROM runs r
         LEFT JOIN run_states rs ON r.state_id = rs.state_id
         LEFT JOIN run_types rt ON r.run_type_id = rt.run_type_id
-        LEFT JOIN qc_summaries qs ON r.run_id = qs.run_id
-        WHERE 1=1
+        {_runs_where(*filters)}
+        ORDER BY r.run_id DESC
+        OFFSET ? ROWS FETCH NEXT ? ROWS ONLY;
     """
-    params = []
-    
-    if session_id:
-        query += " AND r.session_id = ?"
-        params.append(session_id)
-    
-    if state:
-        query += " AND rs.state_name = ?"
-        params.append(state)
-    
-    # Get total count
-    count_query = f"""
-        SELECT COUNT(*) as total
+    for filters in product((False, True), repeat=2)
+}
+
+_Q_RUNS_COUNT = {
+    filters: f"""
+        SELECT COUNT(*)
         FROM runs r
         LEFT JOIN run_states rs ON r.state_id = rs.state_id
-        WHERE 1=1
-        {'AND r.session_id = ?' if session_id else ''}
-        {'AND rs.state_name = ?' if state else ''}
+        {_runs_where(*filters)}
     """
-    count_params = []
-    if session_id:
-        count_params.append(session_id)
-    if state:
-        count_params.append(state)
-    
-    count_result = execute_query(count_query, tuple(count_params))
-    total = count_result[0]['total'] if count_result else 0
-    
-    # Get QC stats (single efficient query)
-    qc_stats_query = """
-        SELECT 
-            COUNT(*) as total_runs,
-            SUM(CASE WHEN qs.overall_status = 'pass' THEN 1 ELSE 0 END) as passed,
-            SUM(CASE WHEN qs.overall_status = 'warn' THEN 1 ELSE 0 END) as warned,
-            SUM(CASE WHEN qs.overall_status = 'fail' THEN 1 ELSE 0 END) as failed,
-            SUM(CASE WHEN qs.overall_status IS NULL THEN 1 ELSE 0 END) as not_run
-        FROM runs r
-        LEFT JOIN qc_summaries qs ON r.run_id = qs.run_id
-    """
-    qc_result = execute_query(qc_stats_query, ())
-    qc_row = qc_result[0] if qc_result else {}
-    
+    for filters in product((False, True), repeat=2)
+}
+
+
+def _qc_stats_from_row(qc_row: dict) -> QCStats:
     total_runs = qc_row.get('total_runs', 0) or 0
     passed = qc_row.get('passed', 0) or 0
     pass_rate = (passed / total_runs * 100) if total_runs > 0 else 0.0
     
-    from src.api.schemas import QCStats
-    qc_stats = QCStats(
+    return QCStats(
         total_runs=total_runs,
         passed=passed,
         warned=qc_row.get('warned', 0) or 0,
@@ -98,12 +103,166 @@ async def list_runs(
         not_run=qc_row.get('not_run', 0) or 0,
         pass_rate=round(pass_rate, 1)
     )
+
+
+def _fresh_qc_stats() -> Optional[QCStats]:
+    cached = _qc_stats_cache
+    if cached and time.monotonic() - cached[0] < _QC_STATS_TTL_SECONDS:
+        return cached[1]
+    return None
+
+
+# Responses for runs in a terminal state (QC decided or archived), keyed by
+# (endpoint, run_id) with the ETag they were rendered under. Every request
+# re-reads the run's version (one PK probe) and a cached body is only served
+# while its ETag still matches, so re-processing in another process (new
+# qc_summaries / run_statistics computed_at) is picked up at once; the TTL
+# only bounds memory. Runs still acquiring/processing are never cached.
+_TERMINAL_STATE_IDS = (5, 6, 7)  # validated, rejected, archived
+_response_lock = threading.Lock()
+_response_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+
+_Q_RUN_VERSION = """
+    SELECT r.ts_end, r.qc_status, r.state_id,
+           q.computed_at AS qc_computed_at, s.computed_at AS stats_computed_at
+    FROM runs r
+    LEFT JOIN qc_summaries q ON q.run_id = r.run_id
+    LEFT JOIN run_statistics s ON s.run_id = r.run_id
+    WHERE r.run_id = ?
+"""
+
+
+def make_etag(
+    endpoint: str,
+    run_id: int,
+    ts_end: Optional[datetime],
+    qc_status: Optional[str],
+    state_id: Optional[int],
+    qc_computed_at: Optional[datetime] = None,
+    stats_computed_at: Optional[datetime] = None
+) -> str:
+    """
+    Strong ETag for a run response, versioned by the run's end time, QC
+    status and state plus when its QC summary and statistics were computed.
+    """
+    parts = (ts_end, qc_status, state_id, qc_computed_at, stats_computed_at)
+    version = f"{endpoint}:{run_id}:" + ":".join(
+        p.isoformat() if isinstance(p, datetime) else str(p or '') for p in parts
+    )
+    return '"' + hashlib.blake2b(version.encode(), digest_size=8).hexdigest() + '"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in tags or "*" in tags
+
+
+def _render(result: Any) -> bytes:
+    """Serialized JSON body of a route result (pydantic model or plain dict)."""
+    if isinstance(result, BaseModel):
+        return result.model_dump_json().encode()
+    return orjson.dumps(result)
+
+
+def _cached_json(endpoint: str) -> Callable:
+    """
+    Cache a run_id -> pydantic model (or plain dict) route as its serialized
+    JSON body, and answer If-None-Match with 304 when the run is unchanged.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(run_id: int, request: Request) -> Response:
+            # Cheap version probe before any of the route's queries or JSON
+            # rendering. Only terminal runs get an ETag: earlier states
+            # change without touching the versioned columns. QC results and
+            # statistics are written before the QC summary makes a run
+            # terminal (RunProcessor.save_results).
+            version = execute_query(_Q_RUN_VERSION, (run_id,))
+            if not version or version[0]['state_id'] not in _TERMINAL_STATE_IDS:
+                return Response(content=_render(func(run_id)), media_type="application/json")
+            
+            etag = make_etag(endpoint, run_id, **version[0])
+            if _etag_matches(request, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+            
+            key = (endpoint, run_id)
+            with _response_lock:
+                cached = _response_cache.get(key)
+            if cached is not None and cached[0] == etag:
+                body = cached[1]
+            else:
+                body = _render(func(run_id))
+                with _response_lock:
+                    _response_cache[key] = (etag, body)
+            return Response(content=body, media_type="application/json", headers={"ETag": etag})
+        
+        # FastAPI reads the wrapper's signature: the route's own params plus the request
+        params = list(inspect.signature(func).parameters.values())
+        params.append(inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request))
+        wrapper.__signature__ = inspect.signature(func).replace(parameters=params)
+        return wrapper
+    return decorator
+
+
+def invalidate_run_cache(run_id: Optional[int] = None) -> None:
+    """Drop cached run responses (one run, or all when run_id is None)."""
+    with _response_lock:
+        if run_id is None:
+            _response_cache.clear()
+            return
+        for key in [k for k in _response_cache.keys() if k[1] == run_id]:
+            _response_cache.pop(key, None)
+
+
+@router.get("", response_model=RunListResponse)
+def list_runs(
+    session_id: Optional[int] = None,
+    state: Optional[str] = None,
+    page: int = Query(default=1, ge=1),
+    page_size: int = Query(default=50, ge=1, le=100)
+):
+    """List all runs with optional filters."""
+    global _qc_stats_cache
+    params = []
     
-    # Add pagination
-    offset = (page - 1) * page_size
-    query += f" ORDER BY r.run_id DESC OFFSET {offset} ROWS FETCH NEXT {page_size} ROWS ONLY"
+    if session_id:
+        params.append(session_id)
     
-    rows = execute_query(query, tuple(params))
+    if state:
+        params.append(state)
+    
+    # The page itself, with the filtered total attached via COUNT(*) OVER ()
+    filters = (bool(session_id), bool(state))
+    page_query = _Q_RUNS_PAGE[filters]
+    offset = (page - 1) * page_size
+    page_params = (*params, offset, page_size)
+    
+    rows = None
+    qc_stats = _fresh_qc_stats()
+    if qc_stats is None:
+        with _qc_stats_lock:
+            # Concurrent misses wait here and reuse the first refresh
+            qc_stats = _fresh_qc_stats()
+            if qc_stats is None:
+                # Refresh rides along with the page: still one round-trip
+                qc_result, rows = execute_multi(
+                    "SET NOCOUNT ON;" + _Q_QC_STATS + page_query, page_params
+                )
+                qc_stats = _qc_stats_from_row(qc_result[0] if qc_result else {})
+                _qc_stats_cache = (time.monotonic(), qc_stats)
+    if rows is None:
+        rows = execute_query_page(page_query, page_params, page_size)
+    
+    if rows:
+        total = rows[0]['total_count']
+    elif offset:
+        # Page past the end: the window total is unavailable, count directly
+        total = execute_scalar(_Q_RUNS_COUNT[filters], tuple(params)) or 0
+    else:
+        total = 0
     
     runs = [RunSummary(
         run_id=row['run_id'],
@@ -115,14 +274,15 @@ async def list_runs(
         ts_start=row['ts_start'],
         ts_end=row['ts_end'],
         sample_count=row['sample_count'] or 0,
-        qc_status=row['qc_status']  # From qc_summaries JOIN
+        qc_status=row['qc_status']  # Denormalized from qc_summaries
     ) for row in rows]
     
     return RunListResponse(runs=runs, total=total, page=page, page_size=page_size, qc_stats=qc_stats)
 
 
 @router.get("/{run_id}", response_model=RunDetail)
-async def get_run(run_id: int):
+@_cached_json("run_detail")
+def get_run(run_id: int):
     """Get detailed information about a specific run."""
     # Use actual column names from schema
     query = """
@@ -174,179 +334,222 @@ async def get_run(run_id: int):
     )
 
 
+def _lttb_points(
+    run_id: int,
+    channel_ids: List[int],
+    n_out: int,
+    start_time: Optional[datetime],
+    end_time: Optional[datetime]
+) -> Dict[int, List[Tuple]]:
+    """Raw series reduced to n_out visually representative samples per channel."""
+    points = {}
+    series = get_raw_series_multi(run_id, channel_ids, start_time, end_time)
+    for ch_id, (timestamps, values) in series.items():
+        x = np.array(timestamps, dtype='datetime64[us]').astype(np.int64)
+        points[ch_id] = [
+            (timestamps[i], float(values[i]), None, None, None)
+            for i in minmax_lttb(x, values, n_out)
+        ]
+    return points
+
+
 @router.get("/{run_id}/data", response_model=RunDataResponse)
-async def get_run_data(
+def get_run_data(
     run_id: int,
     channel_ids: Optional[str] = Query(default=None, description="Comma-separated channel IDs"),
     bucket_seconds: int = Query(default=1, ge=1, le=3600),
     start_time: Optional[datetime] = None,
-    end_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None,
+    n_out: Optional[int] = Query(default=None, ge=3, le=20000, description="Points per channel (MinMaxLTTB); overrides bucket_seconds")
 ):
     """
     Get time-series data for a run.
-    Uses downsampled data for efficient D3.js rendering.
+    Uses downsampled data for efficient D3.js rendering: fixed time buckets
+    aggregated in SQL by default, or n_out shape-preserving raw samples per
+    channel (MinMaxLTTB) when n_out is given.
     """
     # Parse channel IDs
     channels_list = None
     if channel_ids:
         channels_list = [int(c.strip()) for c in channel_ids.split(",")]
     
-    # Get channel info (using correct column names)
-    channel_query = "SELECT channel_id, name as channel_code FROM channels"
-    if channels_list:
-        placeholders = ','.join(['?' for _ in channels_list])
-        channel_query += f" WHERE channel_id IN ({placeholders})"
-        channel_rows = execute_query(channel_query, tuple(channels_list))
-    else:
-        channel_rows = execute_query(channel_query, ())
-    
-    channel_codes = {row['channel_id']: row['channel_code'] for row in channel_rows}
-    
-    # Get downsampled data
-    result_channels = []
-    total_points = 0
+    # Channel codes come from the in-process dimension cache (no DB call)
+    channel_codes = get_channel_codes()
     
-    for ch_id in (channels_list or list(channel_codes.keys())[:10]):  # Limit to 10 channels
-        data = get_downsampled_data(
+    # Get downsampled data for all requested channels in one query
+    selected = channels_list or list(channel_codes.keys())[:10]  # Limit to 10 channels
+    if n_out:
+        data_by_channel = _lttb_points(run_id, selected, n_out, start_time, end_time)
+    else:
+        data_by_channel = get_downsampled_data_multi(
             run_id=run_id,
-            channel_id=ch_id,
+            channel_ids=selected,
             bucket_seconds=bucket_seconds,
             start_time=start_time,
             end_time=end_time
         )
+    
+    # Points go out as [ts, value, min, max, count] arrays straight from the
+    # row tuples: no pydantic model (or dict) per point, and no repeated keys.
+    result_channels = []
+    total_points = 0
+    
+    for ch_id in selected:
+        points = data_by_channel.get(ch_id)
         
-        if data:
-            points = [DataPoint(
-                ts=row['ts'],
-                value=row['value'],
-                min_value=row.get('min_value'),
-                max_value=row.get('max_value'),
-                sample_count=row.get('sample_count')
-            ) for row in data]
-            
-            result_channels.append(ChannelData(
-                channel_id=ch_id,
-                channel_code=channel_codes.get(ch_id),
-                data=points
-            ))
+        if points:
+            result_channels.append({
+                'channel_id': ch_id,
+                'channel_code': channel_codes.get(ch_id),
+                'data': points
+            })
             total_points += len(points)
     
-    return RunDataResponse(
-        run_id=run_id,
-        channels=result_channels,
-        bucket_seconds=bucket_seconds,
-        total_points=total_points
-    )
+    return ORJSONResponse({
+        'run_id': run_id,
+        'channels': result_channels,
+        'bucket_seconds': bucket_seconds,
+        'total_points': total_points
+    })
 
 
-@router.get("/{run_id}/statistics", response_model=RunStatistics)
-async def get_run_statistics(run_id: int):
-    """Get computed statistics for a run."""
-    query = """
-        SELECT * FROM run_statistics WHERE run_id = ?
+def _fetch_stats_batch(run_ids: List[int]) -> Dict[int, RunStatistics]:
     """
-    rows = execute_query(query, (run_id,))
+    Build RunStatistics for several runs with one query.
     
-    if not rows:
-        # No pre-computed stats, return basic info
-        sample_count = execute_query(
-            "SELECT COUNT(*) as cnt FROM samples WHERE run_id = ?",
-            (run_id,)
-        )
-        return RunStatistics(
+    Runs without a run_statistics row fall back to their raw sample count
+    (computed only for those runs).
+    """
+    values = ", ".join("(?)" for _ in run_ids)
+    rows = execute_query(f"""
+        SELECT 
+            v.run_id, s.run_id as stats_run_id,
+            s.total_samples, s.valid_samples, s.spike_count,
+            s.cl_mean, s.cl_std, s.cd_mean, s.cd_std,
+            s.efficiency, s.aero_balance_pct,
+            CASE WHEN s.run_id IS NULL
+                 THEN (SELECT COUNT_BIG(*) FROM samples x WHERE x.run_id = v.run_id)
+            END as raw_sample_count
+        FROM (VALUES {values}) v(run_id)
+        LEFT JOIN run_statistics s ON s.run_id = v.run_id
+    """, tuple(run_ids))
+    
+    stats = {}
+    for row in rows:
+        run_id = row['run_id']
+        if row['stats_run_id'] is None:
+            # No pre-computed stats, return basic info
+            stats[run_id] = RunStatistics(
+                run_id=run_id,
+                total_samples=row['raw_sample_count'] or 0,
+                valid_samples=0,
+                spike_count=0
+            )
+            continue
+        
+        stats[run_id] = RunStatistics(
             run_id=run_id,
-            total_samples=sample_count[0]['cnt'] if sample_count else 0,
-            valid_samples=0,
-            spike_count=0
+            total_samples=row.get('total_samples', 0),
+            valid_samples=row.get('valid_samples', 0),
+            spike_count=row.get('spike_count', 0),
+            cl_mean=row.get('cl_mean'),
+            cl_std=row.get('cl_std'),
+            cd_mean=row.get('cd_mean'),
+            cd_std=row.get('cd_std'),
+            efficiency=row.get('efficiency'),
+            aero_balance_pct=row.get('aero_balance_pct')
         )
-    
-    row = rows[0]
-    return RunStatistics(
-        run_id=run_id,
-        total_samples=row.get('total_samples', 0),
-        valid_samples=row.get('valid_samples', 0),
-        spike_count=row.get('spike_count', 0),
-        cl_mean=row.get('cl_mean'),
-        cl_std=row.get('cl_std'),
-        cd_mean=row.get('cd_mean'),
-        cd_std=row.get('cd_std'),
-        efficiency=row.get('efficiency'),
-        aero_balance_pct=row.get('aero_balance_pct')
-    )
+    return stats
+
+
+@router.get("/{run_id}/statistics", response_model=RunStatistics)
+@_cached_json("run_statistics")
+def get_run_statistics(run_id: int):
+    """Get computed statistics for a run."""
+    return _fetch_stats_batch([run_id])[run_id]
 
 
 @router.get("/{run_id}/qc", response_model=QCReport)
-async def get_run_qc(run_id: int):
+@_cached_json("run_qc")
+def get_run_qc(run_id: int):
     """Get QC report for a run."""
-    # Get summary
-    summary_query = "SELECT * FROM qc_summaries WHERE run_id = ?"
-    summary_rows = execute_query(summary_query, (run_id,))
-    
-    if not summary_rows:
-        # Return empty QC report if none exists
-        return QCReport(
-            run_id=run_id,
-            overall_status="not_run",
-            total_checks=0,
-            passed_checks=0,
-            warning_checks=0,
-            failed_checks=0,
-            checks=[],
-            critical_issues=[],
-            recommendations=["Run QC analysis first"]
-        )
-    
-    summary = summary_rows[0]
-    
-    # Get individual checks
-    checks_query = """
+    # Summary and checks in one batch; the report is assembled as plain dicts
+    # (already QCReport-shaped) rather than validated models.
+    summary_rows, check_rows = execute_multi("""
+        SET NOCOUNT ON;
+        
+        SELECT overall_status, total_checks, passed_checks, warning_checks,
+               failed_checks, critical_issues, recommendations
+        FROM qc_summaries WHERE run_id = ?;
+        
         SELECT 
-            qr.rule_id, qr.status, qr.measured_value, qr.threshold_used, 
-            qr.details, qr.channel_id,
-            r.rule_code, r.rule_name
+            r.rule_code, r.rule_name, qr.status,
+            qr.measured_value, qr.threshold_used as threshold,
+            COALESCE(qr.details, '') as details, qr.channel_id
         FROM qc_results qr
         JOIN qc_rules r ON qr.rule_id = r.rule_id
-        WHERE qr.run_id = ?
-    """
-    check_rows = execute_query(checks_query, (run_id,))
+        WHERE qr.run_id = ?;
+    """, (run_id, run_id))
     
-    checks = [QCCheck(
-        rule_code=row['rule_code'],
-        rule_name=row['rule_name'],
-        status=row['status'],
-        measured_value=row['measured_value'],
-        threshold=row['threshold_used'],
-        details=row['details'] or '',
-        channel_id=row['channel_id']
-    ) for row in check_rows]
+    if not summary_rows:
+        # Return empty QC report if none exists
+        return {
+            'run_id': run_id,
+            'overall_status': "not_run",
+            'total_checks': 0,
+            'passed_checks': 0,
+            'warning_checks': 0,
+            'failed_checks': 0,
+            'checks': [],
+            'critical_issues': [],
+            'recommendations': ["Run QC analysis first"]
+        }
     
-    # Parse critical issues and recommendations
-    critical = summary.get('critical_issues', '') or ''
-    recommendations = summary.get('recommendations', '') or ''
+    summary = summary_rows[0]
     
-    return QCReport(
-        run_id=run_id,
-        overall_status=summary['overall_status'],
-        total_checks=summary['total_checks'],
-        passed_checks=summary['passed_checks'],
-        warning_checks=summary['warning_checks'],
-        failed_checks=summary['failed_checks'],
-        checks=checks,
-        critical_issues=critical.split('; ') if critical else [],
-        recommendations=recommendations.split('; ') if recommendations else []
-    )
+    return {
+        'run_id': run_id,
+        'overall_status': summary['overall_status'],
+        'total_checks': summary['total_checks'],
+        'passed_checks': summary['passed_checks'],
+        'warning_checks': summary['warning_checks'],
+        'failed_checks': summary['failed_checks'],
+        'checks': check_rows,
+        'critical_issues': _json_list(summary['critical_issues']),
+        'recommendations': _json_list(summary['recommendations'])
+    }
+
+
+def _json_list(value: Optional[str]) -> List[str]:
+    """Decode a JSON-array text column ('; '-joined text written before JSON is split)."""
+    if not value:
+        return []
+    try:
+        return orjson.loads(value)
+    except orjson.JSONDecodeError:
+        return value.split('; ')
+
+
+@router.post("/cache/invalidate")
+def invalidate_cache(
+    run_id: Optional[int] = None,
+    x_admin_token: Optional[str] = Header(default=None)
+):
+    """Admin: drop cached run detail/statistics/QC responses (e.g. after re-processing)."""
+    require_admin(x_admin_token)
+    invalidate_run_cache(run_id)
+    return {"ok": True}
 
 
 @router.post("/compare", response_model=CompareResponse)
-async def compare_runs(request: CompareRequest):
+def compare_runs(request: CompareRequest):
     """Compare two runs and return deltas."""
-    # Get statistics for both runs
-    baseline_stats = await get_run_statistics(request.baseline_run_id)
-    variant_stats = await get_run_statistics(request.variant_run_id)
-    
-    deltas = []
+    # Get statistics for both runs in one query
+    stats = _fetch_stats_batch([request.baseline_run_id, request.variant_run_id])
+    baseline_stats = stats[request.baseline_run_id]
+    variant_stats = stats[request.variant_run_id]
     
-    # Compare key metrics
+    # Compare key metrics (missing values become NaN and are skipped)
     metrics = [
         ('cl_mean', 'Lift Coefficient'),
         ('cd_mean', 'Drag Coefficient'),
@@ -354,30 +557,39 @@ async def compare_runs(request: CompareRequest):
         ('aero_balance_pct', 'Aero Balance %')
     ]
     
-    for metric_key, metric_name in metrics:
-        baseline_val = getattr(baseline_stats, metric_key, None)
-        variant_val = getattr(variant_stats, metric_key, None)
-        
-        if baseline_val is not None and variant_val is not None:
-            delta = variant_val - baseline_val
-            delta_pct = (delta / abs(baseline_val) * 100) if baseline_val != 0 else 0
-            
-            deltas.append(DeltaMetric(
-                metric=metric_name,
-                baseline_value=baseline_val,
-                variant_value=variant_val,
-                delta=delta,
-                delta_pct=delta_pct
-            ))
+    def _vector(stats: RunStatistics) -> np.ndarray:
+        return np.array([
+            np.nan if getattr(stats, key, None) is None else getattr(stats, key)
+            for key, _ in metrics
+        ], dtype=np.float64)
+    
+    baseline_vec = _vector(baseline_stats)
+    variant_vec = _vector(variant_stats)
+    delta_vec = variant_vec - baseline_vec
+    delta_pct_vec = np.where(
+        baseline_vec != 0,
+        delta_vec / np.where(baseline_vec != 0, np.abs(baseline_vec), 1) * 100,
+        0.0
+    )
+    present = ~np.isnan(delta_vec)
+    
+    deltas = [
+        DeltaMetric(
+            metric=metric_name,
+            baseline_value=float(baseline_vec[i]),
+            variant_value=float(variant_vec[i]),
+            delta=float(delta_vec[i]),
+            delta_pct=float(delta_pct_vec[i])
+        )
+        for i, (_, metric_name) in enumerate(metrics) if present[i]
+    ]
     
     # Generate summary
-    summary_parts = []
-    for d in deltas:
-        if abs(d.delta_pct) > 1:
-            direction = "increased" if d.delta > 0 else "decreased"
-            summary_parts.append(f"{d.metric} {direction} by {abs(d.delta_pct):.1f}%")
-    
-    summary = "; ".join(summary_parts) if summary_parts else "No significant changes"
+    significant = present & (np.abs(delta_pct_vec) > 1)
+    summary = "; ".join(
+        f"{metrics[i][1]} {('decreased', 'increased')[delta_vec[i] > 0]} by {abs(delta_pct_vec[i]):.1f}%"
+        for i in np.flatnonzero(significant)
+    ) or "No significant changes"
     
     return CompareResponse(
         baseline_run_id=request.baseline_run_id,
@@ -4,69 +4,86 @@ Sessions Router
 Endpoints for test session management.
 """
 
+from itertools import product
 from typing import Optional
 from fastapi import APIRouter, HTTPException, Query
 
 from src.api.schemas import Session, SessionListResponse
-from src.db.connection import execute_query
+from src.db.connection import execute_query, execute_query_page
 
 
 router = APIRouter()
 
 
-@router.get("", response_model=SessionListResponse)
-async def list_sessions(
-    model_id: Optional[int] = None,
-    cell_id: Optional[int] = None,
-    page: int = Query(default=1, ge=1),
-    page_size: int = Query(default=50, ge=1, le=100)
-):
-    """List all test sessions."""
-    # Use actual column names from schema
-    query = """
+# One fixed SQL text per filter combination (model_id?, cell_id?) so each
+# keeps a single cached plan; values, OFFSET and FETCH are always bound.
+def _sessions_where(has_model_id: bool, has_cell_id: bool) -> str:
+    where = "WHERE 1=1"
+    if has_model_id:
+        where += " AND s.model_id = ?"
+    if has_cell_id:
+        where += " AND s.cell_id = ?"
+    return where
+
+
+# Use actual column names from schema
+_Q_SESSIONS_PAGE = {
+    filters: f"""
         SELECT 
             s.session_id, s.session_name, 
             s.model_id, m.model_name,
             s.cell_id as test_cell_id, tc.cell_name as test_cell_name,
             s.created_at as ts_start, NULL as ts_end, s.notes,
-            (SELECT COUNT(*) FROM runs r WHERE r.session_id = s.session_id) as run_count
+            rc.run_count
         FROM test_sessions s
         LEFT JOIN models m ON s.model_id = m.model_id
         LEFT JOIN test_cells tc ON s.cell_id = tc.cell_id
-        WHERE 1=1
+        LEFT JOIN (
+            SELECT session_id, COUNT(*) as run_count
+            FROM runs
+            GROUP BY session_id
+        ) rc ON rc.session_id = s.session_id
+        {_sessions_where(*filters)}
+        ORDER BY s.session_id DESC OFFSET ? ROWS FETCH NEXT ? ROWS ONLY
+    """
+    for filters in product((False, True), repeat=2)
+}
+
+_Q_SESSIONS_COUNT = {
+    filters: f"""
+        SELECT COUNT(*) as total
+        FROM test_sessions s
+        {_sessions_where(*filters)}
     """
+    for filters in product((False, True), repeat=2)
+}
+
+
+@router.get("", response_model=SessionListResponse)
+def list_sessions(
+    model_id: Optional[int] = None,
+    cell_id: Optional[int] = None,
+    page: int = Query(default=1, ge=1),
+    page_size: int = Query(default=50, ge=1, le=100)
+):
+    """List all test sessions."""
     params = []
     
     if model_id:
-        query += " AND s.model_id = ?"
         params.append(model_id)
     
     if cell_id:
-        query += " AND s.cell_id = ?"
         params.append(cell_id)
     
-    # Get total count
-    count_query = f"""
-        SELECT COUNT(*) as total
-        FROM test_sessions s
-        WHERE 1=1
-        {'AND s.model_id = ?' if model_id else ''}
-        {'AND s.cell_id = ?' if cell_id else ''}
-    """
-    count_params = []
-    if model_id:
-        count_params.append(model_id)
-    if cell_id:
-        count_params.append(cell_id)
+    filters = (bool(model_id), bool(cell_id))
     
-    count_result = execute_query(count_query, tuple(count_params))
+    # Get total count
+    count_result = execute_query(_Q_SESSIONS_COUNT[filters], tuple(params))
     total = count_result[0]['total'] if count_result else 0
     
     # Add pagination
     offset = (page - 1) * page_size
-    query += f" ORDER BY s.session_id DESC OFFSET {offset} ROWS FETCH NEXT {page_size} ROWS ONLY"
-    
-    rows = execute_query(query, tuple(params))
+    rows = execute_query_page(_Q_SESSIONS_PAGE[filters], (*params, offset, page_size), page_size)
     
     sessions = [Session(
         session_id=row['session_id'],
@@ -85,7 +102,7 @@ async def list_sessions(
 
 
 @router.get("/{session_id}", response_model=Session)
-async def get_session(session_id: int):
+def get_session(session_id: int):
     """Get details for a specific session."""
     query = """
         SELECT 
@@ -93,13 +110,19 @@ async def get_session(session_id: int):
             s.model_id, m.model_name,
             s.cell_id as test_cell_id, tc.cell_name as test_cell_name,
             s.created_at as ts_start, NULL as ts_end, s.notes,
-            (SELECT COUNT(*) FROM runs r WHERE r.session_id = s.session_id) as run_count
+            rc.run_count
         FROM test_sessions s
         LEFT JOIN models m ON s.model_id = m.model_id
         LEFT JOIN test_cells tc ON s.cell_id = tc.cell_id
+        LEFT JOIN (
+            SELECT session_id, COUNT(*) as run_count
+            FROM runs
+            WHERE session_id = ?
+            GROUP BY session_id
+        ) rc ON rc.session_id = s.session_id
         WHERE s.session_id = ?
     """
-    rows = execute_query(query, (session_id,))
+    rows = execute_query(query, (session_id, session_id))
     
     if not rows:
         raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
@@ -4,7 +4,7 @@ Pydantic Schemas for API
 Request and response models for FastAPI endpoints.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 from pydantic import BaseModel, Field
 
@@ -79,7 +79,7 @@ class RunSummary(BaseModel):
     ts_start: Optional[datetime] = None
     ts_end: Optional[datetime] = None
     sample_count: int = 0
-    qc_status: Optional[str] = None  # From qc_summaries.overall_status
+    qc_status: Optional[str] = None  # runs.qc_status (copy of qc_summaries.overall_status)
     
     class Config:
         from_attributes = True
@@ -143,10 +143,15 @@ class DataPoint(BaseModel):
     sample_count: Optional[int] = None
 
 
+# Wire format of one point in ChannelData.data:
+# [ts, value, min_value, max_value, sample_count] (field order of DataPoint)
+DataPointRow = Tuple[datetime, float, Optional[float], Optional[float], Optional[int]]
+
+
 class ChannelData(BaseModel):
     channel_id: int
     channel_code: Optional[str] = None
-    data: List[DataPoint]
+    data: List[DataPointRow]
 
 
 class RunDataResponse(BaseModel):
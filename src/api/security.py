@@ -0,0 +1,26 @@
+"""
+API Security Helpers
+====================
+Shared admin-token check for admin-only endpoints.
+"""
+
+import hmac
+import os
+from typing import Optional
+
+from fastapi import HTTPException
+
+import src.config  # noqa: F401  (loads .env before ADMIN_TOKEN is read)
+
+
+# Read once at import
+_ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "").encode("utf-8")
+
+
+def require_admin(x_admin_token: Optional[str]) -> None:
+    """Raise 401 unless the X-Admin-Token header matches ADMIN_TOKEN (500 if unset)."""
+    if not _ADMIN_TOKEN:
+        raise HTTPException(status_code=500, detail="ADMIN_TOKEN not configured")
+    # Constant-time comparison: no timing side channel on the token prefix
+    if not x_admin_token or not hmac.compare_digest(x_admin_token.encode("utf-8"), _ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Unauthorized")
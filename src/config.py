@@ -7,11 +7,15 @@ Supports both .env files (dev) and OpenBao (prod).
 
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 from dotenv import load_dotenv
 
-# Load .env file if present
-load_dotenv()
+# Load .env file if present. Child processes (uvicorn workers, helper
+# scripts) inherit the loaded variables, so they skip re-reading the file.
+if not os.environ.get("_AEROSTREAM_ENV_LOADED"):
+    load_dotenv()
+    os.environ["_AEROSTREAM_ENV_LOADED"] = "1"
 
 
 @dataclass
@@ -62,9 +66,10 @@ class Config:
     api_port: int = 8000
 
 
+@lru_cache(maxsize=1)
 def _get_from_openbao() -> Optional[dict]:
     """
-    Fetch secrets from OpenBao/Vault if configured.
+    Fetch secrets from OpenBao/Vault if configured (once; see refresh_config).
     Returns None if OpenBao is not configured.
     """
     openbao_addr = os.getenv("OPENBAO_ADDR")
@@ -143,16 +148,17 @@ def load_config() -> Config:
     )
 
 
-# Singleton config instance
-_config: Optional[Config] = None
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Get the application configuration (loaded once, then cached)."""
+    return load_config()
 
 
-def get_config() -> Config:
-    """Get the application configuration (singleton)."""
-    global _config
-    if _config is None:
-        _config = load_config()
-    return _config
+def refresh_config() -> Config:
+    """Drop the cached configuration and OpenBao secrets (e.g. after a secret rotation) and reload."""
+    _get_from_openbao.cache_clear()
+    get_config.cache_clear()
+    return get_config()
 
 
 if __name__ == "__main__":
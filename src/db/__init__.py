@@ -1,14 +1,24 @@
 # Database Module
 
-from src.db.connection import get_connection, execute_query, execute_non_query
+from src.db.connection import get_connection, execute_query, execute_query_rows, execute_query_iter, execute_query_arrow, execute_query_page, execute_multi, execute_scalar, execute_non_query, prepare_query
 from src.db.operations import (
     create_test_session,
     create_run,
     start_run,
     complete_run,
     bulk_insert_samples,
+    bulk_insert_sample_rows,
+    bulk_insert_sample_rows_parallel,
+    bulk_insert_sample_columns,
+    bulk_insert_samples_arrow,
+    bulk_insert_samples_df,
+    record_ingest_progress,
+    get_sample_counts,
+    get_ingested_counts,
+    get_ingested_count,
     save_run_statistics,
     save_qc_result,
+    save_qc_results_bulk,
     save_qc_summary,
     get_run,
     list_runs
@@ -16,18 +26,30 @@ from src.db.operations import (
 from src.db.timeseries import (
     refresh_aggregates,
     get_downsampled_data,
+    get_downsampled_data_multi,
+    get_raw_series_multi,
     get_channel_statistics,
     get_time_range,
     get_sample_count,
     get_raw_data,
+    get_raw_data_columnar,
+    iter_raw_data,
     get_data_as_arrays
 )
+from src.db.dim_cache import get_channel_codes, invalidate_channel_codes
 
 __all__ = [
     # Connection
     'get_connection',
     'execute_query',
+    'execute_query_rows',
+    'execute_query_iter',
+    'execute_query_arrow',
+    'execute_query_page',
+    'execute_multi',
+    'execute_scalar',
     'execute_non_query',
+    'prepare_query',
     
     # Operations
     'create_test_session',
@@ -35,8 +57,18 @@ __all__ = [
     'start_run',
     'complete_run',
     'bulk_insert_samples',
+    'bulk_insert_sample_rows',
+    'bulk_insert_sample_rows_parallel',
+    'bulk_insert_sample_columns',
+    'bulk_insert_samples_arrow',
+    'bulk_insert_samples_df',
+    'record_ingest_progress',
+    'get_sample_counts',
+    'get_ingested_counts',
+    'get_ingested_count',
     'save_run_statistics',
     'save_qc_result',
+    'save_qc_results_bulk',
     'save_qc_summary',
     'get_run',
     'list_runs',
@@ -44,9 +76,17 @@ __all__ = [
     # Time-series
     'refresh_aggregates',
     'get_downsampled_data',
+    'get_downsampled_data_multi',
+    'get_raw_series_multi',
     'get_channel_statistics',
     'get_time_range',
     'get_sample_count',
     'get_raw_data',
+    'get_raw_data_columnar',
+    'iter_raw_data',
     'get_data_as_arrays',
+    
+    # Dimension caches
+    'get_channel_codes',
+    'invalidate_channel_codes',
 ]
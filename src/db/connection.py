@@ -4,16 +4,29 @@ SQL Server Database Connection Module
 Provides connection pool and utilities for SQL Server.
 """
 
+import threading
+
 import pyodbc
-from typing import Optional, Generator
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional, Generator, TypeVar
 from contextlib import contextmanager
+from datetime import date, datetime
+from functools import wraps
 
 from src.config import get_config, DatabaseConfig
 
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+T = TypeVar("T")
+
 
-# Connection pool (simple implementation)
+# Connection pool (simple implementation): LIFO stack of idle connections
+# shared by the API worker threads, so guarded by a lock. Handles are reused
+# without a SELECT 1 probe: one the server dropped fails on first use and
+# _retry_on_disconnect re-runs the read on a fresh connection.
 _connection_pool: list[pyodbc.Connection] = []
-_pool_size: int = 5
+_pool_lock = threading.Lock()
+_pool_size: int = 16  # Roughly the number of concurrently busy API threads
 
 
 def create_connection(config: Optional[DatabaseConfig] = None) -> pyodbc.Connection:
@@ -29,6 +42,8 @@ def create_connection(config: Optional[DatabaseConfig] = None) -> pyodbc.Connect
     if config is None:
         config = get_config().db
     
+    # pyodbc releases the GIL while the driver connects, so cold connects
+    # from several threads overlap.
     conn = pyodbc.connect(config.connection_string, autocommit=False)
     return conn
 
@@ -37,29 +52,15 @@ def get_connection() -> pyodbc.Connection:
     """
     Get a connection from the pool or create a new one.
     
+    Hand it back with release_connection() (close() also works but
+    discards it).
+    
     Returns:
         pyodbc Connection object
     """
-    global _connection_pool
-    
-    # Try to get an existing connection from the pool
-    while _connection_pool:
-        conn = _connection_pool.pop()
-        try:
-            # Test if connection is still alive
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1")
-            cursor.close()
-            return conn
-        except pyodbc.Error:
-            # Connection is dead, discard it
-            try:
-                conn.close()
-            except:
-                pass
-            continue
-    
-    # No available connections, create a new one
+    with _pool_lock:
+        if _connection_pool:
+            return _connection_pool.pop()
     return create_connection()
 
 
@@ -70,24 +71,80 @@ def release_connection(conn: pyodbc.Connection) -> None:
     Args:
         conn: Connection to return
     """
-    global _connection_pool
+    try:
+        conn.rollback()  # Never pool a handle with an open transaction
+    except pyodbc.Error:
+        # Connection is broken, discard it
+        _close_quietly(conn)
+        return
     
-    if len(_connection_pool) < _pool_size:
-        try:
-            conn.rollback()  # Clear any pending transaction
+    with _pool_lock:
+        if len(_connection_pool) < _pool_size:
             _connection_pool.append(conn)
-        except pyodbc.Error:
-            # Connection is broken, discard it
-            try:
-                conn.close()
-            except:
-                pass
-    else:
-        # Pool is full, close the connection
+            return
+    
+    # Pool is full, close the connection
+    _close_quietly(conn)
+
+
+def _close_quietly(conn: pyodbc.Connection) -> None:
+    try:
+        conn.close()
+    except pyodbc.Error:
+        pass
+
+
+def warm_pool(count: int = 4) -> int:
+    """
+    Pre-open connections so the first requests skip the connect handshake.
+    
+    Args:
+        count: Connections to open (capped at the pool size)
+        
+    Returns:
+        Number of connections added to the pool
+    """
+    opened = [create_connection() for _ in range(min(count, _pool_size))]
+    for conn in opened:
+        release_connection(conn)
+    return len(opened)
+
+
+def close_pool() -> None:
+    """Close every pooled connection (application shutdown, or after a disconnect)."""
+    with _pool_lock:
+        pooled = list(_connection_pool)
+        _connection_pool.clear()
+    for conn in pooled:
+        _close_quietly(conn)
+
+
+# SQLSTATEs meaning the session is gone (link failure / connection not open).
+# Pooled handles are reused without a probe, so a handle the server dropped
+# surfaces as one of these on first use; fresh connections rarely do.
+_DISCONNECT_SQLSTATES = ("08S01", "08003")
+
+
+def _retry_on_disconnect(func: Callable[..., T]) -> Callable[..., T]:
+    """
+    Re-run a query helper once on a fresh connection if the first attempt
+    hit a dropped connection. Only for reads and idempotent statements (the
+    UPDATE ... OUTPUT callers of execute_scalar): a write may have committed
+    before the link failed, so execute_non_query is not retried.
+    """
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
         try:
-            conn.close()
-        except:
-            pass
+            return func(*args, **kwargs)
+        except pyodbc.Error as e:
+            if not (e.args and e.args[0] in _DISCONNECT_SQLSTATES):
+                raise
+        # Whatever dropped this session (server restart, failover) most
+        # likely dropped the other idle ones too: retry on a new connection
+        close_pool()
+        return func(*args, **kwargs)
+    
+    return wrapper
 
 
 @contextmanager
@@ -105,13 +162,14 @@ def get_db_connection() -> Generator[pyodbc.Connection, None, None]:
     try:
         yield conn
         conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
     finally:
+        # Rolls back whatever is left open (error path) before pooling; a
+        # dead handle fails that rollback and is discarded instead, without
+        # masking the original error.
         release_connection(conn)
 
 
+@_retry_on_disconnect
 def execute_query(sql: str, params: tuple = ()) -> list[dict]:
     """
     Execute a SELECT query and return results as list of dicts.
@@ -136,6 +194,172 @@ def execute_query(sql: str, params: tuple = ()) -> list[dict]:
         return results
 
 
+@_retry_on_disconnect
+def execute_query_rows(sql: str, params: tuple = ()) -> list[pyodbc.Row]:
+    """
+    Execute a SELECT query and return the raw pyodbc Rows.
+    
+    For large result sets read in a loop: Rows support positional and
+    attribute access (row[0], row.ts) without building a dict per row.
+    
+    Args:
+        sql: SQL query string
+        params: Query parameters
+        
+    Returns:
+        List of pyodbc Row objects
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def execute_query_iter(sql: str, params: tuple = (), arraysize: int = 5000) -> Iterator[pyodbc.Row]:
+    """
+    Execute a SELECT query and yield its rows without materializing them all.
+    
+    Rows are pulled arraysize at a time with fetchmany(), so memory stays
+    bounded by one batch however large the scan. The connection is held
+    until the generator is exhausted or closed; use it inside a `with
+    closing(...)` (or consume it fully) when breaking out early.
+    
+    Args:
+        sql: SQL query string
+        params: Query parameters
+        arraysize: Rows fetched per batch
+        
+    Yields:
+        pyodbc Row objects (positional and attribute access)
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.arraysize = arraysize
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(arraysize)
+            if not rows:
+                break
+            yield from rows
+
+
+@_retry_on_disconnect
+def execute_query_arrow(sql: str, params: tuple = (), batch_size: int = 10000) -> "pa.Table":
+    """
+    Execute a SELECT query and return the result as a pyarrow Table.
+    
+    Rows are fetched batch_size at a time and each batch is transposed into
+    typed Arrow column arrays, so large pulls land in columnar memory that
+    NumPy / pandas read without a per-row conversion.
+    
+    Args:
+        sql: SQL query string
+        params: Query parameters
+        batch_size: Rows fetched (and converted) per round
+        
+    Returns:
+        pyarrow Table with one column per result column
+    """
+    import pyarrow as pa  # Heavy import; only Arrow callers pay for it
+    
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.arraysize = batch_size
+        cursor.execute(sql, params)
+        
+        columns = [column[0] for column in cursor.description]
+        chunks = []
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            chunks.append(pa.Table.from_arrays([pa.array(col) for col in zip(*rows)], names=columns))
+        
+        if not chunks:
+            # No rows to infer from: type the columns from the cursor instead
+            arrow_types = {
+                int: pa.int64(), float: pa.float64(), bool: pa.bool_(), str: pa.string(),
+                datetime: pa.timestamp("us"), date: pa.date32(), bytes: pa.binary(),
+            }
+            return pa.table({
+                column[0]: pa.array([], type=arrow_types.get(column[1], pa.null()))
+                for column in cursor.description
+            })
+        # A column that is all NULL in one batch infers as null type; promote it
+        return pa.concat_tables(chunks, promote_options="default")
+
+
+@_retry_on_disconnect
+def execute_query_page(sql: str, params: tuple = (), page_size: int = 50) -> list[dict]:
+    """
+    Execute an already-paginated SELECT (OFFSET/FETCH) and return one page.
+    
+    Rows are fetched with a single fetchmany() sized to the page, so the
+    driver allocates one page-sized row buffer instead of growing a list.
+    
+    Args:
+        sql: SQL query string (should cap its output at page_size rows)
+        params: Query parameters
+        page_size: Maximum rows to fetch
+        
+    Returns:
+        List of dictionaries with column names as keys
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.arraysize = page_size
+        cursor.execute(sql, params)
+        
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchmany(page_size)]
+
+
+@_retry_on_disconnect
+def execute_multi(sql: str, params: tuple = ()) -> list[list[dict]]:
+    """
+    Execute a multi-statement batch and return every result set.
+    
+    Args:
+        sql: SQL batch (statements separated by `;`)
+        params: Parameters for the whole batch, in order
+        
+    Returns:
+        One list of dictionaries per result set, in statement order
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        
+        result_sets = []
+        while True:
+            # Row-count-only statements have no description; skip them
+            if cursor.description is not None:
+                columns = [column[0] for column in cursor.description]
+                result_sets.append([dict(zip(columns, row)) for row in cursor.fetchall()])
+            if not cursor.nextset():
+                break
+        
+        return result_sets
+
+
+@_retry_on_disconnect
+def execute_scalar(sql: str, params: tuple = ()) -> Any:
+    """
+    Execute a query and return the first column of the first row.
+    
+    Args:
+        sql: SQL query string
+        params: Query parameters
+        
+    Returns:
+        The scalar value, or None if the query returned no rows
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        return cursor.fetchval()
+
+
 def execute_non_query(sql: str, params: tuple = ()) -> int:
     """
     Execute an INSERT/UPDATE/DELETE query.
@@ -153,6 +377,63 @@ def execute_non_query(sql: str, params: tuple = ()) -> int:
         return cursor.rowcount
 
 
+class PreparedQuery:
+    """
+    A query bound to its own long-lived connection and cursor.
+    
+    pyodbc keeps the last statement prepared on a cursor: re-executing the
+    same SQL text with new parameters skips SQLPrepare, so SQL Server does not
+    parse / look up the plan again. Meant for tight polling loops; not
+    thread-safe (one handle per polling thread).
+    """
+    
+    def __init__(self, sql: str):
+        self.sql = sql
+        self._conn: Optional[pyodbc.Connection] = None
+        self._cursor: Optional[pyodbc.Cursor] = None
+    
+    def execute(self, params: tuple = ()) -> list[dict]:
+        """
+        Execute the prepared statement with new parameters.
+        
+        Returns:
+            List of dictionaries with column names as keys
+        """
+        if self._cursor is None:
+            self._conn = create_connection()
+            self._conn.autocommit = True  # Read-only polling: no open transaction
+            self._cursor = self._conn.cursor()
+        try:
+            self._cursor.execute(self.sql, params)
+            columns = [column[0] for column in self._cursor.description]
+            return [dict(zip(columns, row)) for row in self._cursor.fetchall()]
+        except pyodbc.Error:
+            self.close()  # Reconnect on next execute
+            raise
+    
+    def close(self) -> None:
+        """Close the dedicated connection."""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except pyodbc.Error:
+                pass
+        self._conn = None
+        self._cursor = None
+
+
+def prepare_query(sql: str) -> PreparedQuery:
+    """
+    Create a reusable prepared-statement handle for a SELECT query.
+    
+    Usage:
+        query = prepare_query("SELECT ... WHERE run_id = ?")
+        while polling:
+            rows = query.execute((run_id,))
+    """
+    return PreparedQuery(sql)
+
+
 def test_connection() -> bool:
     """
     Test if database connection works.
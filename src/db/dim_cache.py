@@ -0,0 +1,50 @@
+"""
+Dimension Caches
+================
+In-process caches for small, slowly-changing lookup tables.
+
+Each cache holds (loaded_at, mapping) and reloads at most once per TTL, so
+hot endpoints can resolve ids to labels without a database round-trip.
+"""
+
+import time
+import threading
+from typing import Dict, Optional, Tuple
+
+from src.db.connection import execute_query
+
+
+_CHANNEL_CODES_TTL_SECONDS = 600.0
+_channel_codes_lock = threading.Lock()
+_channel_codes: Optional[Tuple[float, Dict[int, str]]] = None
+
+
+def get_channel_codes() -> Dict[int, str]:
+    """
+    Get the channel_id -> channel code (channels.name) mapping.
+    
+    Returns:
+        Dict ordered by channel_id (treat as read-only; it is shared)
+    """
+    global _channel_codes
+    cached = _channel_codes
+    if cached and time.monotonic() - cached[0] < _CHANNEL_CODES_TTL_SECONDS:
+        return cached[1]
+    
+    with _channel_codes_lock:
+        # Another thread may have reloaded while we waited
+        cached = _channel_codes
+        if cached and time.monotonic() - cached[0] < _CHANNEL_CODES_TTL_SECONDS:
+            return cached[1]
+        
+        rows = execute_query("SELECT channel_id, name FROM channels ORDER BY channel_id")
+        mapping = {row['channel_id']: row['name'] for row in rows}
+        _channel_codes = (time.monotonic(), mapping)
+        return mapping
+
+
+def invalidate_channel_codes() -> None:
+    """Force the next get_channel_codes() call to reload."""
+    global _channel_codes
+    with _channel_codes_lock:
+        _channel_codes = None
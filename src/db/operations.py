@@ -5,11 +5,26 @@ Production-grade database operations for AeroStream.
 Supports enhanced schema v2.0 with sessions, states, and audit.
 """
 
+import atexit
+import os
+import queue
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pyodbc
-from typing import List, Dict, Any, Optional
+from typing import Final, List, Dict, Any, Optional, Callable, Sequence, Tuple
 from datetime import datetime
+from operator import itemgetter
 
-from src.db.connection import get_db_connection, execute_query, execute_non_query
+from src.config import get_config
+from src.db.connection import get_db_connection, execute_query, execute_scalar, execute_non_query
+from src.db.query_cache import cached_query, invalidate_prefix
 
 
 # =============================================================================
@@ -55,9 +70,10 @@ def create_demo_run_request(
                 user_agent,
             ),
         )
-        request_id = cursor.fetchone()[0]
+        request_id = cursor.fetchval()
         conn.commit()
-        return int(request_id)
+    invalidate_prefix("demo_requests")
+    return request_id
 
 
 def get_demo_run_request(request_id: int) -> Optional[Dict[str, Any]]:
@@ -66,18 +82,22 @@ def get_demo_run_request(request_id: int) -> Optional[Dict[str, Any]]:
     return rows[0] if rows else None
 
 
+# Fixed statement texts (one per filter shape) so each keeps one cached plan
+_Q_DEMO_REQUESTS_ALL = "SELECT TOP (?) * FROM demo_run_requests ORDER BY created_at DESC"
+_Q_DEMO_REQUESTS_BY_STATUS = (
+    "SELECT TOP (?) * FROM demo_run_requests WHERE status = ? ORDER BY created_at DESC"
+)
+
+
+@cached_query("demo_requests")
 def list_demo_run_requests(
     status: Optional[str] = None,
     limit: int = 100,
 ) -> List[Dict[str, Any]]:
     """List demo run requests with optional status filter."""
-    sql = "SELECT TOP (?) * FROM demo_run_requests WHERE 1=1"
-    params: list[Any] = [limit]
     if status:
-        sql += " AND status = ?"
-        params.append(status)
-    sql += " ORDER BY created_at DESC"
-    return execute_query(sql, tuple(params))
+        return execute_query(_Q_DEMO_REQUESTS_BY_STATUS, (limit, status))
+    return execute_query(_Q_DEMO_REQUESTS_ALL, (limit,))
 
 
 def update_demo_run_request_status(
@@ -86,7 +106,7 @@ def update_demo_run_request_status(
     reviewer_notes: str | None = None,
 ) -> int:
     """Update request status (admin action)."""
-    return execute_non_query(
+    updated = execute_non_query(
         """
         UPDATE demo_run_requests
         SET status = ?,
@@ -96,14 +116,46 @@ def update_demo_run_request_status(
         """,
         (status, reviewer_notes, status, request_id),
     )
+    invalidate_prefix("demo_requests")
+    return updated
+
+
+def admin_apply_demo_request(
+    request_id: int,
+    status: str,
+    reviewer_notes: str | None = None,
+    run_id: int | None = None,
+) -> Optional[int]:
+    """
+    Apply an admin update (status, notes, optional run_id) in one UPDATE.
+
+    Returns:
+        request_id if the request exists, else None
+    """
+    applied = execute_scalar(
+        """
+        UPDATE demo_run_requests
+        SET status = ?,
+            reviewer_notes = ?,
+            reviewed_at = CASE WHEN ? IN ('approved','rejected','completed','failed') THEN GETDATE() ELSE reviewed_at END,
+            run_id = COALESCE(?, run_id)
+        OUTPUT INSERTED.request_id
+        WHERE request_id = ?
+        """,
+        (status, reviewer_notes, status, run_id, request_id),
+    )
+    invalidate_prefix("demo_requests")
+    return applied
 
 
 def attach_run_to_demo_request(request_id: int, run_id: int) -> int:
     """Attach an executed run_id to a request."""
-    return execute_non_query(
+    attached = execute_non_query(
         "UPDATE demo_run_requests SET run_id = ? WHERE request_id = ?",
         (run_id, request_id),
     )
+    invalidate_prefix("demo_requests")
+    return attached
 
 
 # =============================================================================
@@ -145,11 +197,13 @@ def create_test_session(
             session_name, session_code, cell_id, model_id, team_id,
             session_date.date(), objective, session_lead_id, created_by
         ))
-        session_id = cursor.fetchone()[0]
+        session_id = cursor.fetchval()
         conn.commit()
-        return session_id
+    invalidate_prefix("sessions")
+    return session_id
 
 
+@cached_query("sessions")
 def get_session(session_id: int) -> Optional[Dict[str, Any]]:
     """Get session by ID."""
     results = execute_query("""
@@ -167,6 +221,13 @@ def get_session(session_id: int) -> Optional[Dict[str, Any]]:
 # RUN OPERATIONS (Enhanced)
 # =============================================================================
 
+# run_states seed rows (state_id = position + 1), see scripts/init.sql
+_STATE_NAMES: Final[Tuple[str, ...]] = (
+    'draft', 'running', 'completed', 'processing', 'validated', 'rejected', 'archived'
+)
+_STATE_MAP: Final[Dict[str, int]] = {name: i + 1 for i, name in enumerate(_STATE_NAMES)}
+
+
 def get_next_run_number(session_id: int) -> int:
     """Get the next sequential run number for a session."""
     result = execute_query("""
@@ -208,11 +269,21 @@ def create_run(
     Returns:
         run_id of the created run
     """
-    run_number = get_next_run_number(session_id) if session_id else 1
-    
     with get_db_connection() as conn:
         cursor = conn.cursor()
+        # Next run number and insert in one statement: UPDLOCK/HOLDLOCK keeps the
+        # session's range locked until commit, so concurrent creates can't
+        # both read the same MAX. No session -> no rows -> run_number 1.
+        # OUTPUT goes INTO a table variable: runs has triggers (trg_runs_qc_stats).
         cursor.execute("""
+            SET NOCOUNT ON;
+            DECLARE @ids TABLE (run_id INT);
+            
+            WITH nxt AS (
+                SELECT ISNULL(MAX(run_number), 0) + 1 AS n
+                FROM runs WITH (UPDLOCK, HOLDLOCK)
+                WHERE session_id = ?
+            )
             INSERT INTO runs (
                 run_number, run_name, session_id, run_type_id, state_id,
                 tunnel_speed_setpoint, tunnel_aoa_setpoint, tunnel_yaw_setpoint,
@@ -220,18 +291,23 @@ def create_run(
                 front_wing_flap_deg, rear_wing_flap_deg, drs_open,
                 baseline_run_id, priority, tags, notes, created_by
             )
-            OUTPUT INSERTED.run_id
-            VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            OUTPUT INSERTED.run_id INTO @ids
+            SELECT nxt.n, ?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
+            FROM nxt;
+            
+            SELECT run_id FROM @ids;
         """, (
-            run_number, run_name, session_id, run_type_id,
+            session_id,
+            run_name, session_id, run_type_id,
             tunnel_speed_setpoint, tunnel_aoa_setpoint, tunnel_yaw_setpoint,
             ride_height_f, ride_height_r,
             front_wing_flap_deg, rear_wing_flap_deg, 1 if drs_open else 0,
             baseline_run_id, priority, tags, notes, created_by
         ))
-        run_id = cursor.fetchone()[0]
+        run_id = cursor.fetchval()
         conn.commit()
-        return run_id
+    invalidate_prefix("runs")
+    return run_id
 
 
 def start_run(run_id: int) -> None:
@@ -241,6 +317,7 @@ def start_run(run_id: int) -> None:
         SET state_id = 2, ts_start = GETDATE()
         WHERE run_id = ?
     """, (run_id,))
+    invalidate_prefix("runs")
 
 
 def complete_run(
@@ -273,23 +350,22 @@ def complete_run(
             tunnel_temp_actual, air_density_actual, sample_count, run_id
         ))
         conn.commit()
+    invalidate_prefix("runs")
 
 
 def update_run_state(run_id: int, state_name: str, user_id: int = 1) -> None:
     """Update run state by state name."""
-    state_map = {
-        'draft': 1, 'running': 2, 'completed': 3, 'processing': 4,
-        'validated': 5, 'rejected': 6, 'archived': 7
-    }
-    state_id = state_map.get(state_name.lower(), 3)
+    state_id = _STATE_MAP.get(state_name.lower(), 3)
     
     execute_non_query("""
         UPDATE runs 
         SET state_id = ?, modified_at = GETDATE(), modified_by = ?
         WHERE run_id = ?
     """, (state_id, user_id, run_id))
+    invalidate_prefix("runs")
 
 
+@cached_query("runs")
 def get_run(run_id: int) -> Optional[Dict[str, Any]]:
     """Get run with all related data."""
     results = execute_query("""
@@ -308,19 +384,21 @@ def get_run(run_id: int) -> Optional[Dict[str, Any]]:
     return results[0] if results else None
 
 
+@cached_query("runs")
 def list_runs(
     session_id: Optional[int] = None,
     state: Optional[str] = None,
     limit: int = 100
 ) -> List[Dict[str, Any]]:
     """List runs with optional filters."""
+    # State names are resolved in Python (filter by r.state_id, label from
+    # _STATE_NAMES), so run_states is not joined at all.
     sql = """
         SELECT r.run_id, r.run_number, r.run_name, r.ts_start, r.ts_end,
                r.tunnel_speed_setpoint, r.tunnel_aoa_setpoint,
                r.sample_count, r.data_quality_score,
-               rs.state_name, rt.type_name
+               r.state_id, rt.type_name
         FROM runs r
-        LEFT JOIN run_states rs ON r.state_id = rs.state_id
         LEFT JOIN run_types rt ON r.run_type_id = rt.run_type_id
         WHERE 1=1
     """
@@ -331,37 +409,229 @@ def list_runs(
         params.append(session_id)
     
     if state:
-        sql += " AND rs.state_name = ?"
-        params.append(state)
+        state_id = _STATE_MAP.get(state.lower())
+        if state_id is None:
+            return []
+        sql += " AND r.state_id = ?"
+        params.append(state_id)
     
     sql += f" ORDER BY r.ts_start DESC OFFSET 0 ROWS FETCH NEXT {limit} ROWS ONLY"
     
-    return execute_query(sql, tuple(params))
+    rows = execute_query(sql, tuple(params))
+    for row in rows:
+        state_id = row['state_id']
+        row['state_name'] = _STATE_NAMES[state_id - 1] if state_id and state_id <= len(_STATE_NAMES) else None
+    return rows
 
 
 # =============================================================================
 # BULK INSERT OPERATIONS
 # =============================================================================
 
+INSERT_METHODS = ("executemany", "tvp", "bcp")
+
+
 def bulk_insert_samples(
     samples: List[Dict[str, Any]],
     run_id: int,
-    batch_size: int = 5000
+    batch_size: int = 5000,
+    method: str = "executemany"
 ) -> int:
     """
-    Bulk insert samples using pyodbc fast_executemany.
+    Bulk insert samples in a single transaction.
     
     Args:
         samples: List of dicts with channel_id, ts, value, quality_flag (optional)
         run_id: Run ID
         batch_size: Rows per batch
+        method: 'executemany' (pyodbc fast_executemany parameter arrays),
+            'tvp' (one sp_insert_samples call per batch with a table-valued
+            parameter; requires the samples_tvp migration) or 'bcp' (TDS
+            bulk load through the `bcp` utility; needs a trusted Windows /
+            Kerberos login enabled with BCP_TRUSTED_AUTH=1, and falls back
+            to executemany when that is not set or bcp is not installed)
         
     Returns:
         Total rows inserted
     """
-    if not samples:
+    get_fields = itemgetter("channel_id", "ts", "value")
+    rows = []
+    append = rows.append
+    unparsed = []  # Positions of rows whose ts still needs parsing
+    for s in samples:
+        channel_id, ts, value = get_fields(s)
+        if not isinstance(ts, datetime):
+            unparsed.append(len(rows))
+        append((channel_id, ts, float(value), s.get("quality_flag", 0)))
+    
+    if unparsed:
+        # Parse every ISO string in one vectorized pass instead of per row
+        parsed = _to_datetime64([rows[i][1] for i in unparsed]).tolist()
+        for i, ts in zip(unparsed, parsed):
+            channel_id, _, value, quality_flag = rows[i]
+            rows[i] = (channel_id, ts, value, quality_flag)
+    return bulk_insert_sample_rows(rows, run_id, batch_size=batch_size, method=method)
+
+
+def _to_datetime64(ts: Any) -> np.ndarray:
+    """
+    Convert timestamps to a datetime64[us] array.
+    
+    Accepts datetime64 arrays, datetimes and naive ISO-8601 strings / bytes
+    (parsed by NumPy in C, not datetime.fromisoformat per element).
+    """
+    arr = np.asarray(ts)
+    if arr.dtype.kind == "S":
+        arr = arr.astype("U")
+    elif arr.dtype.kind == "O" and arr.size and isinstance(arr.flat[0], str):
+        arr = arr.astype("U")
+    return arr.astype("datetime64[us]")
+
+
+def bulk_insert_sample_columns(
+    run_id: int,
+    channel_ids: np.ndarray,
+    ts: np.ndarray,
+    values: np.ndarray,
+    quality_flags: Optional[np.ndarray] = None,
+    batch_size: int = 5000,
+    method: str = "executemany"
+) -> int:
+    """
+    Bulk insert samples held as typed column arrays (structure of arrays).
+    
+    Each column is converted to Python values in one vectorized pass; no
+    per-row type checks or parsing.
+    
+    Args:
+        run_id: Run ID
+        channel_ids: Integer channel ids
+        ts: datetime64 timestamps or naive ISO-8601 strings (wall-clock)
+        values: Float sample values
+        quality_flags: Optional integer flags (default 0)
+        batch_size: Rows per batch
+        method: 'executemany', 'tvp' or 'bcp' (see bulk_insert_samples)
+        
+    Returns:
+        Total rows inserted
+    """
+    if quality_flags is None:
+        quality_flags = np.zeros(len(channel_ids), dtype=np.int64)
+    rows = list(zip(
+        np.asarray(channel_ids).tolist(),
+        _to_datetime64(ts).tolist(),
+        np.asarray(values, dtype=np.float64).tolist(),
+        np.asarray(quality_flags).tolist(),
+    ))
+    return bulk_insert_sample_rows(rows, run_id, batch_size=batch_size, method=method)
+
+
+def bulk_insert_samples_arrow(
+    table: Any,
+    run_id: int,
+    batch_size: int = 5000,
+    method: str = "executemany"
+) -> int:
+    """
+    Bulk insert samples from a pyarrow Table.
+    
+    Args:
+        table: pyarrow.Table with channel_id, ts (timestamp), value and
+            optionally quality_flag columns
+        run_id: Run ID
+        batch_size: Rows per batch
+        method: 'executemany', 'tvp' or 'bcp' (see bulk_insert_samples)
+        
+    Returns:
+        Total rows inserted
+    """
+    columns = table.column_names
+    return bulk_insert_sample_columns(
+        run_id,
+        table["channel_id"].to_numpy(),
+        table["ts"].to_numpy(),
+        table["value"].to_numpy(),
+        table["quality_flag"].to_numpy() if "quality_flag" in columns else None,
+        batch_size=batch_size,
+        method=method,
+    )
+
+
+def bulk_insert_samples_df(
+    df: Any,
+    run_id: int,
+    batch_size: int = 5000,
+    method: str = "executemany"
+) -> int:
+    """
+    Bulk insert samples from a pandas DataFrame.
+    
+    Args:
+        df: DataFrame with channel_id, ts (datetime64 or ISO strings), value
+            and optionally quality_flag columns
+        run_id: Run ID
+        batch_size: Rows per batch
+        method: 'executemany', 'tvp' or 'bcp' (see bulk_insert_samples)
+        
+    Returns:
+        Total rows inserted
+    """
+    return bulk_insert_sample_columns(
+        run_id,
+        df["channel_id"].to_numpy(),
+        df["ts"].to_numpy(),
+        df["value"].to_numpy(),
+        df["quality_flag"].to_numpy() if "quality_flag" in df.columns else None,
+        batch_size=batch_size,
+        method=method,
+    )
+
+
+# Drops the run's refresh-derived summaries (run_meta, channel_stats) after
+# an insert. Guarded so ingest keeps working before their migrations apply.
+_INVALIDATE_RUN_AGGREGATES_SQL = """
+    DECLARE @run_id INT = ?;
+    IF OBJECT_ID('dbo.run_meta', 'U') IS NOT NULL
+        DELETE FROM run_meta WHERE run_id = @run_id;
+    IF OBJECT_ID('dbo.channel_stats', 'U') IS NOT NULL
+        DELETE FROM channel_stats WHERE run_id = @run_id;
+"""
+
+
+def bulk_insert_sample_rows(
+    rows: Sequence[Tuple[int, datetime, float, int]],
+    run_id: int,
+    batch_size: int = 5000,
+    method: str = "executemany"
+) -> int:
+    """
+    Bulk insert pre-built sample rows in a single transaction.
+    
+    Same as bulk_insert_samples() but skips the per-row dict handling:
+    callers that already hold typed values pass tuples directly.
+    
+    Args:
+        rows: (channel_id, ts, value, quality_flag) tuples; ts a datetime
+        run_id: Run ID
+        batch_size: Rows per batch
+        method: 'executemany', 'tvp' or 'bcp' (see bulk_insert_samples)
+        
+    Returns:
+        Total rows inserted
+    """
+    if method not in INSERT_METHODS:
+        raise ValueError(f"Unknown insert method {method!r} (expected one of {INSERT_METHODS})")
+    if not rows:
         return 0
     
+    if method == "bcp":
+        # SQL logins (the repo's sa setup) would need -P on bcp's argv
+        if _BCP_TRUSTED_AUTH and shutil.which(_BCP_EXECUTABLE):
+            inserted = _bcp_insert_sample_rows(rows, run_id, batch_size)
+            execute_non_query(_INVALIDATE_RUN_AGGREGATES_SQL, (run_id,))
+            return inserted
+        method = "executemany"
+    
     total_inserted = 0
     
     with get_db_connection() as conn:
@@ -373,76 +643,275 @@ def bulk_insert_samples(
             VALUES (?, ?, ?, ?, ?)
         """
         
-        for i in range(0, len(samples), batch_size):
-            batch = samples[i:i + batch_size]
+        for i in range(0, len(rows), batch_size):
+            batch = rows[i:i + batch_size]
             
-            params = [
-                (
-                    run_id,
-                    s["channel_id"],
-                    s["ts"] if isinstance(s["ts"], datetime) else datetime.fromisoformat(str(s["ts"])),
-                    float(s["value"]),
-                    s.get("quality_flag", 0)
-                )
-                for s in batch
-            ]
+            if method == "tvp":
+                # TVP rows match dbo.samples_tvp: (channel_id, ts, value, quality_flag)
+                cursor.execute("{CALL sp_insert_samples (?, ?)}", (run_id, list(batch)))
+            else:
+                cursor.executemany(sql, [(run_id, *row) for row in batch])
             
-            cursor.executemany(sql, params)
             total_inserted += len(batch)
         
+        # run_meta / channel_stats are now stale: readers fall back to raw
+        # samples until the next sp_refresh_samples_1sec rewrites them
+        cursor.execute(_INVALIDATE_RUN_AGGREGATES_SQL, (run_id,))
+        
+        # All batches share one transaction: a single commit (one log flush)
+        # for the whole call, not one per batch or per row.
         conn.commit()
     
     return total_inserted
 
 
+def bulk_insert_sample_rows_parallel(
+    rows: Sequence[Tuple[int, datetime, float, int]],
+    run_id: int,
+    n_workers: int = 8,
+    batch_size: int = 5000,
+    method: str = "executemany"
+) -> int:
+    """
+    Bulk insert sample rows over several connections at once.
+    
+    Rows are partitioned by channel_id % n_workers, so each worker writes
+    its own channels (separate ranges of IX_samples_run_channel_ts; the
+    ts-leading clustered index still takes all workers at its tail, which
+    caps the speed-up). Each partition goes
+    through bulk_insert_sample_rows() on its own pooled connection; pyodbc
+    releases the GIL during ODBC calls, so the sends overlap.
+    
+    Unlike bulk_insert_sample_rows(), partitions commit independently: if
+    one fails, the others may already be committed.
+    
+    Args:
+        rows: (channel_id, ts, value, quality_flag) tuples; ts a datetime
+        run_id: Run ID
+        n_workers: Concurrent connections
+        batch_size: Rows per batch within a partition
+        method: 'executemany', 'tvp' or 'bcp' (see bulk_insert_samples)
+        
+    Returns:
+        Total rows inserted
+    """
+    if n_workers <= 1 or len(rows) <= batch_size:
+        return bulk_insert_sample_rows(rows, run_id, batch_size=batch_size, method=method)
+    
+    partitions: List[List[Tuple[int, datetime, float, int]]] = [[] for _ in range(n_workers)]
+    for row in rows:
+        partitions[row[0] % n_workers].append(row)
+    partitions = [part for part in partitions if part]
+    
+    with ThreadPoolExecutor(max_workers=len(partitions), thread_name_prefix="aerostream-insert") as pool:
+        futures = [
+            pool.submit(bulk_insert_sample_rows, part, run_id, batch_size, method)
+            for part in partitions
+        ]
+        return sum(future.result() for future in futures)
+
+
+_BCP_EXECUTABLE = os.getenv("BCP_PATH", "bcp")
+# BCP_TRUSTED_AUTH=1: this host has a trusted (Windows / Kerberos) login to
+# the server, so bcp can connect with -T instead of a password
+_BCP_TRUSTED_AUTH = os.getenv("BCP_TRUSTED_AUTH", "").lower() in ("1", "true", "yes")
+_BCP_ROWS_COPIED = re.compile(r"^\s*(\d+) rows copied", re.MULTILINE)
+
+
+def _bcp_insert_sample_rows(
+    rows: Sequence[Tuple[int, datetime, float, int]],
+    run_id: int,
+    batch_size: int
+) -> int:
+    """
+    Load sample rows with the native bulk copy protocol via the `bcp` utility.
+    
+    Rows are staged in a temporary tab-separated file in samples' column
+    order and streamed by bcp without per-row statement execution. bcp runs
+    in its own session, so each batch_size chunk commits on its own rather
+    than in the caller's single transaction.
+    
+    bcp authenticates with a trusted connection (-T: Windows / Kerberos
+    login) because a -P password would be readable by any local user in the
+    process list; bulk_insert_sample_rows only calls this when
+    BCP_TRUSTED_AUTH is set. With -m 1 the first rejected row aborts the load, and the
+    row count bcp reports is checked rather than assumed.
+    
+    Returns:
+        Total rows inserted
+    """
+    db = get_config().db
+    
+    with tempfile.NamedTemporaryFile("w", suffix=".tsv", delete=False, newline="\n") as f:
+        path = f.name
+        for channel_id, ts, value, quality_flag in rows:
+            # DATETIME2(3) text; repr(float) round-trips exactly
+            f.write(f"{run_id}\t{channel_id}\t{ts.isoformat(' ', 'milliseconds')}\t{value!r}\t{quality_flag}\n")
+    
+    try:
+        result = subprocess.run(
+            [
+                _BCP_EXECUTABLE, "dbo.samples", "in", path,
+                "-S", f"{db.host},{db.port}", "-d", db.database,
+                "-T",                   # Trusted connection; never a password on argv
+                "-u",                   # TrustServerCertificate, as in connection_string
+                "-c", "-t", "\t",      # Character mode, tab-separated
+                "-b", str(batch_size),
+                "-m", "1",              # Fail on the first rejected row
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"bcp load failed: {(e.stdout or '') + (e.stderr or '')}".strip()) from e
+    finally:
+        os.unlink(path)
+    
+    # bcp may exit 0 with rows rejected; trust only its "N rows copied." line
+    copied = _BCP_ROWS_COPIED.search(result.stdout or "")
+    if copied is None or int(copied.group(1)) != len(rows):
+        reported = copied.group(1) if copied else "no"
+        raise RuntimeError(f"bcp load copied {reported} of {len(rows)} rows: {(result.stdout or '').strip()}")
+    return int(copied.group(1))
+
+
+# =============================================================================
+# INGEST PROGRESS (consumer -> waiters)
+# =============================================================================
+
+def record_ingest_progress(run_id: int, inserted: int) -> None:
+    """
+    Add a committed batch to the run's ingestion counter.
+
+    Called by the Kafka consumer after each successful bulk insert so that
+    ingestion waits read a single row instead of COUNT(*) over samples.
+    """
+    execute_non_query(
+        """
+        MERGE run_ingest_progress WITH (HOLDLOCK) AS t
+        USING (SELECT ? AS run_id, ? AS inserted) AS s
+            ON t.run_id = s.run_id
+        WHEN MATCHED THEN
+            UPDATE SET inserted_count = t.inserted_count + s.inserted,
+                       updated_at = SYSUTCDATETIME()
+        WHEN NOT MATCHED THEN
+            INSERT (run_id, inserted_count) VALUES (s.run_id, s.inserted);
+        """,
+        (run_id, inserted),
+    )
+
+
+def get_sample_counts(run_ids: List[int]) -> Dict[int, int]:
+    """
+    Raw sample counts for several runs in one GROUP BY (missing runs -> 0).
+
+    Read with NOLOCK: this is a progress signal polled while the consumer is
+    bulk-inserting, so a slightly stale count beats blocking the inserts.
+    """
+    if not run_ids:
+        return {}
+    placeholders = ", ".join("?" for _ in run_ids)
+    rows = execute_query(
+        f"""
+        SELECT run_id, COUNT_BIG(*) AS cnt
+        FROM samples WITH (NOLOCK)
+        WHERE run_id IN ({placeholders})
+        GROUP BY run_id
+        """,
+        tuple(run_ids),
+    )
+    counts = {run_id: 0 for run_id in run_ids}
+    counts.update({int(r["run_id"]): int(r["cnt"]) for r in rows})
+    return counts
+
+
+def get_ingested_counts(
+    run_ids: List[int],
+    execute: Callable[[str, tuple], List[Dict[str, Any]]] = execute_query,
+) -> Dict[int, int]:
+    """
+    Get the number of samples ingested for several runs.
+
+    Reads the consumer's progress rows; runs without a progress row (older
+    consumer or table not migrated yet) fall back to get_sample_counts().
+
+    Args:
+        run_ids: Runs to look up
+        execute: Query executor for the progress read (pollers pass a
+            prepared-statement executor, see connection.prepare_query)
+    """
+    if not run_ids:
+        return {}
+    placeholders = ", ".join("?" for _ in run_ids)
+    try:
+        rows = execute(
+            f"SELECT run_id, inserted_count FROM run_ingest_progress WHERE run_id IN ({placeholders})",
+            tuple(run_ids),
+        )
+    except pyodbc.Error:
+        rows = []
+    counts = {int(r["run_id"]): int(r["inserted_count"]) for r in rows}
+
+    missing = [run_id for run_id in run_ids if run_id not in counts]
+    if missing:
+        counts.update(get_sample_counts(missing))
+    return counts
+
+
+def get_ingested_count(run_id: int) -> int:
+    """Get the number of samples ingested for a single run."""
+    return get_ingested_counts([run_id]).get(run_id, 0)
+
+
 # =============================================================================
 # STATISTICS OPERATIONS
 # =============================================================================
 
 def save_run_statistics(run_id: int, stats: Dict[str, Any]) -> int:
-    """Save computed statistics for a run."""
+    """Save computed statistics for a run (upsert in one round-trip)."""
     with get_db_connection() as conn:
         cursor = conn.cursor()
-        
-        # Check if already exists
-        cursor.execute("SELECT stat_id FROM run_statistics WHERE run_id = ?", (run_id,))
-        existing = cursor.fetchone()
-        
-        if existing:
-            cursor.execute("""
-                UPDATE run_statistics SET
-                    total_samples = ?, valid_samples = ?, spike_count = ?,
-                    lift_mean = ?, lift_std = ?, drag_mean = ?, drag_std = ?,
-                    cl_mean = ?, cd_mean = ?, efficiency = ?, aero_balance_pct = ?,
-                    computed_at = GETDATE()
-                WHERE run_id = ?
-            """, (
-                stats.get('total_samples'), stats.get('valid_samples'), stats.get('spike_count'),
-                stats.get('lift_mean'), stats.get('lift_std'),
-                stats.get('drag_mean'), stats.get('drag_std'),
-                stats.get('cl_mean'), stats.get('cd_mean'),
-                stats.get('efficiency'), stats.get('aero_balance_pct'),
-                run_id
-            ))
-            stat_id = existing[0]
-        else:
-            cursor.execute("""
-                INSERT INTO run_statistics (
-                    run_id, total_samples, valid_samples, spike_count,
-                    lift_mean, lift_std, drag_mean, drag_std,
-                    cl_mean, cd_mean, efficiency, aero_balance_pct
-                )
-                OUTPUT INSERTED.stat_id
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                run_id,
-                stats.get('total_samples'), stats.get('valid_samples'), stats.get('spike_count'),
-                stats.get('lift_mean'), stats.get('lift_std'),
-                stats.get('drag_mean'), stats.get('drag_std'),
-                stats.get('cl_mean'), stats.get('cd_mean'),
-                stats.get('efficiency'), stats.get('aero_balance_pct')
-            ))
-            stat_id = cursor.fetchone()[0]
+        cursor.execute("""
+            SET NOCOUNT ON;
+            DECLARE @ids TABLE (stat_id INT);
+            
+            MERGE run_statistics WITH (HOLDLOCK) AS t
+            USING (SELECT
+                ? AS run_id, ? AS total_samples, ? AS valid_samples, ? AS spike_count,
+                ? AS lift_mean, ? AS lift_std, ? AS drag_mean, ? AS drag_std,
+                ? AS cl_mean, ? AS cd_mean, ? AS efficiency, ? AS aero_balance_pct
+            ) AS s
+            ON t.run_id = s.run_id
+            WHEN MATCHED THEN UPDATE SET
+                total_samples = s.total_samples, valid_samples = s.valid_samples,
+                spike_count = s.spike_count,
+                lift_mean = s.lift_mean, lift_std = s.lift_std,
+                drag_mean = s.drag_mean, drag_std = s.drag_std,
+                cl_mean = s.cl_mean, cd_mean = s.cd_mean,
+                efficiency = s.efficiency, aero_balance_pct = s.aero_balance_pct,
+                computed_at = GETDATE()
+            WHEN NOT MATCHED THEN INSERT (
+                run_id, total_samples, valid_samples, spike_count,
+                lift_mean, lift_std, drag_mean, drag_std,
+                cl_mean, cd_mean, efficiency, aero_balance_pct
+            ) VALUES (
+                s.run_id, s.total_samples, s.valid_samples, s.spike_count,
+                s.lift_mean, s.lift_std, s.drag_mean, s.drag_std,
+                s.cl_mean, s.cd_mean, s.efficiency, s.aero_balance_pct
+            )
+            OUTPUT INSERTED.stat_id INTO @ids;
+            
+            SELECT stat_id FROM @ids;
+        """, (
+            run_id,
+            stats.get('total_samples'), stats.get('valid_samples'), stats.get('spike_count'),
+            stats.get('lift_mean'), stats.get('lift_std'),
+            stats.get('drag_mean'), stats.get('drag_std'),
+            stats.get('cl_mean'), stats.get('cd_mean'),
+            stats.get('efficiency'), stats.get('aero_balance_pct')
+        ))
+        stat_id = cursor.fetchval()
         
         conn.commit()
         return stat_id
@@ -472,11 +941,47 @@ def save_qc_result(
             OUTPUT INSERTED.result_id
             VALUES (?, ?, ?, ?, ?, ?, ?)
         """, (run_id, rule_id, channel_id, status, measured_value, threshold_used, details))
-        result_id = cursor.fetchone()[0]
+        result_id = cursor.fetchval()
         conn.commit()
         return result_id
 
 
+def save_qc_results_bulk(run_id: int, results: List[Dict[str, Any]]) -> int:
+    """
+    Save many QC check results in one executemany and one commit.
+    
+    Args:
+        run_id: Run ID
+        results: Dicts with rule_id, status and optionally measured_value,
+            threshold_used, details, channel_id (as for save_qc_result)
+        
+    Returns:
+        Number of results inserted
+    """
+    if not results:
+        return 0
+    
+    rows = [
+        (
+            run_id, r['rule_id'], r.get('channel_id'), r['status'],
+            r.get('measured_value'), r.get('threshold_used'), r.get('details', "")
+        )
+        for r in results
+    ]
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.fast_executemany = True
+        cursor.executemany("""
+            INSERT INTO qc_results (
+                run_id, rule_id, channel_id, status,
+                measured_value, threshold_used, details
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        conn.commit()
+    return len(rows)
+
+
 def save_qc_summary(
     run_id: int,
     overall_status: str,
@@ -487,56 +992,128 @@ def save_qc_summary(
     critical_issues: str = "",
     recommendations: str = ""
 ) -> int:
-    """Save QC summary for a run."""
+    """Save QC summary for a run and apply its outcome to the run (one round-trip)."""
     with get_db_connection() as conn:
         cursor = conn.cursor()
-        
-        # Upsert
-        cursor.execute("SELECT summary_id FROM qc_summaries WHERE run_id = ?", (run_id,))
-        existing = cursor.fetchone()
-        
-        if existing:
-            cursor.execute("""
-                UPDATE qc_summaries SET
-                    overall_status = ?, total_checks = ?, passed_checks = ?,
-                    warning_checks = ?, failed_checks = ?, skipped_checks = ?,
-                    critical_issues = ?, recommendations = ?, computed_at = GETDATE()
-                WHERE run_id = ?
-            """, (
-                overall_status, total_checks, passed_checks,
-                warning_checks, failed_checks, 0,
-                critical_issues, recommendations, run_id
-            ))
-            summary_id = existing[0]
-        else:
-            cursor.execute("""
-                INSERT INTO qc_summaries (
-                    run_id, overall_status, total_checks, passed_checks,
-                    warning_checks, failed_checks, skipped_checks,
-                    critical_issues, recommendations
-                )
-                OUTPUT INSERTED.summary_id
-                VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?)
-            """, (
+        cursor.execute("""
+            SET NOCOUNT ON;
+            DECLARE @run_id INT = ?, @status NVARCHAR(20) = ?;
+            DECLARE @ids TABLE (summary_id INT);
+            
+            MERGE qc_summaries WITH (HOLDLOCK) AS t
+            USING (SELECT
+                @run_id AS run_id, @status AS overall_status,
+                ? AS total_checks, ? AS passed_checks, ? AS warning_checks, ? AS failed_checks,
+                ? AS critical_issues, ? AS recommendations
+            ) AS s
+            ON t.run_id = s.run_id
+            WHEN MATCHED THEN UPDATE SET
+                overall_status = s.overall_status, total_checks = s.total_checks,
+                passed_checks = s.passed_checks, warning_checks = s.warning_checks,
+                failed_checks = s.failed_checks, skipped_checks = 0,
+                critical_issues = s.critical_issues, recommendations = s.recommendations,
+                computed_at = GETDATE()
+            WHEN NOT MATCHED THEN INSERT (
                 run_id, overall_status, total_checks, passed_checks,
-                warning_checks, failed_checks, critical_issues, recommendations
-            ))
-            summary_id = cursor.fetchone()[0]
-        
-        # Update run state to validated or rejected
-        if overall_status == 'pass':
-            execute_non_query("UPDATE runs SET state_id = 5 WHERE run_id = ?", (run_id,))
-        elif overall_status == 'fail':
-            execute_non_query("UPDATE runs SET state_id = 6 WHERE run_id = ?", (run_id,))
+                warning_checks, failed_checks, skipped_checks,
+                critical_issues, recommendations
+            ) VALUES (
+                s.run_id, s.overall_status, s.total_checks, s.passed_checks,
+                s.warning_checks, s.failed_checks, 0,
+                s.critical_issues, s.recommendations
+            )
+            OUTPUT INSERTED.summary_id INTO @ids;
+            
+            -- Mirror the status onto runs (read by list_runs without a join)
+            -- and move the run to validated / rejected, same transaction
+            UPDATE runs SET
+                qc_status = @status,
+                state_id = CASE @status WHEN 'pass' THEN 5 WHEN 'fail' THEN 6 ELSE state_id END
+            WHERE run_id = @run_id;
+            
+            SELECT summary_id FROM @ids;
+        """, (
+            run_id, overall_status,
+            total_checks, passed_checks, warning_checks, failed_checks,
+            critical_issues, recommendations
+        ))
+        summary_id = cursor.fetchval()
         
         conn.commit()
-        return summary_id
+    invalidate_prefix("runs")
+    return summary_id
 
 
 # =============================================================================
 # AUDIT OPERATIONS
 # =============================================================================
 
+_AUDIT_INSERT = """
+    INSERT INTO audit_log (
+        table_name, record_id, action, changed_fields,
+        old_values, new_values, user_id
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# AUDIT_ASYNC=1: log_audit() only enqueues; one background thread writes the
+# rows in batches (up to _AUDIT_BATCH_ROWS per transaction, at most
+# _AUDIT_FLUSH_SECONDS after the first queued row). Entries still queued
+# when the process dies hard are lost, hence opt-in.
+_AUDIT_ASYNC = os.getenv("AUDIT_ASYNC", "").lower() in ("1", "true", "yes")
+_AUDIT_BATCH_ROWS = 1000
+_AUDIT_FLUSH_SECONDS = 0.1
+_audit_queue: "queue.Queue[Tuple]" = queue.Queue()
+_audit_thread: Optional[threading.Thread] = None
+_audit_thread_lock = threading.Lock()
+
+
+def _write_audit_rows(rows: List[Tuple]) -> None:
+    """Insert audit rows with one executemany and one commit."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.fast_executemany = True
+        cursor.executemany(_AUDIT_INSERT, rows)
+        conn.commit()
+
+
+def _audit_worker() -> None:
+    while True:
+        rows = [_audit_queue.get()]
+        deadline = time.monotonic() + _AUDIT_FLUSH_SECONDS
+        while len(rows) < _AUDIT_BATCH_ROWS:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                rows.append(_audit_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        
+        try:
+            _write_audit_rows(rows)
+        except Exception as e:
+            print(f"Error writing {len(rows)} audit rows: {e}")
+        finally:
+            for _ in rows:
+                _audit_queue.task_done()
+
+
+def _ensure_audit_worker() -> None:
+    global _audit_thread
+    if _audit_thread is not None and _audit_thread.is_alive():
+        return
+    with _audit_thread_lock:
+        if _audit_thread is None or not _audit_thread.is_alive():
+            _audit_thread = threading.Thread(target=_audit_worker, name="aerostream-audit", daemon=True)
+            _audit_thread.start()
+
+
+def flush_audit() -> None:
+    """Block until every queued audit entry has been written (or failed)."""
+    _audit_queue.join()
+
+
 def log_audit(
     table_name: str,
     record_id: int,
@@ -546,14 +1123,18 @@ def log_audit(
     old_values: str = "",
     new_values: str = ""
 ) -> None:
-    """Log an audit entry."""
-    execute_non_query("""
-        INSERT INTO audit_log (
-            table_name, record_id, action, changed_fields,
-            old_values, new_values, user_id
-        )
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, (table_name, record_id, action, changed_fields, old_values, new_values, user_id))
+    """Log an audit entry (queued for the background writer when AUDIT_ASYNC is set)."""
+    row = (table_name, record_id, action, changed_fields, old_values, new_values, user_id)
+    if _AUDIT_ASYNC:
+        _ensure_audit_worker()
+        _audit_queue.put(row)
+        return
+    execute_non_query(_AUDIT_INSERT, row)
+
+
+# Daemon threads keep running through atexit, so this drains the queue
+if _AUDIT_ASYNC:
+    atexit.register(flush_audit)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,72 @@
+"""
+Query Result Cache
+==================
+Short-lived in-process cache for read-mostly lookups (get_run, get_session,
+list_runs, list_demo_run_requests).
+
+Results are kept for a few seconds, keyed on the function's arguments (its
+SQL text is fixed per argument shape), and handed out as deep copies so a
+caller mutating a row cannot corrupt the cached one. Writers in
+src.db.operations call invalidate_prefix() for the namespace they touch;
+writes from other processes are picked up once the TTL expires.
+"""
+
+import copy
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict, List, Tuple
+
+from cachetools import TTLCache
+
+
+_lock = threading.RLock()
+# prefix -> caches of the functions decorated under it
+_registry: Dict[str, List[TTLCache]] = {}
+
+
+def cached_query(prefix: str, ttl: float = 5.0, maxsize: int = 1024) -> Callable:
+    """
+    Cache a read function's result for ttl seconds.
+
+    Args:
+        prefix: Namespace cleared by invalidate_prefix() (e.g. "runs")
+        ttl: Seconds a result stays valid
+        maxsize: Max distinct argument sets kept
+
+    Returns:
+        Decorator; the wrapped function gains a cache_clear() attribute
+    """
+    def decorator(func: Callable) -> Callable:
+        cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        with _lock:
+            _registry.setdefault(prefix, []).append(cache)
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key: Tuple = (args, tuple(sorted(kwargs.items())))
+            with _lock:
+                if key in cache:
+                    return copy.deepcopy(cache[key])
+
+            result = func(*args, **kwargs)
+            with _lock:
+                cache[key] = result
+            return copy.deepcopy(result)
+
+        def cache_clear() -> None:
+            with _lock:
+                cache.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
+
+
+def invalidate_prefix(prefix: str) -> None:
+    """Drop every cached result whose namespace starts with prefix ("" = all)."""
+    with _lock:
+        for name, caches in _registry.items():
+            if name.startswith(prefix):
+                for cache in caches:
+                    cache.clear()
@@ -5,11 +5,13 @@ Optimized queries for SQL Server time-series data.
 Uses stored procedures and pre-aggregated tables for performance.
 """
 
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
 import numpy as np
 
-from src.db.connection import execute_query, execute_non_query, get_connection
+from src.db.connection import execute_query, execute_query_arrow, execute_scalar, execute_non_query, get_db_connection
 
 
 def refresh_aggregates(run_id: int) -> int:
@@ -23,22 +25,19 @@ def refresh_aggregates(run_id: int) -> int:
     Returns:
         Number of rows created
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    try:
-        cursor.execute("EXEC sp_refresh_samples_1sec @run_id = ?", (run_id,))
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        # The procedure RETURNs the bucket rows it inserted: read that in the
+        # same batch instead of re-counting samples_1sec afterwards
+        cursor.execute("""
+            SET NOCOUNT ON;
+            DECLARE @rows INT;
+            EXEC @rows = sp_refresh_samples_1sec @run_id = ?;
+            SELECT @rows;
+        """, (run_id,))
+        rows = cursor.fetchval()
         conn.commit()
-        
-        # Get row count
-        result = execute_query(
-            "SELECT COUNT(*) as cnt FROM samples_1sec WHERE run_id = ?",
-            (run_id,)
-        )
-        return result[0]['cnt'] if result else 0
-    finally:
-        cursor.close()
-        conn.close()
+        return rows or 0
 
 
 def get_downsampled_data(
@@ -62,28 +61,145 @@ def get_downsampled_data(
     Returns:
         List of dicts with ts, value, min_value, max_value, sample_count
     """
-    conn = get_connection()
-    cursor = conn.cursor()
+    return execute_query("""
+        EXEC sp_get_downsampled_data 
+            @run_id = ?,
+            @channel_id = ?,
+            @bucket_seconds = ?,
+            @start_time = ?,
+            @end_time = ?
+    """, (run_id, channel_id, bucket_seconds, start_time, end_time))
+
+
+def get_downsampled_data_multi(
+    run_id: int,
+    channel_ids: List[int],
+    bucket_seconds: int = 1,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None
+) -> Dict[int, List[Tuple]]:
+    """
+    Get downsampled time-series data for several channels in one round-trip.
+    Same bucket semantics as sp_get_downsampled_data (pre-aggregated
+    samples_1sec for 1-second buckets when refreshed, else aggregated raw).
     
-    try:
-        cursor.execute("""
-            EXEC sp_get_downsampled_data 
-                @run_id = ?,
-                @channel_id = ?,
-                @bucket_seconds = ?,
-                @start_time = ?,
-                @end_time = ?
-        """, (run_id, channel_id, bucket_seconds, start_time, end_time))
+    Args:
+        run_id: Run ID
+        channel_ids: Channels to fetch
+        bucket_seconds: Time bucket size in seconds (1, 5, 10, 60, etc.)
+        start_time: Optional start time filter
+        end_time: Optional end time filter
         
-        columns = [column[0] for column in cursor.description]
-        rows = []
-        for row in cursor.fetchall():
-            rows.append(dict(zip(columns, row)))
+    Returns:
+        Dict of channel_id -> list of (ts, value, min_value, max_value,
+        sample_count) tuples (channels without data are omitted)
+    """
+    if not channel_ids:
+        return {}
+    
+    placeholders = ", ".join("?" for _ in channel_ids)
+    sql = f"""
+        SET NOCOUNT ON;
+        DECLARE @run_id INT = ?, @bucket_seconds INT = ?,
+                @start_time DATETIME2(3) = ?, @end_time DATETIME2(3) = ?;
         
-        return rows
-    finally:
-        cursor.close()
-        conn.close()
+        IF @bucket_seconds = 1 AND EXISTS (SELECT 1 FROM samples_1sec WHERE run_id = @run_id)
+            SELECT 
+                channel_id,
+                bucket AS ts,
+                avg_value AS value,
+                min_value,
+                max_value,
+                sample_count
+            FROM samples_1sec
+            WHERE run_id = @run_id
+              AND channel_id IN ({placeholders})
+              AND (@start_time IS NULL OR bucket >= @start_time)
+              AND (@end_time IS NULL OR bucket <= @end_time)
+            ORDER BY channel_id, bucket;
+        ELSE
+            SELECT 
+                channel_id,
+                DATEADD(SECOND, 
+                    (DATEDIFF(SECOND, '2000-01-01', ts) / @bucket_seconds) * @bucket_seconds, 
+                    '2000-01-01') AS ts,
+                AVG(value) AS value,
+                MIN(value) AS min_value,
+                MAX(value) AS max_value,
+                COUNT(*) AS sample_count
+            FROM samples
+            WHERE run_id = @run_id
+              AND channel_id IN ({placeholders})
+              AND (@start_time IS NULL OR ts >= @start_time)
+              AND (@end_time IS NULL OR ts <= @end_time)
+            GROUP BY 
+                channel_id,
+                DATEADD(SECOND, 
+                    (DATEDIFF(SECOND, '2000-01-01', ts) / @bucket_seconds) * @bucket_seconds, 
+                    '2000-01-01')
+            ORDER BY channel_id, ts;
+    """
+    params = (run_id, bucket_seconds, start_time, end_time, *channel_ids, *channel_ids)
+    
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    
+    # Rows arrive ordered by channel_id: group without re-sorting, keeping
+    # each point as a plain tuple (no channel_id per point)
+    return {
+        channel_id: [tuple(row[1:]) for row in channel_rows]
+        for channel_id, channel_rows in groupby(rows, key=itemgetter(0))
+    }
+
+
+def get_raw_series_multi(
+    run_id: int,
+    channel_ids: List[int],
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None
+) -> Dict[int, Tuple[List[datetime], np.ndarray]]:
+    """
+    Get raw (ts, value) series for several channels in one query.
+    
+    Args:
+        run_id: Run ID
+        channel_ids: Channels to fetch
+        start_time: Optional start time filter
+        end_time: Optional end time filter
+        
+    Returns:
+        Dict of channel_id -> (timestamps, float64 values), time-ordered
+        (channels without data are omitted)
+    """
+    if not channel_ids:
+        return {}
+    
+    placeholders = ", ".join("?" for _ in channel_ids)
+    query = f"SELECT channel_id, ts, value FROM samples WHERE run_id = ? AND channel_id IN ({placeholders})"
+    params = [run_id, *channel_ids]
+    
+    if start_time:
+        query += " AND ts >= ?"
+        params.append(start_time)
+    
+    if end_time:
+        query += " AND ts <= ?"
+        params.append(end_time)
+    
+    query += " ORDER BY channel_id, ts"
+    
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(query, tuple(params))
+        rows = cursor.fetchall()
+    
+    series = {}
+    for channel_id, channel_rows in groupby(rows, key=itemgetter(0)):
+        _, timestamps, values = zip(*channel_rows)
+        series[channel_id] = (list(timestamps), np.asarray(values, dtype=np.float64))
+    return series
 
 
 def get_channel_statistics(
@@ -91,7 +207,11 @@ def get_channel_statistics(
     channel_id: int
 ) -> Dict[str, float]:
     """
-    Get statistics for a channel using columnstore-optimized query.
+    Get statistics for a channel.
+    
+    Reads the channel_stats row written by sp_refresh_samples_1sec (one
+    primary-key seek; deleted by every bulk insert into the run) when
+    present; otherwise falls back to a columnstore-optimized raw query.
     
     Args:
         run_id: Run ID
@@ -100,18 +220,30 @@ def get_channel_statistics(
     Returns:
         Dict with mean, std, min, max, count
     """
-    # This query benefits from the columnstore index
     result = execute_query("""
         SELECT 
-            AVG(value) AS mean,
-            STDEV(value) AS std,
-            MIN(value) AS min_value,
-            MAX(value) AS max_value,
-            COUNT(*) AS sample_count
-        FROM samples
+            mean_value AS mean,
+            std_value AS std,
+            min_value,
+            max_value,
+            sample_count
+        FROM channel_stats
         WHERE run_id = ? AND channel_id = ?
     """, (run_id, channel_id))
     
+    if not result:
+        # No aggregates yet: this query benefits from the columnstore index
+        result = execute_query("""
+            SELECT 
+                AVG(value) AS mean,
+                STDEV(value) AS std,
+                MIN(value) AS min_value,
+                MAX(value) AS max_value,
+                COUNT(*) AS sample_count
+            FROM samples
+            WHERE run_id = ? AND channel_id = ?
+        """, (run_id, channel_id))
+    
     if result:
         return {
             'mean': result[0]['mean'],
@@ -127,6 +259,9 @@ def get_time_range(run_id: int) -> Tuple[Optional[datetime], Optional[datetime]]
     """
     Get the time range for a run.
     
+    Reads run_meta (written by sp_refresh_samples_1sec, deleted by every
+    bulk insert into the run) when present; otherwise aggregates raw samples.
+    
     Args:
         run_id: Run ID
         
@@ -134,11 +269,18 @@ def get_time_range(run_id: int) -> Tuple[Optional[datetime], Optional[datetime]]
         Tuple of (start_time, end_time)
     """
     result = execute_query("""
-        SELECT MIN(ts) AS start_time, MAX(ts) AS end_time
-        FROM samples
+        SELECT start_ts AS start_time, end_ts AS end_time
+        FROM run_meta
         WHERE run_id = ?
     """, (run_id,))
     
+    if not result:
+        result = execute_query("""
+            SELECT MIN(ts) AS start_time, MAX(ts) AS end_time
+            FROM samples
+            WHERE run_id = ?
+        """, (run_id,))
+    
     if result:
         return result[0]['start_time'], result[0]['end_time']
     return None, None
@@ -148,17 +290,21 @@ def get_sample_count(run_id: int) -> int:
     """
     Get total sample count for a run.
     
+    Reads run_meta when present (refreshed since the last insert); otherwise
+    counts raw samples (index-only via IX_samples_run_id).
+    
     Args:
         run_id: Run ID
         
     Returns:
         Sample count
     """
-    result = execute_query(
-        "SELECT COUNT(*) AS cnt FROM samples WHERE run_id = ?",
-        (run_id,)
-    )
-    return result[0]['cnt'] if result else 0
+    return execute_scalar("""
+        SELECT COALESCE(
+            (SELECT sample_count FROM run_meta WHERE run_id = ?),
+            (SELECT COUNT_BIG(*) FROM samples WHERE run_id = ?)
+        )
+    """, (run_id, run_id)) or 0
 
 
 def get_raw_data(
@@ -181,6 +327,86 @@ def get_raw_data(
     Returns:
         List of sample dicts
     """
+    return execute_query(*_raw_data_query(run_id, channel_ids, start_time, end_time, limit))
+
+
+def get_raw_data_columnar(
+    run_id: int,
+    channel_ids: Optional[List[int]] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    limit: int = 100000
+) -> Dict[str, np.ndarray]:
+    """
+    Get raw sample data as one numpy array per column (no per-row dicts).
+    
+    Args:
+        run_id: Run ID
+        channel_ids: Optional list of channels to include
+        start_time: Optional start time filter
+        end_time: Optional end time filter
+        limit: Maximum rows to return
+        
+    Returns:
+        Dict of run_id, channel_id (int64), ts (datetime64[us]), value
+        (float64) and quality_flag arrays. quality_flag is a nullable
+        TINYINT, so it is always float64 with NaN for NULL (a dtype that
+        does not depend on whether a NULL happens to be in the result).
+    """
+    import pyarrow as pa  # Already loaded by execute_query_arrow
+    
+    table = execute_query_arrow(*_raw_data_query(run_id, channel_ids, start_time, end_time, limit))
+    return {
+        name: (column.cast(pa.float64()) if name == 'quality_flag' else column).to_numpy()
+        for name, column in zip(table.column_names, table.columns)
+    }
+
+
+def iter_raw_data(
+    run_id: int,
+    channel_ids: Optional[List[int]] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    limit: int = 100000,
+    batch_size: int = 10000
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream raw sample data in batches (memory bounded by one batch).
+    
+    The connection stays open until the iterator is exhausted or closed.
+    
+    Args:
+        run_id: Run ID
+        channel_ids: Optional list of channels to include
+        start_time: Optional start time filter
+        end_time: Optional end time filter
+        limit: Maximum rows in total
+        batch_size: Rows per yielded batch
+        
+    Yields:
+        Lists of up to batch_size sample dicts, in get_raw_data order
+    """
+    query, params = _raw_data_query(run_id, channel_ids, start_time, end_time, limit)
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.arraysize = batch_size
+        cursor.execute(query, params)
+        columns = [column[0] for column in cursor.description]
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield [dict(zip(columns, row)) for row in rows]
+
+
+def _raw_data_query(
+    run_id: int,
+    channel_ids: Optional[List[int]],
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+    limit: int
+) -> Tuple[str, tuple]:
+    """SQL and parameters shared by get_raw_data and get_raw_data_columnar."""
     query = "SELECT TOP (?) run_id, channel_id, ts, value, quality_flag FROM samples WHERE run_id = ?"
     params = [limit, run_id]
     
@@ -197,9 +423,10 @@ def get_raw_data(
         query += " AND ts <= ?"
         params.append(end_time)
     
+    # Channel-grouped order (callers rely on it); served by IX_samples_run_channel_ts
     query += " ORDER BY channel_id, ts"
     
-    return execute_query(query, tuple(params))
+    return query, tuple(params)
 
 
 def get_data_as_arrays(
@@ -220,31 +447,35 @@ def get_data_as_arrays(
     Returns:
         Tuple of (timestamps, values) as numpy arrays
     """
-    query = "SELECT ts, value FROM samples WHERE run_id = ? AND channel_id = ?"
-    params = [run_id, channel_id]
-    
-    if start_time:
-        query += " AND ts >= ?"
-        params.append(start_time)
-    
-    if end_time:
-        query += " AND ts <= ?"
-        params.append(end_time)
-    
-    query += " ORDER BY ts"
+    # One fixed statement text for every filter combination, so SQL Server
+    # caches a single plan: missing bounds become open-ended ranges (still a
+    # range seek, unlike "? IS NULL OR ts >= ?") and every parameter is bound
+    # once into a typed variable.
+    query = """
+        SET NOCOUNT ON;
+        DECLARE @run_id INT = ?, @channel_id INT = ?;
+        DECLARE @start DATETIME2(3) = COALESCE(CAST(? AS DATETIME2(3)), '0001-01-01');
+        DECLARE @end DATETIME2(3) = COALESCE(CAST(? AS DATETIME2(3)), '9999-12-31');
+        -- Seconds since the first selected sample computed server-side, so the
+        -- driver returns floats and never builds a datetime per row
+        DECLARE @base DATETIME2(3) = (
+            SELECT MIN(ts) FROM samples
+            WHERE run_id = @run_id AND channel_id = @channel_id AND ts >= @start AND ts <= @end
+        );
+        SELECT DATEDIFF_BIG(MICROSECOND, @base, ts) / 1e6 AS t_sec, value
+        FROM samples
+        WHERE run_id = @run_id AND channel_id = @channel_id AND ts >= @start AND ts <= @end
+        ORDER BY ts
+    """
     
-    rows = execute_query(query, tuple(params))
+    table = execute_query_arrow(query, (run_id, channel_id, start_time, end_time))
     
-    if not rows:
+    if table.num_rows == 0:
         return np.array([]), np.array([])
     
-    # Convert to arrays
-    base_ts = rows[0]['ts']
-    timestamps = np.array([
-        (row['ts'] - base_ts).total_seconds() 
-        for row in rows
-    ])
-    values = np.array([row['value'] for row in rows])
+    # Columnar result: both arrays come out of Arrow without a per-row loop
+    timestamps = table.column('t_sec').to_numpy()
+    values = table.column('value').to_numpy()
     
     return timestamps, values
 
@@ -262,4 +493,6 @@ if __name__ == "__main__":
     print("  - get_time_range(run_id)")
     print("  - get_sample_count(run_id)")
     print("  - get_raw_data(run_id, channel_ids, start, end)")
+    print("  - get_raw_data_columnar(run_id, channel_ids, start, end)")
+    print("  - iter_raw_data(run_id, channel_ids, start, end, batch_size)")
     print("  - get_data_as_arrays(run_id, channel_id)")
@@ -0,0 +1,74 @@
+"""
+Logging Configuration
+=====================
+Buffered console logging for the streaming hot paths.
+
+Progress lines from the producer/consumer loops go through a MemoryHandler
+instead of print(), so a slow or piped stdout never stalls the loop on every
+line. The buffer is flushed when it fills, at least once per flush_interval,
+on any WARNING or above, and at interpreter exit.
+"""
+
+import sys
+import time
+import atexit
+import logging
+import logging.handlers
+from typing import Optional
+
+
+class _TimedMemoryHandler(logging.handlers.MemoryHandler):
+    """MemoryHandler that also flushes once the oldest buffered line is flush_interval old."""
+
+    def __init__(self, capacity: int, flush_interval: float, target: logging.Handler):
+        super().__init__(capacity, flushLevel=logging.WARNING, target=target, flushOnClose=True)
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        return (
+            super().shouldFlush(record)
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        )
+
+    def flush(self) -> None:
+        super().flush()
+        self._last_flush = time.monotonic()
+
+
+_handler: Optional[_TimedMemoryHandler] = None
+
+
+def configure_logging(
+    level: int = logging.INFO,
+    capacity: int = 256,
+    flush_interval: float = 1.0,
+) -> None:
+    """
+    Route the `src` loggers to a buffered stdout handler (idempotent).
+
+    Args:
+        level: Minimum level for `src.*` loggers
+        capacity: Records buffered before a forced flush
+        flush_interval: Max seconds a record stays buffered
+    """
+    global _handler
+    if _handler is not None:
+        return
+
+    target = logging.StreamHandler(sys.stdout)
+    target.setFormatter(logging.Formatter("%(message)s"))
+    _handler = _TimedMemoryHandler(capacity, flush_interval, target)
+
+    logger = logging.getLogger("src")
+    logger.setLevel(level)
+    logger.addHandler(_handler)
+    logger.propagate = False
+
+    atexit.register(flush_logging)
+
+
+def flush_logging() -> None:
+    """Flush buffered log records (call before printing a final summary)."""
+    if _handler is not None:
+        _handler.flush()
@@ -9,6 +9,8 @@ Modules:
 - aero_metrics: Calculate Cl, Cd, efficiency
 - qc_engine: Automated quality control checks
 - processor: Pipeline orchestration
+- synth: Fast synthetic test signals (Numba when available)
+- downsample: Shape-preserving MinMaxLTTB point selection for charts
 """
 
 from src.processing.resampler import (
@@ -44,6 +46,10 @@ from src.processing.processor import (
     process_run
 )
 
+from src.processing.synth import synthesize_channels
+
+from src.processing.downsample import minmax_lttb
+
 __all__ = [
     # Resampler
     'Resampler',
@@ -72,4 +78,10 @@ __all__ = [
     'RunProcessor',
     'ProcessingResult',
     'process_run',
+    
+    # Synthetic signals
+    'synthesize_channels',
+    
+    # Downsampling
+    'minmax_lttb',
 ]
@@ -0,0 +1,23 @@
+"""
+Optional Numba JIT
+==================
+`njit` / `prange` that compile with Numba when it is installed and fall back
+to plain Python otherwise, so numba stays an optional dependency.
+Callers check HAVE_NUMBA to pick a NumPy-vectorized path when uncompiled.
+"""
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - depends on the environment
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports @njit and @njit(...))."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+__all__ = ['njit', 'prange', 'HAVE_NUMBA']
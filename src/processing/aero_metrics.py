@@ -2,12 +2,56 @@
 Aerodynamic Metrics Module
 ==========================
 Calculates derived aerodynamic coefficients from force and pressure data.
+
+With numba installed, per-sample coefficients are computed by one fused
+kernel; otherwise by the NumPy calculate_* methods.
 """
 
 import numpy as np
 from typing import Dict, Optional, Tuple
 from dataclasses import dataclass, field
 
+from src.processing._jit import njit, prange, HAVE_NUMBA
+
+
+@njit(parallel=True, cache=True)
+def _fused_coefficients(
+    lift, drag, side, pitch, roll, yaw, velocity, rho, area, wheelbase,
+    Cl, Cd, Cy, Cm_pitch, Cm_roll, Cm_yaw, efficiency
+):
+    # One pass over the inputs for every per-sample output; same arithmetic
+    # (and NaN rules) as the calculate_* methods
+    for i in prange(len(Cl)):
+        q_A = 0.5 * rho[i] * (velocity[i] * velocity[i]) * area
+        q_A_L = q_A * wheelbase
+        if q_A > 0:
+            Cl[i] = lift[i] / q_A
+            Cd[i] = drag[i] / q_A
+            Cy[i] = side[i] / q_A
+        else:
+            Cl[i] = np.nan
+            Cd[i] = np.nan
+            Cy[i] = np.nan
+        if q_A_L > 0:
+            Cm_pitch[i] = pitch[i] / q_A_L
+            Cm_roll[i] = roll[i] / q_A_L
+            Cm_yaw[i] = yaw[i] / q_A_L
+        else:
+            Cm_pitch[i] = np.nan
+            Cm_roll[i] = np.nan
+            Cm_yaw[i] = np.nan
+        if Cd[i] > 0:
+            efficiency[i] = abs(Cl[i]) / Cd[i]
+        else:
+            efficiency[i] = np.nan
+
+
+def _divide_where(numerator, denominator, valid) -> np.ndarray:
+    """numerator / denominator where valid, NaN elsewhere, in one pass."""
+    out = np.full(np.broadcast_shapes(np.shape(numerator), np.shape(denominator)), np.nan)
+    np.divide(numerator, denominator, out=out, where=valid)
+    return out
+
 
 @dataclass
 class AeroCoefficients:
@@ -22,8 +66,14 @@ class AeroCoefficients:
 
 @dataclass 
 class AeroMetrics:
-    """Complete aerodynamic metrics for a run."""
-    # Force coefficients (time arrays)
+    """
+    Complete aerodynamic metrics for a run.
+    
+    Time arrays are stored as float32: well beyond the balance's effective
+    resolution, at half the memory of float64. The summary statistics are
+    computed in float64 before the arrays are narrowed.
+    """
+    # Force coefficients (time arrays, float32)
     Cl: np.ndarray = field(repr=False)
     Cd: np.ndarray = field(repr=False)
     Cy: np.ndarray = field(repr=False)
@@ -126,12 +176,11 @@ class AeroCalculator:
         """
         q_A = dynamic_pressure * self.reference_area
         
-        # Avoid division by zero
-        q_A = np.where(q_A > 0, q_A, np.nan)
-        
-        Cl = lift / q_A
-        Cd = drag / q_A
-        Cy = side_force / q_A
+        # Avoid division by zero (NaN where q_A <= 0); one mask for all three
+        valid = q_A > 0
+        Cl = _divide_where(lift, q_A, valid)
+        Cd = _divide_where(drag, q_A, valid)
+        Cy = _divide_where(side_force, q_A, valid)
         
         return Cl, Cd, Cy
     
@@ -156,12 +205,11 @@ class AeroCalculator:
         """
         q_A_L = dynamic_pressure * self.reference_area * self.wheelbase
         
-        # Avoid division by zero
-        q_A_L = np.where(q_A_L > 0, q_A_L, np.nan)
-        
-        Cm_pitch = pitch_moment / q_A_L
-        Cm_roll = roll_moment / q_A_L
-        Cm_yaw = yaw_moment / q_A_L
+        # Avoid division by zero (NaN where q_A_L <= 0); one mask for all three
+        valid = q_A_L > 0
+        Cm_pitch = _divide_where(pitch_moment, q_A_L, valid)
+        Cm_roll = _divide_where(roll_moment, q_A_L, valid)
+        Cm_yaw = _divide_where(yaw_moment, q_A_L, valid)
         
         return Cm_pitch, Cm_roll, Cm_yaw
     
@@ -182,8 +230,7 @@ class AeroCalculator:
             Efficiency array (|Cl|/Cd)
         """
         # Avoid division by zero
-        Cd_safe = np.where(Cd > 0, Cd, np.nan)
-        return np.abs(Cl) / Cd_safe
+        return _divide_where(np.abs(Cl), Cd, Cd > 0)
     
     def calculate_aero_balance(
         self,
@@ -201,8 +248,7 @@ class AeroCalculator:
             Front percentage array (0-100)
         """
         total = front_downforce + rear_downforce
-        total_safe = np.where(total > 0, total, np.nan)
-        return 100.0 * front_downforce / total_safe
+        return _divide_where(100.0 * front_downforce, total, total > 0)
     
     def process_run(
         self,
@@ -251,16 +297,33 @@ class AeroCalculator:
         rho = channel_data.get(channel_mapping.get('rho', 68), None)
         if rho is None:
             rho = self.RHO_STD
-        q = self.calculate_dynamic_pressure(velocity, rho)
         
-        # Calculate force coefficients
-        Cl, Cd, Cy = self.calculate_coefficients(lift, drag, side, q)
-        
-        # Calculate moment coefficients
-        Cm_pitch, Cm_roll, Cm_yaw = self.calculate_moments(pitch, roll, yaw, q)
-        
-        # Calculate efficiency
-        efficiency = self.calculate_efficiency(Cl, Cd)
+        if HAVE_NUMBA:
+            # Forces, moments and efficiency in one fused kernel (read-only
+            # broadcast views, so the length-1 fallbacks and scalar rho cost
+            # nothing; broadcast_arrays' writeable views warn under numba)
+            arrays = [
+                np.asarray(x, dtype=np.float64)
+                for x in (lift, drag, side, pitch, roll, yaw, velocity, rho)
+            ]
+            shape = np.broadcast_shapes(*(x.shape for x in arrays))
+            inputs = [np.broadcast_to(x, shape) for x in arrays]
+            Cl, Cd, Cy, Cm_pitch, Cm_roll, Cm_yaw, efficiency = np.empty((7,) + shape)
+            _fused_coefficients(
+                *inputs, float(self.reference_area), float(self.wheelbase),
+                Cl, Cd, Cy, Cm_pitch, Cm_roll, Cm_yaw, efficiency
+            )
+        else:
+            q = self.calculate_dynamic_pressure(velocity, rho)
+            
+            # Calculate force coefficients
+            Cl, Cd, Cy = self.calculate_coefficients(lift, drag, side, q)
+            
+            # Calculate moment coefficients
+            Cm_pitch, Cm_roll, Cm_yaw = self.calculate_moments(pitch, roll, yaw, q)
+            
+            # Calculate efficiency
+            efficiency = self.calculate_efficiency(Cl, Cd)
         
         # Calculate aero balance (estimate from front/rear wing if available)
         fw_lift = channel_data.get(channel_mapping.get('fw_lift', 7), None)
@@ -283,6 +346,12 @@ class AeroCalculator:
         efficiency_mean = float(np.nanmean(efficiency))
         balance_mean = float(np.nanmean(aero_balance))
         
+        # Stored arrays are float32 (see AeroMetrics)
+        Cl, Cd, Cy, Cm_pitch, Cm_roll, Cm_yaw, efficiency, aero_balance = (
+            np.asarray(a, dtype=np.float32)
+            for a in (Cl, Cd, Cy, Cm_pitch, Cm_roll, Cm_yaw, efficiency, aero_balance)
+        )
+        
         return AeroMetrics(
             Cl=Cl,
             Cd=Cd,
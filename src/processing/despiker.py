@@ -2,12 +2,73 @@
 De-spiking Module (MAD Algorithm)
 =================================
 Removes sensor glitches using Median Absolute Deviation (MAD).
+
+Rolling-window detection runs as a parallel Numba kernel when numba is
+installed, otherwise as a NumPy sliding-window equivalent.
 """
 
+from itertools import chain
+
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Tuple, Optional, Dict, List
 from dataclasses import dataclass
 
+from src.processing._jit import njit, prange, HAVE_NUMBA
+
+
+# Samples per prange task in the rolling kernel (each task reuses its buffers)
+_KERNEL_BLOCK = 1024
+
+
+@njit(cache=True)
+def _sorted_median(buf, m):
+    """Median of buf[:m], sorting it in place (NumPy's even-length convention)."""
+    head = buf[:m]
+    head.sort()
+    mid = m // 2
+    if m % 2:
+        return head[mid]
+    return (head[mid - 1] + head[mid]) / 2
+
+
+@njit(parallel=True, cache=True, nogil=True)
+def _rolling_spike_mask(values, half_window, scale, out):
+    # Same windows as the NumPy path (truncated at the edges); a window holding
+    # NaN has a NaN median there, which never flags a spike, so skip it.
+    n = len(values)
+    width = 2 * half_window + 1
+    n_blocks = (n + _KERNEL_BLOCK - 1) // _KERNEL_BLOCK
+    for b in prange(n_blocks):
+        buf = np.empty(width)
+        dev = np.empty(width)
+        for i in range(b * _KERNEL_BLOCK, min(n, (b + 1) * _KERNEL_BLOCK)):
+            start = max(0, i - half_window)
+            end = min(n, i + half_window + 1)
+            m = end - start
+            
+            has_nan = False
+            for j in range(m):
+                v = values[start + j]
+                if v != v:
+                    has_nan = True
+                    break
+                buf[j] = v
+            if has_nan:
+                continue
+            
+            median = _sorted_median(buf, m)
+            for j in range(m):
+                dev[j] = abs(values[start + j] - median)
+            mad = _sorted_median(dev, m)
+            if mad == 0:
+                continue
+            
+            lower = median - scale * mad
+            upper = median + scale * mad
+            if values[i] < lower or values[i] > upper:
+                out[i] = True
+
 
 @dataclass
 class DespikeResult:
@@ -34,6 +95,9 @@ class Despiker:
     # Scale factor to make MAD consistent with std for normal distributions
     MAD_SCALE = 1.4826
     
+    # Max window elements materialized per block by rolling detection
+    _WINDOW_BLOCK_ELEMENTS = 4_000_000
+    
     def __init__(
         self,
         threshold: float = 3.5,
@@ -83,6 +147,8 @@ class Despiker:
         Returns:
             Boolean mask where True indicates a spike
         """
+        scale = self.threshold * self.MAD_SCALE
+        
         if self.window_size is None:
             # Global MAD calculation
             median, mad = self.calculate_mad(values)
@@ -90,15 +156,50 @@ class Despiker:
                 # No variation, no spikes
                 return np.zeros(len(values), dtype=bool)
             
-            lower = median - self.threshold * mad * self.MAD_SCALE
-            upper = median + self.threshold * mad * self.MAD_SCALE
+            lower = median - scale * mad
+            upper = median + scale * mad
             spike_mask = (values < lower) | (values > upper)
+        elif HAVE_NUMBA:
+            # Rolling window MAD, compiled: both medians and the test in one
+            # pass per sample, parallel across cores
+            spike_mask = np.zeros(len(values), dtype=np.bool_)
+            _rolling_spike_mask(
+                np.ascontiguousarray(values, dtype=np.float64),
+                self.window_size // 2,
+                float(scale),
+                spike_mask,
+            )
         else:
             # Rolling window MAD calculation
-            spike_mask = np.zeros(len(values), dtype=bool)
+            n = len(values)
+            spike_mask = np.zeros(n, dtype=bool)
             half_window = self.window_size // 2
+            width = 2 * half_window + 1
             
-            for i in range(len(values)):
+            if n >= width:
+                # Interior points (full centred window): all windows at once as a
+                # strided view, medians along axis 1, in blocks to bound memory.
+                windows = sliding_window_view(values, width)
+                block = max(1, self._WINDOW_BLOCK_ELEMENTS // width)
+                for start in range(0, len(windows), block):
+                    window = windows[start:start + block]
+                    median = np.median(window, axis=1)
+                    mad = np.median(np.abs(window - median[:, None]), axis=1)
+                    
+                    lower = median - scale * mad
+                    upper = median + scale * mad
+                    
+                    centre = start + half_window
+                    centred = values[centre:centre + len(window)]
+                    spike_mask[centre:centre + len(window)] = (
+                        (mad != 0) & ((centred < lower) | (centred > upper))
+                    )
+                # Edges use truncated windows; only 2 * half_window points
+                edge_indices = chain(range(half_window), range(n - half_window, n))
+            else:
+                edge_indices = range(n)
+            
+            for i in edge_indices:
                 start = max(0, i - half_window)
                 end = min(len(values), i + half_window + 1)
                 window = values[start:end]
@@ -107,8 +208,8 @@ class Despiker:
                 if mad == 0:
                     continue
                 
-                lower = median - self.threshold * mad * self.MAD_SCALE
-                upper = median + self.threshold * mad * self.MAD_SCALE
+                lower = median - scale * mad
+                upper = median + scale * mad
                 
                 if values[i] < lower or values[i] > upper:
                     spike_mask[i] = True
@@ -130,12 +231,13 @@ class Despiker:
             spike_mask: Boolean mask of spikes
             
         Returns:
-            Cleaned values array
+            Cleaned values array (values itself when there are no spikes;
+            treat it as read-only)
         """
-        cleaned = values.copy()
-        
         if not np.any(spike_mask):
-            return cleaned
+            return values
+        
+        cleaned = values.copy()
         
         if self.replace_method == 'nan':
             cleaned[spike_mask] = np.nan
@@ -145,19 +247,17 @@ class Despiker:
             cleaned[spike_mask] = median
             
         elif self.replace_method == 'interpolate':
-            # Get indices of good and bad points
-            good_indices = np.where(~spike_mask)[0]
-            bad_indices = np.where(spike_mask)[0]
+            good = ~spike_mask
             
-            if len(good_indices) < 2:
+            if np.count_nonzero(good) < 2:
                 # Not enough good points, use median
                 cleaned[spike_mask] = np.median(values)
             else:
                 # Interpolate bad points from good points
-                cleaned[bad_indices] = np.interp(
-                    timestamps[bad_indices],
-                    timestamps[good_indices],
-                    values[good_indices]
+                cleaned[spike_mask] = np.interp(
+                    timestamps[spike_mask],
+                    timestamps[good],
+                    values[good]
                 )
         else:
             raise ValueError(f"Unknown replace method: {self.replace_method}")
@@ -179,11 +279,94 @@ class Despiker:
         Returns:
             DespikeResult with cleaned data and spike statistics
         """
-        spike_mask = self.detect_spikes(values)
-        cleaned = self.replace_spikes(timestamps, values, spike_mask)
+        ts, vals = self._coerce(timestamps, values)
+        return self._build_result(ts, vals, values, self.detect_spikes(vals))
+    
+    def despike_many(
+        self,
+        channel_data: Dict[int, Tuple[np.ndarray, np.ndarray]]
+    ) -> Dict[int, DespikeResult]:
+        """
+        Detect and remove spikes from several channels.
+        
+        With global MAD (window_size None), channels of equal length are
+        stacked into one (n_channels, n_samples) array and their medians,
+        MADs and spike masks computed along axis 1 in one batch. Results
+        match despike() per channel.
+        
+        Args:
+            channel_data: Dict mapping channel_id to (timestamps, values)
+            
+        Returns:
+            Dict mapping channel_id to DespikeResult
+        """
+        coerced = {
+            channel_id: self._coerce(timestamps, values)
+            for channel_id, (timestamps, values) in channel_data.items()
+        }
+        
+        masks: Dict[int, np.ndarray] = {}
+        if self.window_size is None:
+            by_length: Dict[int, List[int]] = {}
+            for channel_id, (_, vals) in coerced.items():
+                by_length.setdefault(len(vals), []).append(channel_id)
+            for n, channel_ids in by_length.items():
+                if n == 0 or len(channel_ids) < 2:
+                    continue
+                stacked = np.stack([coerced[channel_id][1] for channel_id in channel_ids])
+                masks.update(zip(channel_ids, self._detect_spikes_rows(stacked)))
+        
+        results = {}
+        for channel_id, (ts, vals) in coerced.items():
+            spike_mask = masks.get(channel_id)
+            if spike_mask is None:
+                spike_mask = self.detect_spikes(vals)
+            results[channel_id] = self._build_result(ts, vals, channel_data[channel_id][1], spike_mask)
+        return results
+    
+    def _detect_spikes_rows(self, values: np.ndarray) -> np.ndarray:
+        """Global-MAD spike masks for each row of a 2D array (one channel per row)."""
+        scale = self.threshold * self.MAD_SCALE
+        median = np.median(values, axis=1, keepdims=True)
+        mad = np.median(np.abs(values - median), axis=1, keepdims=True)
+        
+        lower = median - scale * mad
+        upper = median + scale * mad
+        # mad == 0: no variation, no spikes (as in detect_spikes)
+        return ((values < lower) | (values > upper)) & (mad != 0)
+    
+    @staticmethod
+    def _coerce(timestamps: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Coerce once so detection and np.interp work on contiguous float64
+        (datetime64 timestamps as their integer ticks).
+        """
+        ts = np.asarray(timestamps)
+        if ts.dtype.kind in 'mM':
+            ts = ts.astype(np.int64)
+        ts = np.ascontiguousarray(ts, dtype=np.float64)
+        vals = np.ascontiguousarray(values, dtype=np.float64)
+        return ts, vals
+    
+    def _build_result(
+        self,
+        ts: np.ndarray,
+        vals: np.ndarray,
+        values: np.ndarray,
+        spike_mask: np.ndarray
+    ) -> DespikeResult:
+        """Replace spikes and package the result (values = caller's original array)."""
+        # One pass over the mask: the indices also tell whether to replace
+        spike_indices = np.flatnonzero(spike_mask)
+        spike_count = spike_indices.size
+        
+        original = np.asarray(values)
+        if original.dtype.kind == 'f' and original.dtype != np.float64:
+            # Spike-free channels keep the caller's array (no float round trip)
+            cleaned = self.replace_spikes(ts, vals, spike_mask).astype(original.dtype) if spike_count else original
+        else:
+            cleaned = self.replace_spikes(ts, vals, spike_mask) if spike_count else vals
         
-        spike_indices = np.where(spike_mask)[0]
-        spike_count = len(spike_indices)
         spike_pct = 100.0 * spike_count / len(values) if len(values) > 0 else 0.0
         
         return DespikeResult(
@@ -234,12 +417,7 @@ def despike_run(
         Dict mapping channel_id to DespikeResult
     """
     despiker = Despiker(threshold=threshold)
-    results = {}
-    
-    for channel_id, (timestamps, values) in channel_data.items():
-        results[channel_id] = despiker.despike(timestamps, values)
-    
-    return results
+    return despiker.despike_many(channel_data)
 
 
 if __name__ == "__main__":
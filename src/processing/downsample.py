@@ -0,0 +1,107 @@
+"""
+Visual Downsampling Module
+==========================
+Reduce a long series to n_out points that preserve its visual shape (peaks,
+troughs, slopes) for charting.
+
+Uses MinMaxLTTB: a MinMax pre-selection (extremes of each of ~n_out*ratio/2
+bins) followed by Largest-Triangle-Three-Buckets on the candidates. The
+Rust/SIMD implementation from `tsdownsample` is used when it is installed;
+otherwise an equivalent NumPy version runs, so the package stays optional.
+"""
+
+import numpy as np
+
+try:
+    from tsdownsample import MinMaxLTTBDownsampler
+    HAVE_TSDOWNSAMPLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    HAVE_TSDOWNSAMPLE = False
+
+
+def _minmax_candidates(y: np.ndarray, n_bins: int) -> np.ndarray:
+    """Indices of the first/last point plus the min and max of each interior bin."""
+    n = len(y)
+    interior = y[1:-1].astype(np.float64)
+    bin_size = -(-len(interior) // n_bins)  # ceil
+    n_bins = -(-len(interior) // bin_size)  # no all-padding bins
+
+    padded = np.full(n_bins * bin_size, np.nan)
+    padded[:len(interior)] = interior
+    padded = padded.reshape(n_bins, bin_size)
+
+    offsets = np.arange(n_bins) * bin_size + 1
+    arg_min = np.nanargmin(padded, axis=1) + offsets
+    arg_max = np.nanargmax(padded, axis=1) + offsets
+
+    return np.unique(np.concatenate(([0], arg_min, arg_max, [n - 1])))
+
+
+def _lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of n_out points of (x, y)."""
+    n = len(x)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Third triangle vertex: mean of the next bucket (or the last point)
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+            avg_x = x[next_start:next_end].mean()
+            avg_y = y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+
+    return selected
+
+
+def minmax_lttb(
+    x: np.ndarray,
+    y: np.ndarray,
+    n_out: int,
+    minmax_ratio: int = 4
+) -> np.ndarray:
+    """
+    Select n_out points of a series for plotting.
+
+    Args:
+        x: Sorted numeric x values (e.g. timestamps as int64 / float seconds)
+        y: Values, same length as x
+        n_out: Number of points to keep (>= 3)
+        minmax_ratio: MinMax candidates per output point
+
+    Returns:
+        Sorted int64 indices into x / y (all indices if len(x) <= n_out)
+    """
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n, dtype=np.int64)
+
+    if HAVE_TSDOWNSAMPLE:
+        return np.asarray(
+            MinMaxLTTBDownsampler().downsample(x, y, n_out=n_out, minmax_ratio=minmax_ratio),
+            dtype=np.int64,
+        )
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    candidates = np.arange(n, dtype=np.int64)
+    n_bins = (n_out * minmax_ratio) // 2
+    if n - 2 > 2 * n_bins:
+        candidates = _minmax_candidates(y, n_bins)
+        if len(candidates) <= n_out:
+            return candidates
+
+    return candidates[_lttb(x[candidates], y[candidates], n_out)]
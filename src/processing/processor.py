@@ -132,13 +132,15 @@ class RunProcessor:
             aligned_data = {}
         
         # Step 2: Despike each channel
-        despike_results = {}
+        # (aligned channels share a length: detection runs as one batch)
+        despike_results = self.despiker.despike_many({
+            channel_id: (common_time, values)
+            for channel_id, values in aligned_data.items()
+        })
         despiked_data = {}
         total_spikes = 0
         
-        for channel_id, values in aligned_data.items():
-            result = self.despiker.despike(common_time, values)
-            despike_results[channel_id] = result
+        for channel_id, result in despike_results.items():
             despiked_data[channel_id] = result.cleaned
             total_spikes += result.spike_count
         
@@ -204,7 +206,7 @@ class RunProcessor:
         Returns:
             ProcessingResult
         """
-        from src.db.connection import execute_query
+        from src.db.connection import execute_query, execute_query_rows
         
         # Build query
         if channel_ids:
@@ -225,11 +227,11 @@ class RunProcessor:
             """
         
         # Execute query
-        rows = execute_query(query, (run_id,))
+        rows = execute_query_rows(query, (run_id,))
         
-        # Convert to sample list
+        # Convert to sample list (one dict per sample, straight from the Row)
         samples = [
-            {'channel_id': row['channel_id'], 'ts': row['ts'], 'value': row['value']}
+            {'channel_id': row[0], 'ts': row[1], 'value': row[2]}
             for row in rows
         ]
         
@@ -249,14 +251,21 @@ class RunProcessor:
         Args:
             result: ProcessingResult to save
         """
-        from src.db.operations import save_run_statistics, save_qc_summary, save_qc_result
+        from src.db.operations import save_run_statistics, save_qc_summary, save_qc_results_bulk
         from src.db.connection import execute_query, execute_non_query
         
+        rule_ids: Dict[str, Optional[int]] = {}  # Per-channel checks share a rule_code
+        
         def _get_or_create_qc_rule_id(rule_code: str, rule_name: str) -> Optional[int]:
             """
             Map a QC rule_code to the DB's qc_rules.rule_id.
             If missing (e.g., older DB), create a minimal rule row so API joins work.
             """
+            if rule_code not in rule_ids:
+                rule_ids[rule_code] = _lookup_qc_rule_id(rule_code, rule_name)
+            return rule_ids[rule_code]
+        
+        def _lookup_qc_rule_id(rule_code: str, rule_name: str) -> Optional[int]:
             rows = execute_query(
                 "SELECT rule_id FROM qc_rules WHERE rule_code = ?",
                 (rule_code,)
@@ -286,21 +295,11 @@ class RunProcessor:
         stats = result.to_statistics_dict()
         save_run_statistics(result.run_id, stats)
         
-        # Save QC summary
+        # Save QC: check results first, then the summary, which moves the run
+        # to a terminal state (cached / ETagged by the API from then on)
         if result.qc_summary:
-            summary_dict = result.qc_summary.to_dict()
-            save_qc_summary(
-                run_id=result.run_id,
-                overall_status=summary_dict['overall_status'],
-                total_checks=summary_dict['total_checks'],
-                passed_checks=summary_dict['passed_checks'],
-                warning_checks=summary_dict['warning_checks'],
-                failed_checks=summary_dict['failed_checks'],
-                critical_issues=summary_dict['critical_issues'],
-                recommendations=summary_dict['recommendations']
-            )
-            
-            # Save individual QC check results
+            # Save individual QC check results (one batched insert)
+            qc_results = []
             for check in result.qc_summary.checks:
                 rule_id = _get_or_create_qc_rule_id(check.rule_code, check.rule_name)
                 if rule_id is None:
@@ -316,15 +315,28 @@ class RunProcessor:
                 else:
                     threshold_used = check.threshold_warn or check.threshold_fail
                 
-                save_qc_result(
-                    run_id=result.run_id,
-                    rule_id=rule_id,
-                    status=check.status.value,
-                    measured_value=check.measured_value,
-                    threshold_used=threshold_used,
-                    details=check.details,
-                    channel_id=check.channel_id
-                )
+                qc_results.append({
+                    'rule_id': rule_id,
+                    'status': check.status.value,
+                    'measured_value': check.measured_value,
+                    'threshold_used': threshold_used,
+                    'details': check.details,
+                    'channel_id': check.channel_id,
+                })
+            
+            save_qc_results_bulk(result.run_id, qc_results)
+            
+            summary_dict = result.qc_summary.to_dict()
+            save_qc_summary(
+                run_id=result.run_id,
+                overall_status=summary_dict['overall_status'],
+                total_checks=summary_dict['total_checks'],
+                passed_checks=summary_dict['passed_checks'],
+                warning_checks=summary_dict['warning_checks'],
+                failed_checks=summary_dict['failed_checks'],
+                critical_issues=summary_dict['critical_issues'],
+                recommendations=summary_dict['recommendations']
+            )
 
 
 def process_run(
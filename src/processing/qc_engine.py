@@ -4,6 +4,7 @@ Quality Control Engine
 Automated quality checks for wind tunnel sensor data.
 """
 
+import json
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
@@ -78,8 +79,9 @@ class QCSummary:
             'warning_checks': self.warning_checks,
             'failed_checks': self.failed_checks,
             'skipped_checks': self.skipped_checks,
-            'critical_issues': '; '.join(self.critical_issues) if self.critical_issues else '',
-            'recommendations': '; '.join(self.recommendations) if self.recommendations else ''
+            # JSON arrays, so readers get the lists back without re-splitting
+            'critical_issues': json.dumps(self.critical_issues),
+            'recommendations': json.dumps(self.recommendations)
         }
 
 
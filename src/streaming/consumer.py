@@ -4,19 +4,24 @@ Kafka Consumer for Wind Tunnel Sensor Data
 Consumes sensor data from Redpanda/Kafka and bulk inserts into SQL Server.
 """
 
-import json
 import time
 import signal
+import logging
 import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
 
+import pyodbc
 from kafka import KafkaConsumer
 from kafka.errors import KafkaError
 
 from src.config import get_config
-from src.db.operations import bulk_insert_samples, start_run, complete_run
+from src.logging_config import flush_logging
+from src.streaming.codec import decode_value
+from src.db.operations import bulk_insert_sample_rows, record_ingest_progress, start_run, complete_run
+
+logger = logging.getLogger(__name__)
 
 
 class SensorDataConsumer:
@@ -31,7 +36,8 @@ class SensorDataConsumer:
         topic: str = "wind-tunnel-data",
         group_id: str = "aerostream-consumer",
         batch_size: int = 20000,
-        batch_timeout_ms: int = 1000
+        batch_timeout_ms: int = 1000,
+        insert_method: str = "tvp"
     ):
         """
         Initialize the Kafka consumer.
@@ -42,17 +48,19 @@ class SensorDataConsumer:
             group_id: Consumer group ID
             batch_size: Samples to batch before insert
             batch_timeout_ms: Max wait time before flush
+            insert_method: bulk_insert_sample_rows method ('tvp', 'executemany' or 'bcp')
         """
         self.topic = topic
         self.batch_size = batch_size
         self.batch_timeout_ms = batch_timeout_ms
+        self.insert_method = insert_method
         
         # Create consumer
         self.consumer = KafkaConsumer(
             topic,
             bootstrap_servers=bootstrap_servers,
             group_id=group_id,
-            value_deserializer=lambda m: json.loads(m.decode('utf-8')),
+            value_deserializer=decode_value,
             key_deserializer=lambda k: int(k.decode('utf-8')) if k else None,
             auto_offset_reset='earliest',
             enable_auto_commit=False,  # Manual commit after insert
@@ -62,7 +70,8 @@ class SensorDataConsumer:
         
         self._running = False
         self._stats = defaultdict(int)
-        self._buffer: Dict[int, List[Dict]] = defaultdict(list)  # run_id -> samples
+        # run_id -> (channel_id, ts, value, quality_flag) rows, already typed for the insert
+        self._buffer: Dict[int, List[Tuple]] = defaultdict(list)
         self._last_flush = time.time()
         
         # Timing instrumentation
@@ -87,17 +96,36 @@ class SensorDataConsumer:
         
         try:
             t0 = time.perf_counter()
-            inserted = bulk_insert_samples(samples, run_id, batch_size=self.batch_size)
+            try:
+                inserted = bulk_insert_sample_rows(
+                    samples, run_id, batch_size=self.batch_size, method=self.insert_method
+                )
+            except pyodbc.ProgrammingError as e:
+                if self.insert_method != "tvp":
+                    raise
+                # sp_insert_samples / samples_tvp not migrated yet: downgrade once
+                print(f"TVP insert unavailable ({e}); falling back to executemany")
+                self.insert_method = "executemany"
+                inserted = bulk_insert_sample_rows(
+                    samples, run_id, batch_size=self.batch_size, method=self.insert_method
+                )
             self._time_db_insert += time.perf_counter() - t0
             self._stats['samples_inserted'] += inserted
             self._stats['batches_inserted'] += 1
             self._buffer[run_id] = []
-            return inserted
         except Exception as e:
             self._stats['insert_errors'] += 1
             print(f"Error inserting batch: {e}")
             return 0
-    
+
+        # Best-effort: waiters fall back to COUNT(*) if progress is unavailable
+        try:
+            record_ingest_progress(run_id, inserted)
+        except Exception as e:
+            self._stats['progress_errors'] += 1
+            print(f"Error recording ingest progress: {e}")
+        return inserted
+
     def _flush_all_buffers(self) -> Tuple[int, bool]:
         """Flush all buffered data. Returns (total_inserted, all_succeeded)."""
         total = 0
@@ -121,6 +149,10 @@ class SensorDataConsumer:
             data = message.value
             run_id = data['run_id']
             
+            if 'ts_ms' in data:
+                self._process_columns(run_id, data)
+                return
+            
             # Convert timestamp (support both epoch ms and ISO string)
             t0 = time.perf_counter()
             ts_raw = data['ts']
@@ -133,16 +165,12 @@ class SensorDataConsumer:
             self._time_parsing += time.perf_counter() - t0
             
             t1 = time.perf_counter()
-            sample = {
-                'channel_id': data['channel_id'],
-                'ts': ts,
-                'value': data['value'],
-                'quality_flag': data.get('quality_flag', 0)
-            }
+            sample = (data['channel_id'], ts, float(data['value']), data.get('quality_flag', 0))
             
             self._buffer[run_id].append(sample)
             self._time_batching += time.perf_counter() - t1
             self._stats['messages_processed'] += 1
+            self._stats['samples_received'] += 1
             
             # Flush if buffer is full
             if len(self._buffer[run_id]) >= self.batch_size:
@@ -152,11 +180,40 @@ class SensorDataConsumer:
             self._stats['parse_errors'] += 1
             print(f"Error processing message: {e}")
     
+    def _process_columns(self, run_id: int, data: Dict) -> None:
+        """
+        Buffer a columnar micro-batch (see src.streaming.codec.pack_columns).
+        
+        Args:
+            run_id: Run the batch belongs to
+            data: Decoded columns (numpy arrays)
+        """
+        t0 = time.perf_counter()
+        # Naive wall-clock ms -> datetime in one vectorized conversion
+        ts = data['ts_ms'].astype('datetime64[ms]').tolist()
+        self._time_parsing += time.perf_counter() - t0
+        
+        t1 = time.perf_counter()
+        buffer = self._buffer[run_id]
+        buffer.extend(zip(
+            data['channel_id'].tolist(),
+            ts,
+            data['value'].astype(float, copy=False).tolist(),
+            data['quality_flag'].tolist(),
+        ))
+        self._time_batching += time.perf_counter() - t1
+        self._stats['messages_processed'] += 1
+        self._stats['samples_received'] += data['n']
+        
+        if len(buffer) >= self.batch_size:
+            self._flush_buffer(run_id)
+    
     def consume(
         self,
         max_messages: Optional[int] = None,
         max_time_seconds: Optional[int] = None,
-        progress_interval: int = 10000
+        progress_interval: int = 10000,
+        stop_event: Optional[threading.Event] = None
     ) -> Dict[str, int]:
         """
         Consume messages from Kafka and insert to database.
@@ -164,7 +221,9 @@ class SensorDataConsumer:
         Args:
             max_messages: Stop after N messages (None = unlimited)
             max_time_seconds: Stop after N seconds (None = unlimited)
-            progress_interval: Print progress every N messages
+            progress_interval: Print progress every N samples
+            stop_event: Optional event to stop an in-thread consumer
+                (checked once per poll; final flush + commit still run)
             
         Returns:
             Stats dictionary
@@ -180,6 +239,10 @@ class SensorDataConsumer:
         
         try:
             while self._running:
+                if stop_event is not None and stop_event.is_set():
+                    print("\nStop requested...")
+                    break
+                
                 # Check time limit
                 elapsed = time.time() - start_time
                 if max_time_seconds and elapsed >= max_time_seconds:
@@ -213,12 +276,12 @@ class SensorDataConsumer:
                         self._time_commit += time.perf_counter() - t_commit
                 
                 # Progress reporting
-                processed = self._stats['messages_processed']
-                if processed - last_progress >= progress_interval:
-                    rate = processed / (time.time() - start_time)
+                received = self._stats['samples_received']
+                if received - last_progress >= progress_interval:
+                    rate = received / (time.time() - start_time)
                     inserted = self._stats['samples_inserted']
-                    print(f"  Processed: {processed:,} | Inserted: {inserted:,} | Rate: {rate:,.0f}/sec")
-                    last_progress = processed
+                    logger.info(f"  Received: {received:,} | Inserted: {inserted:,} | Rate: {rate:,.0f}/sec")
+                    last_progress = received
                 
         except KeyboardInterrupt:
             print("\nShutdown requested...")
@@ -229,12 +292,14 @@ class SensorDataConsumer:
         
         self._stats['elapsed_seconds'] = time.time() - start_time
         self._stats['rate_per_second'] = (
-            self._stats['messages_processed'] / self._stats['elapsed_seconds']
+            self._stats['samples_received'] / self._stats['elapsed_seconds']
             if self._stats['elapsed_seconds'] > 0 else 0
         )
         
+        flush_logging()
         print(f"\n✅ Consumer stopped")
         print(f"   Messages processed: {self._stats['messages_processed']:,}")
+        print(f"   Samples received: {self._stats['samples_received']:,}")
         print(f"   Samples inserted: {self._stats['samples_inserted']:,}")
         print(f"   Elapsed: {self._stats['elapsed_seconds']:.2f}s")
         
@@ -282,7 +347,7 @@ class EventConsumer:
             topic,
             bootstrap_servers=bootstrap_servers,
             group_id=group_id,
-            value_deserializer=lambda m: json.loads(m.decode('utf-8')),
+            value_deserializer=decode_value,
             auto_offset_reset='earliest',
             enable_auto_commit=True
         )
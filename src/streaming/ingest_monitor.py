@@ -0,0 +1,187 @@
+"""
+Ingestion Progress Monitor
+==========================
+Shared waiter for "has the consumer ingested this run yet?".
+
+One background thread refreshes the ingested counts of every run currently
+being waited on with a single batched query, instead of each waiter polling
+the database on its own. Refreshes start at 50ms and back off to 500ms.
+"""
+
+import atexit
+import time
+import threading
+from typing import Dict, List, Optional, Set
+
+from src.db.connection import PreparedQuery, prepare_query
+from src.db.operations import get_ingested_counts
+
+
+class IngestMonitor:
+    """
+    Polls ingestion progress for all registered runs in one query per tick.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = 0.05,
+        max_interval: float = 0.5,
+        stall_periods: float = 3.0,
+        min_stall_seconds: float = 0.5,
+    ):
+        """
+        Args:
+            min_interval: First refresh delay after a waiter registers
+            max_interval: Cap for the backoff between refreshes
+            stall_periods: Without a target, return once the count has not
+                changed for this many observed flush periods
+            min_stall_seconds: Floor for that stall window
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.stall_periods = stall_periods
+        self.min_stall_seconds = min_stall_seconds
+
+        self._cond = threading.Condition()
+        self._run_ids: Set[int] = set()
+        self._counts: Dict[int, int] = {}
+        self._generation = 0
+        self._reset_backoff = False
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        # Prepared progress read for the current IN-list size, keyed by SQL
+        # text; each holds its own connection, so at most one is kept and it
+        # is closed whenever no run is being waited on. Only used from the
+        # refresh thread.
+        self._queries: Dict[str, PreparedQuery] = {}
+
+    def _ensure_started(self) -> None:
+        """Start the refresh thread on first use (caller holds the lock)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._refresh_loop,
+                name="aerostream-ingest-monitor",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _execute_prepared(self, sql: str, params: tuple) -> List[Dict]:
+        """Run sql on a cached prepared handle so repeated polls skip re-parsing."""
+        query = self._queries.get(sql)
+        if query is None:
+            self._close_queries()  # Only the current IN-list size keeps a session
+            query = self._queries[sql] = prepare_query(sql)
+        return query.execute(params)
+
+    def _close_queries(self) -> None:
+        """Close the prepared handles and their connections."""
+        for query in self._queries.values():
+            query.close()
+        self._queries.clear()
+
+    def close(self, timeout: float = 1.0) -> None:
+        """Stop the refresh thread and release its connection (shutdown)."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout)
+        if thread is None or not thread.is_alive():
+            self._close_queries()
+
+    def _refresh_loop(self) -> None:
+        # Adaptive backoff: poll fast right after a waiter arrives (small runs
+        # finish within a few batches), then back off towards max_interval.
+        interval = self.min_interval
+        while True:
+            with self._cond:
+                if not self._run_ids:
+                    # Nobody waiting: don't hold a session while idle
+                    self._close_queries()
+                while not self._run_ids and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    break
+                if self._reset_backoff:
+                    interval = self.min_interval
+                    self._reset_backoff = False
+                run_ids = sorted(self._run_ids)
+
+            try:
+                counts = get_ingested_counts(run_ids, execute=self._execute_prepared)
+            except Exception as e:
+                print(f"Error refreshing ingest progress: {e}")
+                counts = None
+
+            with self._cond:
+                if counts is not None:
+                    self._counts.update(counts)
+                self._generation += 1
+                self._cond.notify_all()
+                # A newly registered waiter cuts the current backoff short
+                self._cond.wait_for(lambda: self._reset_backoff or self._stopping, timeout=interval)
+            interval = min(interval * 1.5, self.max_interval)
+        self._close_queries()
+
+    def wait_for(self, run_id: int, target: int, max_wait_seconds: float) -> int:
+        """
+        Wait until a run's ingested count reaches target (or timeout).
+
+        Args:
+            run_id: Run being ingested
+            target: Expected sample count (0 = unknown, return once stable)
+            max_wait_seconds: Upper bound on the wait
+
+        Returns:
+            Final ingested count
+        """
+        deadline = time.time() + max_wait_seconds
+        with self._cond:
+            self._run_ids.add(run_id)
+            self._reset_backoff = True
+            self._ensure_started()
+            self._cond.notify_all()
+            seen = self._generation
+            last = 0
+            last_change = time.time()
+            period = 0.0  # Time between the last two observed count increases
+            try:
+                while True:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        return self._counts.get(run_id, 0)
+
+                    self._cond.wait(timeout=remaining)
+                    if self._generation == seen:
+                        continue
+                    seen = self._generation
+
+                    inserted = self._counts.get(run_id, 0)
+                    if target and inserted >= target:
+                        return inserted
+
+                    now = time.time()
+                    if inserted != last:
+                        # Consumer flush cadence, measured from the progress it reports
+                        period = now - last_change
+                        last = inserted
+                        last_change = now
+
+                    # If no target (shouldn't happen), exit once no flush has landed
+                    # for a few flush periods.
+                    stall_window = max(self.stall_periods * period, self.min_stall_seconds)
+                    if not target and inserted > 0 and now - last_change >= stall_window:
+                        return inserted
+            finally:
+                self._run_ids.discard(run_id)
+                self._counts.pop(run_id, None)
+
+
+_monitor = IngestMonitor()
+atexit.register(_monitor.close)
+
+
+def wait_for_ingestion(run_id: int, target: int, max_wait_seconds: float) -> int:
+    """Wait on the shared monitor until run_id reaches target. Returns final count."""
+    return _monitor.wait_for(run_id, target, max_wait_seconds)
@@ -1,12 +1,13 @@
 import { HttpClient, HttpParams } from '@angular/common/http';
 import { Injectable } from '@angular/core';
-import { Observable } from 'rxjs';
+import { Observable, map } from 'rxjs';
 
 import { getApiBaseUrl } from './api-base';
 import {
   RunDetail,
   RunListResponse,
   RunDataResponse,
+  RunDataWire,
   SessionListResponse,
   ChannelListResponse,
   QcReport,
@@ -37,11 +38,26 @@ export class ApiClient {
     return this.http.get<RunDetail>(`${this.base}/runs/${runId}`);
   }
 
-  getRunData(runId: number, opts: { channelIds?: number[]; bucketSeconds?: number } = {}): Observable<RunDataResponse> {
+  getRunData(runId: number, opts: { channelIds?: number[]; bucketSeconds?: number; nOut?: number } = {}): Observable<RunDataResponse> {
     let params = new HttpParams();
     if (opts.channelIds && opts.channelIds.length > 0) params = params.set('channel_ids', opts.channelIds.join(','));
     params = params.set('bucket_seconds', String(opts.bucketSeconds ?? 1));
-    return this.http.get<RunDataResponse>(`${this.base}/runs/${runId}/data`, { params });
+    if (opts.nOut) params = params.set('n_out', String(opts.nOut));
+    return this.http.get<RunDataWire>(`${this.base}/runs/${runId}/data`, { params }).pipe(
+      map((res) => ({
+        ...res,
+        channels: res.channels.map((ch) => ({
+          ...ch,
+          data: ch.data.map(([ts, value, min_value, max_value, sample_count]) => ({
+            ts,
+            value,
+            min_value,
+            max_value,
+            sample_count,
+          })),
+        })),
+      })),
+    );
   }
 
   getQcReport(runId: number): Observable<QcReport> {
@@ -103,6 +103,14 @@ export interface RunDataResponse {
   total_points: number;
 }
 
+/** Wire format of a point: [ts, value, min_value, max_value, sample_count]. */
+export type DataPointRow = [string, number, number | null, number | null, number | null];
+
+/** /runs/{id}/data as sent by the API (points packed as DataPointRow arrays). */
+export interface RunDataWire extends Omit<RunDataResponse, 'channels'> {
+  channels: (Omit<ChannelData, 'data'> & { data: DataPointRow[] })[];
+}
+
 export interface QcCheck {
   rule_code: string;
   rule_name: string;